@@ -0,0 +1,90 @@
+"""
+Import-Time Report
+Cold-starts a fresh interpreter per entry point with -X importtime and reports
+how long importing the module takes and which packages dominate it
+"""
+import os
+import re
+import sys
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the CLIs, the Tuesday workflow and the Streamlit app start from;
+# streamlit itself is the floor under every app cold start
+ENTRY_POINTS = [
+    'src.cli',
+    'tuesday_update_workflow',
+    'streamlit',
+    'src.database.db_manager',
+    'src.models.master_betting_predictor',
+    'src.models.matchup_matrix',
+    'src.models.prediction_snapshot',
+    'src.models.prediction_refresh',
+    'src.analysis.injury_impact',
+    'src.analysis.calculate_weekly_accuracy',
+    'src.analysis.defensive_rankings',
+    'src.betting.roi_tracker',
+]
+
+_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+
+def parse_importtime(stderr):
+    """[(module, depth, self_us, cumulative_us)] from -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_import(module, repeat=3):
+    """Median cold import time of module (seconds) and its heaviest packages"""
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    timings = []
+    heaviest = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+            capture_output=True, text=True, cwd=PROJECT_ROOT, env=env
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+        entries = parse_importtime(result.stderr)
+        end = max(i for i, entry in enumerate(entries) if entry[0] == module and entry[1] == 0)
+        timings.append(entries[end][3] / 1e6)
+
+        # The module's own subtree is the run of nested lines printed just before it
+        start = end
+        while start > 0 and entries[start - 1][1] > 0:
+            start -= 1
+
+        packages = {}
+        for name, depth, _, cumulative in entries[start:end]:
+            if '.' not in name and not name.startswith('_'):
+                packages[name] = max(packages.get(name, 0), cumulative)
+        heaviest = sorted(packages.items(), key=lambda p: p[1], reverse=True)[:5]
+
+    return statistics.median(timings), [(name, us / 1e3) for name, us in heaviest]
+
+
+def report(modules=ENTRY_POINTS, repeat=3):
+    """Measure every entry point; returns {module: {'median_s', 'heaviest'}}"""
+    results = {}
+    print(f"\n{'Entry point import':<40} {'Cold':>9}  Heaviest packages")
+    print("-" * 70)
+    for module in modules:
+        median, heaviest = measure_import(module, repeat)
+        results[module] = {'median_s': median, 'heaviest': heaviest}
+        top = ', '.join(f"{name} {ms:.0f}ms" for name, ms in heaviest[:3])
+        print(f"{module:<40} {median * 1000:>7.0f}ms  {top}")
+    return results
+
+
+if __name__ == "__main__":
+    report()
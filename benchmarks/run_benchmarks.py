@@ -0,0 +1,249 @@
+"""
+Benchmark Suite
+Times the prediction and analysis hot paths against the synthetic embedded
+database (SQLite or DuckDB) and appends the results to a JSON history, flagging regressions
+against the previous comparable run
+"""
+import os
+import io
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+# Benchmarks live outside the package; make `src` importable without an install
+sys.path.append(PROJECT_ROOT)
+
+from synthetic_data import generate, espn_box_scores, espn_injury_page
+from import_times import report as import_time_report
+from src.database.db_manager import DatabaseManager
+from src.database.query_profiler import profile
+
+DEFAULT_DB = os.path.join(BENCH_DIR, 'data', 'synthetic.db')
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, 'results', 'history.json')
+
+
+def build_cases(db, season, week):
+    """
+    Return {name: (setup, run)}; setup() builds the objects outside the
+    timed region and returns the argument handed to run()
+    """
+    from src.models.game_predictor import NFLGamePredictor
+    from src.models.advanced_predictor import AdvancedNFLPredictor
+    from src.models.master_betting_predictor import MasterBettingPredictor
+    from src.analysis.defensive_rankings import DefensiveRankings
+    from src.analysis.injury_impact import InjuryImpactAnalyzer
+    from src.data_collection.espn_box_score import flatten_box_score
+    from src.data_collection.smart_injury_updater import extract_injury_rows
+
+    history_seasons = list(range(season - 3, season))
+    teams = [t['abbreviation'] for t in db.get_all_teams()]
+
+    def game_predictor():
+        return NFLGamePredictor()
+
+    def trained_predictor():
+        predictor = MasterBettingPredictor()
+        predictor.odds_api_key = None
+        predictor.train_ml_model(max_week_2025=week - 1, season=season)
+        return predictor
+
+    return {
+        'load_training_data': (
+            game_predictor,
+            lambda p: p.fetch_training_data(history_seasons + [season], max_week_2025=week - 1, current_season=season)
+        ),
+        'calculate_team_stats': (
+            lambda: (lambda p: (p, p.fetch_training_data(history_seasons)))(game_predictor()),
+            lambda args: args[0].calculate_team_stats(args[1])
+        ),
+        'load_all_team_current_stats': (
+            lambda: MasterBettingPredictor(),
+            lambda p: p.get_all_team_current_stats(season, week)
+        ),
+        'load_all_historical_performance': (
+            lambda: MasterBettingPredictor(),
+            lambda p: p.get_all_historical_performance(history_seasons)
+        ),
+        'load_games_by_season': (lambda: db, lambda d: d.get_games_by_season(season)),
+        'load_active_players': (lambda: db, lambda d: d.get_active_players_for_season(season)),
+        'load_injuries_by_week': (lambda: db, lambda d: d.get_injuries_by_season_week(season, week - 1)),
+        'defensive_rankings': (
+            lambda: DefensiveRankings(),
+            lambda r: r.get_all_defensive_rankings(season, week - 1)
+        ),
+        'team_injury_impact_x32': (
+            lambda: InjuryImpactAnalyzer(),
+            lambda a: [a.get_team_injury_impact(team, season, week) for team in teams]
+        ),
+        'advanced_build_features': (
+            lambda: AdvancedNFLPredictor(),
+            lambda p: p.build_features([history_seasons[-1]])
+        ),
+        'parse_box_scores_week': (
+            lambda: list(espn_box_scores(db, season, week - 1).values()),
+            lambda payloads: [flatten_box_score(players) for players in payloads]
+        ),
+        'parse_injury_page': (
+            lambda: espn_injury_page(db, season, week - 1),
+            extract_injury_rows
+        ),
+        'analyze_week': (
+            trained_predictor,
+            lambda p: p.analyze_week(season, week, store_predictions=False)
+        ),
+    }
+
+
+def time_case(setup, run, repeat):
+    """Run one case repeat times; setup output is silenced and untimed"""
+    timings = []
+    queries = round_trips = 0
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            arg = setup()
+            with profile(report=False) as profiler:
+                started = time.perf_counter()
+                run(arg)
+                timings.append(time.perf_counter() - started)
+        queries = len(profiler.calls)
+        round_trips = sum(1 for c in profiler.calls if c['round_trip'])
+
+    return {
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.mean(timings),
+        'repeat': repeat,
+        'queries': queries,
+        'round_trips': round_trips
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def find_regressions(previous, current, threshold):
+    """Cases (and entry-point imports) whose median got slower than threshold (fraction) vs previous"""
+    regressions = []
+    for section, prefix in (('results', ''), ('imports', 'import ')):
+        for name, result in current.get(section, {}).items():
+            before = previous.get(section, {}).get(name)
+            if before and before['median_s'] > 0:
+                change = result['median_s'] / before['median_s'] - 1
+                if change > threshold:
+                    regressions.append((prefix + name, before['median_s'], result['median_s'], change))
+    return regressions
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark Gridiron Prophet hot paths on synthetic data')
+    parser.add_argument('--db', default=DEFAULT_DB)
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb'], default='sqlite')
+    parser.add_argument('--history', default=DEFAULT_HISTORY)
+    parser.add_argument('--seasons', type=int, nargs='+', default=[2022, 2023, 2024, 2025])
+    parser.add_argument('--week', type=int, default=7, help='Current week of the last season')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', help='Run only these cases')
+    parser.add_argument('--regenerate', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.20, help='Regression threshold (0.20 = 20%% slower)')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--skip-imports', action='store_true', help='Skip the cold-start import-time report')
+    args = parser.parse_args()
+
+    dataset = {'seasons': args.seasons, 'week': args.week, 'seed': args.seed}
+    if args.backend != 'sqlite' and args.db == DEFAULT_DB:
+        args.db = os.path.splitext(DEFAULT_DB)[0] + f".{args.backend}"
+
+    print("=" * 70)
+    print("GRIDIRON PROPHET BENCHMARKS")
+    print("=" * 70)
+
+    if args.regenerate or not os.path.exists(args.db):
+        print(f"\n🏗️  Generating synthetic database at {args.db}...")
+        counts = generate(args.db, args.seasons, args.week, seed=args.seed, backend=args.backend)
+        print(f"✓ {counts['games']:,} games, {counts['players']:,} players, "
+              f"{counts['player_game_stats']:,} stat lines, {counts['depth_charts']:,} depth chart rows")
+
+    # Every DatabaseManager the predictors create picks the embedded backend up from here
+    os.environ['DB_BACKEND'] = args.backend
+    os.environ['DB_PATH'] = os.path.abspath(args.db)
+    db = DatabaseManager()
+    cases = build_cases(db, args.seasons[-1], args.week)
+    if args.only:
+        cases = {name: case for name, case in cases.items() if name in args.only}
+
+    # Heavy packages load lazily on first use; import them now so cases time the hot
+    # path only (cold-start cost is covered by the import-time report)
+    import pandas, numpy, sklearn.ensemble, lxml.html  # noqa: F401
+
+    workdir = tempfile.mkdtemp(prefix='gridiron_bench_')
+    original_cwd = os.getcwd()
+    os.chdir(workdir)
+
+    results = {}
+    print(f"\n{'Case':<34} {'Median':>10} {'Min':>10} {'Queries':>9} {'Trips':>7}")
+    print("-" * 70)
+    try:
+        for name, (setup, run) in cases.items():
+            results[name] = time_case(setup, run, args.repeat)
+            r = results[name]
+            print(f"{name:<34} {r['median_s']:>9.3f}s {r['min_s']:>9.3f}s {r['queries']:>9} {r['round_trips']:>7}")
+    finally:
+        os.chdir(original_cwd)
+
+    imports = {} if args.skip_imports else import_time_report(repeat=args.repeat)
+
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': args.backend,
+        'dataset': dataset,
+        'results': results,
+        'imports': imports
+    }
+
+    history = load_history(args.history)
+    previous = next((h for h in reversed(history) if h['dataset'] == dataset and h.get('backend') == args.backend), None)
+
+    history.append(record)
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+    with open(args.history, 'w') as f:
+        json.dump(history, f, indent=2)
+    print(f"\n💾 Results appended to {args.history}")
+
+    regressions = find_regressions(previous, record, args.threshold) if previous else []
+    if regressions:
+        print(f"\n⚠️  REGRESSIONS vs {previous['commit'] or previous['timestamp']}:")
+        for name, before, after, change in regressions:
+            print(f"   {name:<32} {before:.3f}s → {after:.3f}s ({change:+.0%})")
+        if args.fail_on_regression:
+            sys.exit(1)
+    elif previous:
+        print(f"✓ No regressions vs {previous['commit'] or previous['timestamp']}")
+
+
+if __name__ == "__main__":
+    main()
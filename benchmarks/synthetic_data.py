@@ -0,0 +1,367 @@
+"""
+Synthetic Benchmark Dataset
+Generates a realistic-sized Gridiron Prophet database into SQLite or DuckDB: N seasons
+of games, ~1700 players per season, box scores, weekly depth charts with
+snap percentages and injury reports. Seeded, so every run is identical
+"""
+import os
+import sys
+import random
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_manager import DatabaseManager
+from src.database.backends import create_backend
+
+TEAMS = [
+    ('BUF', 'AFC', 'East'), ('MIA', 'AFC', 'East'), ('NE', 'AFC', 'East'), ('NYJ', 'AFC', 'East'),
+    ('BAL', 'AFC', 'North'), ('CIN', 'AFC', 'North'), ('CLE', 'AFC', 'North'), ('PIT', 'AFC', 'North'),
+    ('HOU', 'AFC', 'South'), ('IND', 'AFC', 'South'), ('JAX', 'AFC', 'South'), ('TEN', 'AFC', 'South'),
+    ('DEN', 'AFC', 'West'), ('KC', 'AFC', 'West'), ('LV', 'AFC', 'West'), ('LAC', 'AFC', 'West'),
+    ('DAL', 'NFC', 'East'), ('NYG', 'NFC', 'East'), ('PHI', 'NFC', 'East'), ('WAS', 'NFC', 'East'),
+    ('CHI', 'NFC', 'North'), ('DET', 'NFC', 'North'), ('GB', 'NFC', 'North'), ('MIN', 'NFC', 'North'),
+    ('ATL', 'NFC', 'South'), ('CAR', 'NFC', 'South'), ('NO', 'NFC', 'South'), ('TB', 'NFC', 'South'),
+    ('ARI', 'NFC', 'West'), ('LAR', 'NFC', 'West'), ('SF', 'NFC', 'West'), ('SEA', 'NFC', 'West'),
+]
+
+# 53-man roster template: position -> count
+ROSTER_TEMPLATE = {
+    'QB': 3, 'RB': 4, 'WR': 6, 'TE': 3, 'OT': 4, 'OG': 4, 'C': 2,
+    'DE': 4, 'DT': 4, 'LB': 6, 'CB': 6, 'S': 4, 'K': 1, 'P': 1, 'LS': 1
+}
+
+INJURY_STATUSES = ['Questionable'] * 5 + ['Doubtful'] * 2 + ['Out'] * 3 + ['IR'] * 2
+BODY_PARTS = ['Knee', 'Ankle', 'Hamstring', 'Shoulder', 'Concussion', 'Back', 'Foot', 'Groin']
+
+WEEKS_PER_SEASON = 18
+GAMES_PER_WEEK = 16
+
+
+def _schedule(rng, n_teams):
+    """Random pairings for one week: every team plays once"""
+    order = list(range(1, n_teams + 1))
+    rng.shuffle(order)
+    return [(order[i], order[i + 1]) for i in range(0, n_teams, 2)]
+
+
+def _stat_line(rng, position, strength):
+    """Box-score columns for one player in one game"""
+    stats = {}
+    if position == 'QB':
+        attempts = rng.randint(25, 45)
+        stats.update(
+            pass_attempts=attempts,
+            pass_completions=int(attempts * rng.uniform(0.55, 0.72)),
+            pass_yards=int(rng.gauss(230, 60) * strength),
+            pass_touchdowns=rng.choice([0, 1, 1, 2, 2, 3]),
+            interceptions=rng.choice([0, 0, 1, 1, 2]),
+            sacks_taken=rng.randint(0, 5),
+            rush_attempts=rng.randint(0, 6),
+            rush_yards=rng.randint(-2, 35)
+        )
+    elif position == 'RB':
+        stats.update(
+            rush_attempts=rng.randint(4, 22),
+            rush_yards=max(0, int(rng.gauss(60, 30) * strength)),
+            rush_touchdowns=rng.choice([0, 0, 0, 1, 1, 2]),
+            targets=rng.randint(0, 6),
+            receptions=rng.randint(0, 5),
+            receiving_yards=rng.randint(0, 45)
+        )
+    elif position in ('WR', 'TE'):
+        targets = rng.randint(1, 11)
+        stats.update(
+            targets=targets,
+            receptions=rng.randint(0, targets),
+            receiving_yards=max(0, int(rng.gauss(50, 30) * strength)),
+            receiving_touchdowns=rng.choice([0, 0, 0, 1])
+        )
+    else:
+        stats.update(
+            tackles=rng.randint(0, 10),
+            tackles_for_loss=rng.choice([0, 0, 0, 1]),
+            sacks=rng.choice([0, 0, 0, 0.5, 1.0]),
+            passes_defended=rng.choice([0, 0, 1]),
+            interceptions_defense=rng.choice([0] * 12 + [1])
+        )
+    return stats
+
+
+STAT_COLUMNS = [
+    'pass_attempts', 'pass_completions', 'pass_yards', 'pass_touchdowns', 'interceptions', 'sacks_taken',
+    'rush_attempts', 'rush_yards', 'rush_touchdowns', 'targets', 'receptions', 'receiving_yards',
+    'receiving_touchdowns', 'tackles', 'tackles_for_loss', 'sacks', 'forced_fumbles',
+    'fumble_recoveries', 'interceptions_defense', 'passes_defended', 'fumbles', 'fumbles_lost'
+]
+
+# Players that show up in a box score each game (the rest only have snaps)
+BOX_SCORE_POSITIONS = {'QB': 1, 'RB': 2, 'WR': 4, 'TE': 2, 'DE': 2, 'DT': 2, 'LB': 3, 'CB': 3, 'S': 2}
+
+
+def generate(path, seasons=(2022, 2023, 2024, 2025), current_week=7, roster_turnover=0.15, seed=42,
+             backend='sqlite'):
+    """
+    Build the synthetic database at path (overwriting it) for an embedded backend
+
+    The last season is only played through current_week - 1; later weeks
+    are Scheduled, like the live database mid-season
+    """
+    rng = random.Random(seed)
+
+    storage = create_backend(backend, path)
+    storage.close()
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    storage.create_schema()
+    db = DatabaseManager(storage)
+
+    db.execute_many(
+        "INSERT INTO teams (team_id, name, abbreviation, city, conference, division) VALUES (%s, %s, %s, %s, %s, %s)",
+        [(i, f"{abbr} Football Club", abbr, abbr, conf, div) for i, (abbr, conf, div) in enumerate(TEAMS, 1)]
+    )
+    team_ids = list(range(1, len(TEAMS) + 1))
+    strength = {team_id: rng.uniform(0.8, 1.2) for team_id in team_ids}
+
+    next_player_id = 1
+    rosters = {}
+    player_rows = []
+
+    def new_player(position):
+        nonlocal next_player_id
+        player_id = next_player_id
+        next_player_id += 1
+        player_rows.append((player_id, f"Player {player_id}", position, f"6-{rng.randint(0, 6)}",
+                            rng.randint(180, 330), 'State University'))
+        return player_id
+
+    for team_id in team_ids:
+        rosters[team_id] = [
+            (new_player(position), position, depth)
+            for position, count in ROSTER_TEMPLATE.items()
+            for depth in range(1, count + 1)
+        ]
+
+    game_rows = []
+    stat_rows = []
+    depth_rows = []
+    injury_rows = []
+    season_rows = []
+    game_id = 0
+
+    for season in seasons:
+        if season != seasons[0]:
+            for team_id in team_ids:
+                rosters[team_id] = [
+                    (new_player(position) if rng.random() < roster_turnover else player_id, position, depth)
+                    for player_id, position, depth in rosters[team_id]
+                ]
+
+        for team_id in team_ids:
+            for player_id, position, depth in rosters[team_id]:
+                season_rows.append((player_id, season, team_id, position, rng.randint(1, 99),
+                                    rng.randint(21, 36), rng.randint(0, 14), 'Active', 'Active'))
+
+        last_played_week = current_week - 1 if season == seasons[-1] else WEEKS_PER_SEASON
+        season_start = date(season, 9, 7)
+
+        for week in range(1, WEEKS_PER_SEASON + 1):
+            game_date = season_start + timedelta(weeks=week - 1)
+            played = week <= last_played_week
+
+            for home_id, away_id in _schedule(rng, len(team_ids)):
+                game_id += 1
+                home_score = away_score = None
+                if played:
+                    home_score = max(0, int(rng.gauss(23 * strength[home_id] + 1.5, 9)))
+                    away_score = max(0, int(rng.gauss(22 * strength[away_id], 9)))
+                    if home_score == away_score:
+                        home_score += 3
+
+                game_rows.append((game_id, season, week, game_date.isoformat(), '13:00:00', home_id, away_id,
+                                  home_score, away_score, 'Final' if played else 'Scheduled'))
+
+                if not played:
+                    continue
+
+                for team_id in (home_id, away_id):
+                    taken = {}
+                    for player_id, position, depth in rosters[team_id]:
+                        if taken.get(position, 0) >= BOX_SCORE_POSITIONS.get(position, 0):
+                            continue
+                        taken[position] = taken.get(position, 0) + 1
+                        stats = _stat_line(rng, position, strength[team_id])
+                        stat_rows.append((player_id, game_id, team_id, season, week,
+                                          *[stats.get(col, 0) for col in STAT_COLUMNS]))
+
+            for team_id in team_ids:
+                for player_id, position, depth in rosters[team_id]:
+                    snap_pct = round(max(0.0, min(100.0, rng.gauss(95 - depth * 22, 10))), 2) if played else 0.0
+                    depth_rows.append((team_id, player_id, season, week, position, depth, snap_pct,
+                                       int(snap_pct * 0.65), int(snap_pct * 0.65), rng.randint(0, 20)))
+
+                for player_id, position, depth in rng.sample(rosters[team_id], rng.randint(2, 7)):
+                    injury_rows.append((player_id, season, week, rng.choice(INJURY_STATUSES), rng.choice(BODY_PARTS),
+                                        (game_date - timedelta(days=3)).isoformat(), 'Limited'))
+
+    db.execute_many(
+        "INSERT INTO players (player_id, name, position, height, weight, college) VALUES (%s, %s, %s, %s, %s, %s)",
+        player_rows
+    )
+    db.execute_many("""
+        INSERT INTO player_seasons (player_id, season, team_id, position, jersey_number, age,
+                                    years_in_league, roster_status, status)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, season_rows)
+    db.execute_many("""
+        INSERT INTO games (game_id, season, week, game_date, game_time, home_team_id, away_team_id,
+                           home_score, away_score, game_status)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, game_rows)
+    db.execute_many(f"""
+        INSERT INTO player_game_stats (player_id, game_id, team_id, season, week, {', '.join(STAT_COLUMNS)})
+        VALUES ({', '.join(['%s'] * (5 + len(STAT_COLUMNS)))})
+    """, stat_rows)
+    db.execute_many("""
+        INSERT INTO depth_charts (team_id, player_id, season, week, position, depth_order, snap_percentage,
+                                  offense_snaps, defense_snaps, special_teams_snaps)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, depth_rows)
+    db.execute_many("""
+        INSERT INTO injuries (player_id, season, week, injury_status, body_part, date_reported, practice_status)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, injury_rows)
+
+    db.execute_update("ANALYZE")
+
+    return {
+        'teams': len(TEAMS),
+        'players': len(player_rows),
+        'player_seasons': len(season_rows),
+        'games': len(game_rows),
+        'player_game_stats': len(stat_rows),
+        'depth_charts': len(depth_rows),
+        'injuries': len(injury_rows)
+    }
+
+
+
+# ESPN summary boxscore categories: (name, labels, label -> value from a stat row)
+ESPN_CATEGORIES = [
+    ('passing', ['C/ATT', 'YDS', 'AVG', 'TD', 'INT', 'SACKS', 'QBR', 'RTG'], lambda r: [
+        f"{r['pass_completions']}/{r['pass_attempts']}", str(r['pass_yards']), '7.1',
+        str(r['pass_touchdowns']), str(r['interceptions']), f"{r['sacks_taken']}-{r['sacks_taken'] * 7}",
+        '55.0', '92.4'], lambda r: r['pass_attempts']),
+    ('rushing', ['CAR', 'YDS', 'AVG', 'TD', 'LONG'], lambda r: [
+        str(r['rush_attempts']), str(r['rush_yards']), '4.2', str(r['rush_touchdowns']), '12'],
+     lambda r: r['rush_attempts']),
+    ('receiving', ['REC', 'YDS', 'AVG', 'TD', 'LONG', 'TGTS'], lambda r: [
+        str(r['receptions']), str(r['receiving_yards']), '11.0', str(r['receiving_touchdowns']), '24',
+        str(r['targets'])], lambda r: r['targets']),
+    ('defensive', ['TOT', 'SOLO', 'SACKS', 'TFL', 'PD', 'QB HTS', 'TD'], lambda r: [
+        str(r['tackles']), str(r['tackles']), str(r['sacks']), str(r['tackles_for_loss']),
+        str(r['passes_defended']), '0', '0'], lambda r: r['tackles']),
+]
+
+
+def espn_box_scores(db, season, week):
+    """
+    ESPN summary boxscore.players payloads built from a synthetic week's stat
+    lines: {game_id: players}, shaped like the live API for parser benchmarks
+    """
+    rows = db.execute_query(f"""
+        SELECT s.game_id, t.abbreviation, s.player_id, p.name, {', '.join(f's.{c}' for c in STAT_COLUMNS)}
+        FROM player_game_stats s
+        JOIN players p ON p.player_id = s.player_id
+        JOIN teams t ON t.team_id = s.team_id
+        WHERE s.season = %s AND s.week = %s
+        ORDER BY s.game_id, t.abbreviation, s.player_id
+    """, (season, week))
+
+    games = {}
+    for row in rows:
+        teams = games.setdefault(row['game_id'], {})
+        categories = teams.setdefault(row['abbreviation'], {name: [] for name, *_ in ESPN_CATEGORIES})
+        for name, _, values, appears in ESPN_CATEGORIES:
+            if appears(row):
+                categories[name].append({
+                    'athlete': {'id': str(row['player_id']), 'displayName': row['name']},
+                    'stats': values(row)
+                })
+
+    labels = {name: category_labels for name, category_labels, *_ in ESPN_CATEGORIES}
+    return {
+        game_id: [
+            {'team': {'abbreviation': abbr},
+             'statistics': [{'name': name, 'labels': labels[name], 'athletes': athletes}
+                            for name, athletes in categories.items()]}
+            for abbr, categories in teams.items()
+        ]
+        for game_id, teams in games.items()
+    }
+
+
+def espn_injury_page(db, season, week):
+    """
+    ESPN injuries page HTML for a synthetic week's injury reports, with the
+    page chrome around it, for injury parser benchmarks
+    """
+    from html import escape
+
+    rows = db.execute_query("""
+        SELECT t.name AS team, p.name, p.position, i.body_part, i.injury_status
+        FROM injuries i
+        JOIN players p ON p.player_id = i.player_id
+        JOIN player_seasons ps ON ps.player_id = i.player_id AND ps.season = i.season
+        JOIN teams t ON t.team_id = ps.team_id
+        WHERE i.season = %s AND i.week = %s
+        ORDER BY t.name, p.name
+    """, (season, week))
+
+    teams = {}
+    for row in rows:
+        teams.setdefault(row['team'], []).append(row)
+
+    sections = []
+    for team, injuries in teams.items():
+        body = ''.join(
+            f'<tr class="Table__TR Table__TR--sm Table__even">'
+            f'<td class="col-name Table__TD"><a href="/nfl/player/_/id/{i}">{escape(r["name"])}</a></td>'
+            f'<td class="col-pos Table__TD">{r["position"]}</td>'
+            f'<td class="col-date Table__TD">{escape(r["body_part"] or "")}</td>'
+            f'<td class="col-stat Table__TD"><span class="TextStatus">{r["injury_status"]}</span></td>'
+            f'<td class="col-desc Table__TD">Listed on the report this week.</td></tr>'
+            for i, r in enumerate(injuries)
+        )
+        sections.append(
+            f'<div class="ResponsiveTable Table__league-injuries">'
+            f'<div class="Table__Title"><div class="flex items-center"><span class="injuries__teamName ml2">'
+            f'{escape(team)}</span></div></div>'
+            f'<div class="flex"><div class="Table__ScrollerWrapper relative overflow-hidden">'
+            f'<div class="Table__Scroller"><table class="Table"><thead class="Table__THEAD"><tr class="Table__TR">'
+            f'<th>NAME</th><th>POS</th><th>EST. RETURN DATE</th><th>STATUS</th><th>COMMENT</th></tr></thead>'
+            f'<tbody class="Table__TBODY">{body}</tbody></table></div></div></div></div>'
+        )
+
+    chrome = ''.join(f'<li class="NavItem"><a href="/nfl/team/_/name/{n}">Team {n}</a></li>' for n in range(400))
+    script = '<script>window.__espnfitt__=' + '{"x":1},' * 20000 + '{};</script>'
+    return (f'<!DOCTYPE html><html><head><title>NFL Injuries</title>{script}</head><body>'
+            f'<nav><ul>{chrome}</ul></nav><div class="Wrapper"><div class="Card">{"".join(sections)}'
+            f'</div></div><footer>{chrome}</footer></body></html>')
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate the synthetic benchmark database')
+    parser.add_argument('--path', default=os.path.join('benchmarks', 'data', 'synthetic.db'))
+    parser.add_argument('--seasons', type=int, nargs='+', default=[2022, 2023, 2024, 2025])
+    parser.add_argument('--current-week', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb'], default='sqlite')
+    args = parser.parse_args()
+
+    counts = generate(args.path, args.seasons, args.current_week, seed=args.seed, backend=args.backend)
+    print(f"✓ Synthetic database written to {args.path}")
+    for table, count in counts.items():
+        print(f"   {table:<20} {count:>8,}")
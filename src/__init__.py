@@ -0,0 +1,8 @@
+"""
+Gridiron Prophet
+Every module imports through this package (src.database, src.models, ...), so
+each module - and the config/.env load below - runs once per process
+"""
+from dotenv import load_dotenv
+
+load_dotenv('config/.env')
@@ -1,9 +1,8 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
 from datetime import datetime
+from src.lazy_imports import lazy_import
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
 
 class WeeklyAccuracyCalculator:
     
@@ -16,7 +15,7 @@ class WeeklyAccuracyCalculator:
                         recommended_bet=None, edge=None):
         
         try:
-            self.db.execute_query("""
+            self.db.execute_update("""
                 INSERT INTO predictions 
                 (season, week, game_id, home_team, away_team, 
                  predicted_home_score, predicted_away_score, predicted_winner,
@@ -164,7 +163,7 @@ class WeeklyAccuracyCalculator:
         print("=" * 70)
         
         try:
-            self.db.execute_query("""
+            self.db.execute_update("""
                 INSERT INTO weekly_accuracy 
                 (season, week, total_predictions, correct_predictions, accuracy_pct,
                  spread_3pt_accuracy, spread_7pt_accuracy, avg_margin_error,
@@ -201,6 +200,117 @@ class WeeklyAccuracyCalculator:
             print(f"\n❌ Error storing accuracy: {e}")
             return None
     
+    def recalculate_season(self, season, incremental=False):
+        """
+        Grade every week of a season from one predictions/games join
+
+        With incremental=True only weeks whose count of graded predictions
+        differs from the stored weekly_accuracy row (i.e. newly Final games)
+        are recomputed and written
+        """
+        print(f"\n{'=' * 70}")
+        print(f"RECALCULATING {season} SEASON ACCURACY{' (INCREMENTAL)' if incremental else ''}")
+        print(f"{'=' * 70}\n")
+
+        rows = self.db.execute_query("""
+            SELECT 
+                p.week,
+                p.predicted_home_score,
+                p.predicted_away_score,
+                p.predicted_winner,
+                p.confidence,
+                g.home_score,
+                g.away_score
+            FROM predictions p
+            JOIN games g ON p.game_id = g.game_id
+            WHERE p.season = %s
+            AND g.game_status = 'Final'
+        """, (season,))
+
+        if not rows:
+            print(f"❌ No graded predictions found for {season}")
+            return None
+
+        df = pd.DataFrame(rows)
+        for col in ['predicted_home_score', 'predicted_away_score', 'home_score', 'away_score']:
+            df[col] = df[col].astype(float)
+
+        actual_winner = np.where(df['home_score'] > df['away_score'], 'HOME', 'AWAY')
+        predicted_margin = (df['predicted_home_score'] - df['predicted_away_score']).abs()
+        actual_margin = (df['home_score'] - df['away_score']).abs()
+
+        df['correct'] = df['predicted_winner'] == actual_winner
+        df['margin_diff'] = (predicted_margin - actual_margin).abs()
+        df['within_3'] = df['margin_diff'] <= 3
+        df['within_7'] = df['margin_diff'] <= 7
+        df['high_conf'] = df['confidence'] == 'HIGH'
+        df['high_conf_correct'] = df['high_conf'] & df['correct']
+
+        weekly = df.groupby('week').agg(
+            total_predictions=('correct', 'size'),
+            correct_predictions=('correct', 'sum'),
+            within_3=('within_3', 'sum'),
+            within_7=('within_7', 'sum'),
+            avg_margin_error=('margin_diff', 'mean'),
+            high_conf_total=('high_conf', 'sum'),
+            high_conf_correct=('high_conf_correct', 'sum')
+        ).reset_index()
+
+        if incremental:
+            stored = self.db.execute_query("""
+                SELECT week, total_predictions FROM weekly_accuracy WHERE season = %s
+            """, (season,))
+            stored_totals = {r['week']: r['total_predictions'] for r in stored}
+            changed = weekly['total_predictions'] != weekly['week'].map(stored_totals)
+            weekly = weekly[changed]
+
+            if weekly.empty:
+                print("✓ All weeks already up to date")
+                return weekly
+
+        weekly['accuracy_pct'] = weekly['correct_predictions'] / weekly['total_predictions'] * 100
+        weekly['spread_3pt_accuracy'] = weekly['within_3'] / weekly['total_predictions'] * 100
+        weekly['spread_7pt_accuracy'] = weekly['within_7'] / weekly['total_predictions'] * 100
+
+        print(f"{'Week':<6} {'Record':<10} {'Winner%':<10} {'±3pts%':<10} {'±7pts%':<10} {'AvgErr':<8}")
+        print("-" * 70)
+        for r in weekly.itertuples(index=False):
+            record = f"{r.correct_predictions}-{r.total_predictions - r.correct_predictions}"
+            print(f"{r.week:<6} {record:<10} {r.accuracy_pct:<10.1f} {r.spread_3pt_accuracy:<10.1f} "
+                  f"{r.spread_7pt_accuracy:<10.1f} {r.avg_margin_error:<8.1f}")
+
+        params = [
+            (season, int(r.week), int(r.total_predictions), int(r.correct_predictions),
+             float(r.accuracy_pct), float(r.spread_3pt_accuracy), float(r.spread_7pt_accuracy),
+             float(r.avg_margin_error), int(r.high_conf_total), int(r.high_conf_correct))
+            for r in weekly.itertuples(index=False)
+        ]
+
+        try:
+            self.db.execute_many("""
+                INSERT INTO weekly_accuracy 
+                (season, week, total_predictions, correct_predictions, accuracy_pct,
+                 spread_3pt_accuracy, spread_7pt_accuracy, avg_margin_error,
+                 high_conf_total, high_conf_correct, calculated_date)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE
+                total_predictions = VALUES(total_predictions),
+                correct_predictions = VALUES(correct_predictions),
+                accuracy_pct = VALUES(accuracy_pct),
+                spread_3pt_accuracy = VALUES(spread_3pt_accuracy),
+                spread_7pt_accuracy = VALUES(spread_7pt_accuracy),
+                avg_margin_error = VALUES(avg_margin_error),
+                high_conf_total = VALUES(high_conf_total),
+                high_conf_correct = VALUES(high_conf_correct),
+                calculated_date = NOW()
+            """, params)
+        except Exception as e:
+            print(f"\n❌ Error storing accuracy: {e}")
+            return None
+
+        print(f"\n✓ Accuracy saved for {len(params)} week(s)")
+        return weekly
+
     def get_season_accuracy_trend(self, season, detailed=False):
         
         query = """
@@ -261,24 +371,31 @@ class WeeklyAccuracyCalculator:
         
         return results
 
-if __name__ == "__main__":
-    calculator = WeeklyAccuracyCalculator()
-    
+def main(argv=None):
     import argparse
     parser = argparse.ArgumentParser(description='Calculate weekly prediction accuracy')
     parser.add_argument('--season', type=int, default=2025)
     parser.add_argument('--week', type=int)
+    parser.add_argument('--all', action='store_true', help='Recalculate every week of the season')
+    parser.add_argument('--incremental', action='store_true', help='With --all, only weeks with newly Final games')
     parser.add_argument('--view', action='store_true')
     parser.add_argument('--detailed', action='store_true')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    calculator = WeeklyAccuracyCalculator()
     
     if args.view:
         calculator.get_season_accuracy_trend(args.season, detailed=args.detailed)
+    elif args.all:
+        calculator.recalculate_season(args.season, incremental=args.incremental)
     elif args.week:
         calculator.calculate_week_accuracy(season=args.season, week=args.week)
         print("\nTo view season trend:")
-        print(f"  python src/analysis/calculate_weekly_accuracy.py --season {args.season} --view --detailed")
+        print(f"  gridiron grade --season {args.season} --view --detailed")
     else:
-        print("Error: Either --week or --view is required")
-        parser.print_help()
\ No newline at end of file
+        print("Error: Either --week, --all or --view is required")
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
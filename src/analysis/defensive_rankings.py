@@ -1,23 +1,49 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from database.db_manager import DatabaseManager
-import pandas as pd
+from src.database.db_manager import DatabaseManager
+from src.database.analytics_mirror import AnalyticsMirror
+from src.lazy_imports import lazy_import
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
 
 class DefensiveRankings:
     """Calculate and track defensive performance rankings"""
 
-    def __init__(self):
+    def __init__(self, mirror=None):
         self.db = DatabaseManager()
+        self.mirror = mirror or AnalyticsMirror.from_env()
+        self._mirror_seasons = {}
+        self._mirror_rankings = {}
     
-    def calculate_pass_defense_rankings(self, season, through_week=None):
-        """
-        Calculate pass defense rankings (yards allowed per game)
-        
-        Returns rankings for each team
-        """
-        week_clause = f"AND g.week <= {through_week}" if through_week else ""
+    def _mirror_season(self, season):
+        """Final games and their box scores (tagged with the defending team) for a season"""
+        if season not in self._mirror_seasons:
+            games = self.mirror.frame('games', season)
+            games = games[games['game_status'] == 'Final']
+            
+            stats = self.mirror.frame('player_game_stats', season).drop(columns=['week']).merge(
+                games[['game_id', 'week', 'home_team_id', 'away_team_id']], on='game_id'
+            )
+            stats['defense_team_id'] = np.where(
+                stats['team_id'] == stats['home_team_id'], stats['away_team_id'], stats['home_team_id']
+            )
+            self._mirror_seasons[season] = (games, stats)
+        return self._mirror_seasons[season]
+    
+    def _mirror_opponent_stats(self, season, through_week):
+        """Final-game box scores from the Parquet mirror through a week"""
+        stats = self._mirror_season(season)[1]
+        return stats[stats['week'] <= through_week] if through_week else stats
+    
+    def _mirror_rank(self, grouped, sort_column, rank_column):
+        """Attach team name/abbreviation and rank ascending on sort_column"""
+        teams = self.mirror.lookup('teams')[['team_id', 'name', 'abbreviation']]
+        df = teams.merge(grouped.reset_index(), on='team_id')
+        df = df.sort_values(sort_column, kind='mergesort').reset_index(drop=True)
+        df[rank_column] = range(1, len(df) + 1)
+        return df
+    
+    @staticmethod
+    def _pass_defense_query(season, through_week=None):
+        week_clause = "AND g.week <= %s" if through_week else ""
         
         query = f"""
             SELECT 
@@ -40,17 +66,36 @@ class DefensiveRankings:
             GROUP BY t.team_id, t.name, t.abbreviation
             ORDER BY avg_pass_yards_per_game ASC
         """
+        return query, (season, through_week) if through_week else (season,)
+    
+    def calculate_pass_defense_rankings(self, season, through_week=None):
+        """
+        Calculate pass defense rankings (yards allowed per game)
         
-        results = self.db.execute_query(query, (season,))
-        df = pd.DataFrame(results)
+        Returns rankings for each team
+        """
+        if self.mirror:
+            stats = self._mirror_opponent_stats(season, through_week)
+            stats = stats[stats['pass_yards'] > 0]
+            grouped = stats.groupby('defense_team_id').agg(
+                games_played=('game_id', 'nunique'),
+                total_pass_yards_allowed=('pass_yards', 'sum'),
+                avg_pass_yards_per_game=('pass_yards', 'mean'),
+                pass_tds_allowed=('pass_touchdowns', 'sum'),
+                interceptions=('interceptions', 'sum')
+            ).rename_axis('team_id')
+            return self._mirror_rank(grouped, 'avg_pass_yards_per_game', 'pass_defense_rank')
+        
+        query, params = self._pass_defense_query(season, through_week)
+        df = self.db.query_frame(query, params)
         
         df['pass_defense_rank'] = range(1, len(df) + 1)
         
         return df
     
-    def calculate_run_defense_rankings(self, season, through_week=None):
-        """Calculate run defense rankings (yards allowed per game)"""
-        week_clause = f"AND g.week <= {through_week}" if through_week else ""
+    @staticmethod
+    def _run_defense_query(season, through_week=None):
+        week_clause = "AND g.week <= %s" if through_week else ""
         
         query = f"""
             SELECT 
@@ -72,17 +117,31 @@ class DefensiveRankings:
             GROUP BY t.team_id, t.name, t.abbreviation
             ORDER BY avg_rush_yards_per_game ASC
         """
+        return query, (season, through_week) if through_week else (season,)
+    
+    def calculate_run_defense_rankings(self, season, through_week=None):
+        """Calculate run defense rankings (yards allowed per game)"""
+        if self.mirror:
+            stats = self._mirror_opponent_stats(season, through_week)
+            stats = stats[stats['rush_yards'] > 0]
+            grouped = stats.groupby('defense_team_id').agg(
+                games_played=('game_id', 'nunique'),
+                total_rush_yards_allowed=('rush_yards', 'sum'),
+                avg_rush_yards_per_game=('rush_yards', 'mean'),
+                rush_tds_allowed=('rush_touchdowns', 'sum')
+            ).rename_axis('team_id')
+            return self._mirror_rank(grouped, 'avg_rush_yards_per_game', 'run_defense_rank')
         
-        results = self.db.execute_query(query, (season,))
-        df = pd.DataFrame(results)
+        query, params = self._run_defense_query(season, through_week)
+        df = self.db.query_frame(query, params)
         
         df['run_defense_rank'] = range(1, len(df) + 1)
         
         return df
     
-    def calculate_points_allowed_rankings(self, season, through_week=None):
-        """Calculate points allowed rankings"""
-        week_clause = f"AND week <= {through_week}" if through_week else ""
+    @staticmethod
+    def _points_allowed_query(season, through_week=None):
+        week_clause = "AND week <= %s" if through_week else ""
         
         query = f"""
             SELECT 
@@ -106,9 +165,27 @@ class DefensiveRankings:
             GROUP BY t.team_id, t.name, t.abbreviation
             ORDER BY avg_points_allowed ASC
         """
+        return query, (season, through_week) if through_week else (season,)
+    
+    def calculate_points_allowed_rankings(self, season, through_week=None):
+        """Calculate points allowed rankings"""
+        if self.mirror:
+            games = self._mirror_season(season)[0]
+            if through_week:
+                games = games[games['week'] <= through_week]
+            allowed = pd.concat([
+                pd.DataFrame({'team_id': games['home_team_id'], 'points_allowed': games['away_score']}),
+                pd.DataFrame({'team_id': games['away_team_id'], 'points_allowed': games['home_score']})
+            ])
+            grouped = allowed.groupby('team_id').agg(
+                games=('points_allowed', 'size'),
+                total_points_allowed=('points_allowed', 'sum'),
+                avg_points_allowed=('points_allowed', 'mean')
+            )
+            return self._mirror_rank(grouped, 'avg_points_allowed', 'points_defense_rank')
         
-        results = self.db.execute_query(query, (season,))
-        df = pd.DataFrame(results)
+        query, params = self._points_allowed_query(season, through_week)
+        df = self.db.query_frame(query, params)
         
         df['points_defense_rank'] = range(1, len(df) + 1)
         
@@ -116,6 +193,9 @@ class DefensiveRankings:
     
     def get_all_defensive_rankings(self, season, through_week=None):
         """Get comprehensive defensive rankings"""
+        # The mirror is a snapshot, so rankings for a week never change within a run
+        if self.mirror and (season, through_week) in self._mirror_rankings:
+            return self._mirror_rankings[(season, through_week)].copy()
         
         pass_def = self.calculate_pass_defense_rankings(season, through_week)
         run_def = self.calculate_run_defense_rankings(season, through_week)
@@ -137,6 +217,9 @@ class DefensiveRankings:
         
         rankings = rankings.sort_values('overall_defense_rank')
         
+        if self.mirror:
+            self._mirror_rankings[(season, through_week)] = rankings.copy()
+        
         return rankings
 
 def main():
@@ -1,9 +1,6 @@
-import sys
-import os
 from datetime import datetime
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
 
 class InjuryImpactAnalyzer:
     
@@ -81,15 +78,41 @@ class InjuryImpactAnalyzer:
         
         return 1
     
-    def get_player_importance(self, player_id):
-        query = """
+    IMPORTANCE_QUERY = """
             SELECT AVG(snap_percentage) as avg_snaps, MIN(depth_order) as depth
             FROM depth_charts
             WHERE player_id = %s
             AND snap_percentage > 0
         """
-        result = self.db.execute_query(query, (player_id,))
-        
+
+    DEPTH_QUERY = """
+            SELECT depth_order as depth, position
+            FROM depth_charts
+            WHERE player_id = %s
+            ORDER BY depth_order ASC
+            LIMIT 1
+        """
+
+    TEAM_INJURIES_QUERY = """
+            SELECT i.*, p.name as player_name, ps.position, p.player_id
+            FROM injuries i
+            JOIN players p ON i.player_id = p.player_id
+            JOIN player_seasons ps ON p.player_id = ps.player_id AND i.season = ps.season
+            JOIN teams t ON ps.team_id = t.team_id
+            INNER JOIN (
+                SELECT player_id, MAX(week) as max_week
+                FROM injuries
+                WHERE season = %s AND week <= %s
+                GROUP BY player_id
+            ) latest ON i.player_id = latest.player_id AND i.week = latest.max_week
+            WHERE t.abbreviation = %s
+            AND i.season = %s
+            AND i.injury_status IN ('Out', 'Doubtful', 'Questionable', 'Injured Reserve', 'Reserve-Ret', 'IR', 'PUP', 'NFI')
+        """
+
+    @staticmethod
+    def _snap_importance(result):
+        """Importance from snap share and depth, or None when the player has no snaps"""
         if result and result[0]['avg_snaps']:
             avg_snaps = float(result[0]['avg_snaps'])
             depth = result[0]['depth']
@@ -102,16 +125,11 @@ class InjuryImpactAnalyzer:
             
             importance = min(snap_factor + depth_bonus, 1.0)
             return importance
-        
-        depth_query = """
-            SELECT depth_order as depth, position
-            FROM depth_charts
-            WHERE player_id = %s
-            ORDER BY depth_order ASC
-            LIMIT 1
-        """
-        depth_result = self.db.execute_query(depth_query, (player_id,))
-        
+        return None
+
+    @staticmethod
+    def _depth_importance(depth_result):
+        """Fallback importance from depth chart position alone"""
         if depth_result and depth_result[0]['depth']:
             depth = depth_result[0]['depth']
             position = depth_result[0]['position']
@@ -128,11 +146,18 @@ class InjuryImpactAnalyzer:
                 return 0.3
         
         return 0.3
+
+    def get_player_importance(self, player_id):
+        importance = self._snap_importance(self.db.execute_query(self.IMPORTANCE_QUERY, (player_id,)))
+        if importance is not None:
+            return importance
+        return self._depth_importance(self.db.execute_query(self.DEPTH_QUERY, (player_id,)))
     
-    def calculate_injury_impact(self, player_id, position, injury_status):
+    def calculate_injury_impact(self, player_id, position, injury_status, player_importance=None):
         position_weight = self.position_weights.get(position, 0.5)
         severity = self.status_multipliers.get(injury_status, 0.5)
-        player_importance = self.get_player_importance(player_id)
+        if player_importance is None:
+            player_importance = self.get_player_importance(player_id)
         impact = position_weight * severity * player_importance * 10
         return round(impact, 2)
     
@@ -140,23 +165,7 @@ class InjuryImpactAnalyzer:
         if week is None:
             week = self.get_current_nfl_week()
             
-        query = """
-            SELECT i.*, p.name as player_name, ps.position, p.player_id
-            FROM injuries i
-            JOIN players p ON i.player_id = p.player_id
-            JOIN player_seasons ps ON p.player_id = ps.player_id AND i.season = ps.season
-            JOIN teams t ON ps.team_id = t.team_id
-            INNER JOIN (
-                SELECT player_id, MAX(week) as max_week
-                FROM injuries
-                WHERE season = %s AND week <= %s
-                GROUP BY player_id
-            ) latest ON i.player_id = latest.player_id AND i.week = latest.max_week
-            WHERE t.abbreviation = %s
-            AND i.season = %s
-            AND i.injury_status IN ('Out', 'Doubtful', 'Questionable', 'Injured Reserve', 'Reserve-Ret', 'IR', 'PUP', 'NFI')
-        """
-        injuries = self.db.execute_query(query, (season, week, team_abbr, season))
+        injuries = self.db.execute_query(self.TEAM_INJURIES_QUERY, (season, week, team_abbr, season))
         
         if not injuries:
             return {
@@ -168,27 +177,32 @@ class InjuryImpactAnalyzer:
                 'injuries': []
             }
         
+        # Snap share and importance for every injured player in one batch; the
+        # depth-only fallback is a second batch for players without snaps
+        importance_rows = self.db.execute_batch(
+            (self.IMPORTANCE_QUERY, (injury['player_id'],)) for injury in injuries
+        )
+        importances = [self._snap_importance(rows) for rows in importance_rows]
+        fallback = [i for i, importance in enumerate(importances) if importance is None]
+        depth_rows = self.db.execute_batch(
+            (self.DEPTH_QUERY, (injuries[i]['player_id'],)) for i in fallback
+        )
+        for i, rows in zip(fallback, depth_rows):
+            importances[i] = self._depth_importance(rows)
+        
         processed_injuries = []
         total_impact = 0
         skipped_count = 0
         critical_injuries = []
         
-        for injury in injuries:
+        for injury, snap_rows, importance in zip(injuries, importance_rows, importances):
             player_id = injury['player_id']
             position = injury['position']
             status = injury['injury_status']
             player_name = injury['player_name']
             
-            snap_query = """
-                SELECT AVG(snap_percentage) as avg_snaps
-                FROM depth_charts
-                WHERE player_id = %s
-                AND snap_percentage > 0
-            """
-            snap_result = self.db.execute_query(snap_query, (player_id,))
-            
-            if snap_result and snap_result[0]['avg_snaps']:
-                avg_snaps = float(snap_result[0]['avg_snaps']) / 100.0
+            if snap_rows and snap_rows[0]['avg_snaps']:
+                avg_snaps = float(snap_rows[0]['avg_snaps']) / 100.0
             else:
                 avg_snaps = 0.0
             
@@ -196,7 +210,7 @@ class InjuryImpactAnalyzer:
                 skipped_count += 1
                 continue
             
-            impact_score = self.calculate_injury_impact(player_id, position, status)
+            impact_score = self.calculate_injury_impact(player_id, position, status, importance)
             
             injury_data = {
                 'player': player_name,
@@ -1,11 +1,6 @@
-import sys
-from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from src.database.db_manager import DatabaseManager
 
 POSITION_WEIGHTS = {
@@ -1,18 +1,14 @@
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
-from models.spread_predictor import SpreadPredictor
-from analysis.defensive_rankings import DefensiveRankings
-from betting.roi_tracker import ROITracker
+from src.database.db_manager import DatabaseManager
+from src.models.spread_predictor import SpreadPredictor
+from src.analysis.defensive_rankings import DefensiveRankings
+from src.betting.roi_tracker import ROITracker
+from src.data_collection.payload_archive import get_archive
 import requests
 import pandas as pd
-from dotenv import load_dotenv
 import pickle
 
-load_dotenv('config/.env')
-
 class OddsComparator:
     """Compare model predictions against live Vegas odds to find betting edge"""
     
@@ -49,12 +45,11 @@ class OddsComparator:
         print("Fetching current NFL odds from The Odds API...")
         
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            payload = get_archive().fetch('odds_api', url, params=params, key='us')
+            data = payload.json()
             
             print(f"✓ Found {len(data)} upcoming games")
-            print(f"  Remaining API requests: {response.headers.get('x-requests-remaining', 'Unknown')}")
+            print(f"  Remaining API requests: {payload.headers.get('x-requests-remaining', 'Unknown')}")
             
             return data
             
@@ -1,9 +1,7 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from database.db_manager import DatabaseManager
-import pandas as pd
+from src.database.db_manager import DatabaseManager
+from src.lazy_imports import lazy_import
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
 from datetime import datetime
 
 class ROITracker:
@@ -99,6 +97,103 @@ class ROITracker:
         
         return bet_result, profit_loss
     
+    def grade_bets(self, bets):
+        """
+        Vectorized WIN/LOSS/PUSH and profit/loss for a frame of bets
+
+        Expects vegas_spread, bet_amount, recommendation, home_score and
+        away_score columns; uses the same rules as update_prediction_result
+        """
+        actual_spread = bets['home_score'].astype(float) - bets['away_score'].astype(float)
+        vegas_spread = bets['vegas_spread'].astype(float)
+        bet_amount = bets['bet_amount'].astype(float)
+        home_bet = bets['recommendation'].str.contains('HOME', na=False)
+
+        covered = np.where(home_bet, actual_spread > vegas_spread, actual_spread < vegas_spread)
+        push = (actual_spread - vegas_spread).abs() < 0.5
+
+        bet_result = np.where(push, 'PUSH', np.where(covered, 'WIN', 'LOSS'))
+        profit_loss = np.select(
+            [bet_result == 'WIN', bet_result == 'PUSH'],
+            [bet_amount * 0.909, 0.0],
+            default=-bet_amount
+        )
+
+        return bets.assign(actual_spread=actual_spread, bet_result=bet_result, profit_loss=profit_loss)
+
+    def settle_pending(self, season=None, week=None):
+        """
+        Settle every unsettled bet whose game is Final in one pass
+
+        Joins prediction_log to games, grades all bets at once, writes them
+        with one batched UPDATE and refreshes roi_summary once per week
+        """
+        # Bets logged without a line can't be graded; they stay unsettled
+        where_clause = ["pl.bet_result IS NULL", "pl.vegas_spread IS NOT NULL", "g.game_status = 'Final'"]
+        params = []
+
+        if season:
+            where_clause.append("pl.season = %s")
+            params.append(season)
+        if week:
+            where_clause.append("pl.week = %s")
+            params.append(week)
+
+        pending = self.db.execute_query(f"""
+            SELECT 
+                pl.prediction_id,
+                pl.season,
+                pl.week,
+                pl.vegas_spread,
+                pl.bet_amount,
+                pl.recommendation,
+                g.home_score,
+                g.away_score
+            FROM prediction_log pl
+            JOIN games g ON g.season = pl.season
+                AND g.week = pl.week
+                AND g.home_team_id = pl.home_team_id
+                AND g.away_team_id = pl.away_team_id
+            WHERE {" AND ".join(where_clause)}
+        """, tuple(params))
+
+        if not pending:
+            print("No pending bets with final scores to settle")
+            return pd.DataFrame()
+
+        graded = self.grade_bets(pd.DataFrame(pending))
+
+        self.db.execute_many("""
+            UPDATE prediction_log
+            SET actual_home_score = %s,
+                actual_away_score = %s,
+                actual_spread = %s,
+                bet_result = %s,
+                profit_loss = %s
+            WHERE prediction_id = %s
+        """, [
+            (int(r.home_score), int(r.away_score), float(r.actual_spread),
+             r.bet_result, float(r.profit_loss), int(r.prediction_id))
+            for r in graded.itertuples(index=False)
+        ])
+
+        for (bet_season, bet_week), _ in graded.groupby(['season', 'week']):
+            self.update_roi_summary(int(bet_season), int(bet_week))
+
+        counts = graded['bet_result'].value_counts()
+        print(f"✓ Settled {len(graded)} bets: {counts.get('WIN', 0)}-{counts.get('LOSS', 0)}-{counts.get('PUSH', 0)} "
+              f"(${graded['profit_loss'].sum():+,.2f})")
+
+        return graded
+
+    def settle_week(self, season, week):
+        """Settle all pending bets for one week"""
+        return self.settle_pending(season, week)
+
+    def settle_all_pending(self):
+        """Settle every pending bet across all seasons"""
+        return self.settle_pending()
+
     def update_roi_summary(self, season, week):
         """Calculate and update ROI summary for a season/week"""
         
@@ -122,7 +217,7 @@ class ROITracker:
             roi = (s['total_profit_loss'] / s['total_wagered'] * 100) if s['total_wagered'] > 0 else 0
             win_rate = (s['wins'] / (s['wins'] + s['losses']) * 100) if (s['wins'] + s['losses']) > 0 else 0
             
-            self.db.execute_query("""
+            self.db.execute_update("""
                 INSERT INTO roi_summary 
                 (season, week, total_bets, winning_bets, losing_bets, push_bets,
                  total_wagered, total_profit_loss, roi_percentage, win_rate, avg_edge)
@@ -217,10 +312,23 @@ class ROITracker:
             print(f"{week_str:<6} {row['total_bets']:<6} {record:<12} "
                   f"{row['win_rate']:.1f}%    {profit_str:<12} {roi_str:<8}")
 
-def main():
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Settle bets and report ROI')
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--week', type=int)
+    parser.add_argument('--settle', action='store_true', help='Settle pending bets before reporting')
+    args = parser.parse_args(argv)
+    
     tracker = ROITracker()
     
-    tracker.print_performance_summary(season=2025)
+    if args.settle:
+        if args.week:
+            tracker.settle_week(args.season, args.week)
+        else:
+            tracker.settle_all_pending()
+    
+    tracker.print_performance_summary(season=args.season)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,7 @@
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from betting.odds_comparator import OddsComparator
-from betting.roi_tracker import ROITracker
+from src.betting.odds_comparator import OddsComparator
+from src.betting.roi_tracker import ROITracker
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
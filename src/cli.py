@@ -0,0 +1,138 @@
+"""
+Gridiron Prophet CLI
+One entry point for the weekly jobs. Every subcommand runs in this process,
+so a pipeline pays interpreter startup and imports once
+
+    gridiron ingest [games rosters injuries lines mirror]
+    gridiron train [--seasons 2022 2023 2024]
+    gridiron predict [--season 2025] [--week 8] [--publish]
+    gridiron grade --season 2025 --all --incremental
+    gridiron settle [--season 2025] [--week 7]
+    gridiron live [--live-interval 30]
+    gridiron refresh [--interval 120]
+    gridiron serve [streamlit options]
+"""
+import argparse
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def ingest_games():
+    from src.data_collection.fetch_games import main
+    main()
+
+
+def ingest_rosters():
+    from src.data_collection.smart_roster_updater import SmartRosterUpdater
+    if not SmartRosterUpdater().run():
+        raise RuntimeError("roster update failed")
+
+
+def ingest_injuries():
+    from src.data_collection.smart_injury_updater import main
+    main([])
+
+
+def ingest_lines():
+    from src.data_collection.fetch_betting_lines import main
+    main()
+
+
+def sync_mirror(seasons=None):
+    from src.database.analytics_mirror import main
+    main(['--season', *map(str, seasons)] if seasons else [])
+
+
+# Run in this order when `gridiron ingest` is given no sources
+INGEST_SOURCES = {
+    'games': ingest_games,
+    'rosters': ingest_rosters,
+    'injuries': ingest_injuries,
+    'lines': ingest_lines,
+    'mirror': sync_mirror,
+}
+DEFAULT_INGEST = ['games', 'rosters', 'injuries', 'lines']
+
+
+def predict(season=2025, week=None, publish=False):
+    """
+    Train once, predict the week and (with publish) build the matchup matrix
+    and prediction snapshot from the same trained predictor
+    """
+    from src.models.master_betting_predictor import prepare_predictor
+
+    predictor, week = prepare_predictor(week, season)
+    predictor.analyze_week(season=season, week=week)
+    if publish:
+        from src.models.matchup_matrix import MatchupMatrixBuilder
+        from src.models.prediction_snapshot import PredictionSnapshotWriter
+        MatchupMatrixBuilder(predictor).run(season, week)
+        PredictionSnapshotWriter(predictor).run(season, week)
+    return predictor, week
+
+
+def serve(streamlit_args=()):
+    from streamlit.web import cli as stcli
+    sys.argv = ['streamlit', 'run', os.path.join(PROJECT_ROOT, 'streamlit_app.py'), *streamlit_args]
+    return stcli.main()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='gridiron', description='Gridiron Prophet weekly jobs')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help='Collect games, rosters, injuries and betting lines')
+    ingest.add_argument('sources', nargs='*', metavar='source',
+                        help=f"{', '.join(INGEST_SOURCES)} (default: {' '.join(DEFAULT_INGEST)})")
+
+    predict_cmd = sub.add_parser('predict', help='Train on completed weeks and predict a week')
+    predict_cmd.add_argument('--season', type=int, default=2025)
+    predict_cmd.add_argument('--week', type=int, help='Default: current week')
+    predict_cmd.add_argument('--publish', action='store_true',
+                             help='Also build the matchup matrix and publish the snapshot')
+
+    # These forward their remaining arguments to the module's own parser
+    sub.add_parser('train', add_help=False, help='Train and save the game outcome model')
+    sub.add_parser('grade', add_help=False, help='Grade predictions against final scores')
+    sub.add_parser('settle', add_help=False, help='Settle pending bets and report ROI')
+    sub.add_parser('live', add_help=False, help='Poll the live scoreboard on game days')
+    sub.add_parser('refresh', add_help=False, help='Republish prediction snapshots when inputs change')
+    sub.add_parser('serve', add_help=False, help='Run the Streamlit dashboard')
+
+    args, rest = parser.parse_known_args(argv)
+
+    if args.command == 'train':
+        from src.models.game_predictor import main as train_main
+        return train_main(rest)
+    if args.command == 'grade':
+        from src.analysis.calculate_weekly_accuracy import main as grade_main
+        return grade_main(rest)
+    if args.command == 'settle':
+        from src.betting.roi_tracker import main as settle_main
+        return settle_main(['--settle', *rest])
+    if args.command == 'live':
+        from src.data_collection.live_scoreboard import main as live_main
+        return live_main(rest)
+    if args.command == 'refresh':
+        from src.models.prediction_refresh import main as refresh_main
+        return refresh_main(rest)
+    if args.command == 'serve':
+        return serve(rest)
+
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    if args.command == 'ingest':
+        unknown = [s for s in args.sources if s not in INGEST_SOURCES]
+        if unknown:
+            parser.error(f"unknown ingest source: {', '.join(unknown)}")
+        for source in args.sources or DEFAULT_INGEST:
+            INGEST_SOURCES[source]()
+    elif args.command == 'predict':
+        predict(args.season, args.week, args.publish)
+
+
+if __name__ == "__main__":
+    main()
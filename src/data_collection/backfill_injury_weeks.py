@@ -1,11 +1,6 @@
-import sys
-from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from src.database.db_manager import DatabaseManager
 
 SEASON_2025_WEEKS = {
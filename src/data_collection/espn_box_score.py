@@ -0,0 +1,111 @@
+"""
+ESPN Box Score Parser
+Flattens the boxscore.players section of an ESPN game summary into one wide
+row per athlete. Stat values are collected in a single walk over the JSON
+and converted column-wise, and every category an athlete appears in
+(passing, rushing, receiving, ...) lands on the same row, so a player-game
+is written once
+"""
+import numpy as np
+import pandas as pd
+
+# player_game_stats columns filled from ESPN box scores
+STAT_COLUMNS = [
+    'pass_attempts', 'pass_completions', 'pass_yards', 'pass_touchdowns', 'interceptions', 'sacks_taken',
+    'rush_attempts', 'rush_yards', 'rush_touchdowns',
+    'targets', 'receptions', 'receiving_yards', 'receiving_touchdowns',
+    'fumbles', 'fumbles_lost'
+]
+
+_COLUMN_INDEX = {column: i for i, column in enumerate(STAT_COLUMNS)}
+
+# category -> {label: [(stat column, part)]}; part picks one side of an 'a/b'
+# or 'a-b' value (C/ATT is completions/attempts, SACKS is sacks-yards lost)
+CATEGORY_LABELS = {
+    'passing': {
+        'C/ATT': [('pass_completions', 0), ('pass_attempts', 1)],
+        'YDS': [('pass_yards', 0)],
+        'TD': [('pass_touchdowns', 0)],
+        'INT': [('interceptions', 0)],
+        'SACKS': [('sacks_taken', 0)],
+    },
+    'rushing': {
+        'CAR': [('rush_attempts', 0)],
+        'YDS': [('rush_yards', 0)],
+        'TD': [('rush_touchdowns', 0)],
+    },
+    'receiving': {
+        'REC': [('receptions', 0)],
+        'YDS': [('receiving_yards', 0)],
+        'TD': [('receiving_touchdowns', 0)],
+        'TGTS': [('targets', 0)],
+    },
+    'fumbles': {
+        'FUM': [('fumbles', 0)],
+        'LOST': [('fumbles_lost', 0)],
+    },
+}
+
+ATHLETE_COLUMNS = ['team_abbr', 'athlete_id', 'name']
+
+
+def flatten_box_score(players):
+    """
+    One row per athlete from a summary's boxscore.players list
+
+    Returns a DataFrame with ATHLETE_COLUMNS + STAT_COLUMNS (ints). Athletes
+    that only appear in unmapped categories (defense, kicking, ...) are kept
+    with zero stats, as the per-category loader wrote them
+    """
+    athletes = {}                  # (team, athlete id or name) -> row number
+    index = []                     # row number -> (team, athlete id, name)
+    rows, cols, values, parts = [], [], [], []
+
+    for team_stats in players or []:
+        team_abbr = team_stats.get('team', {}).get('abbreviation', '')
+        for category in team_stats.get('statistics', []):
+            # label index -> [(column, part)] for the labels this category maps
+            mapped = CATEGORY_LABELS.get(category.get('name', '').lower(), {})
+            targets = [(i, mapped[label]) for i, label in enumerate(category.get('labels') or [])
+                       if label in mapped]
+
+            for athlete_data in category.get('athletes', []):
+                athlete = athlete_data.get('athlete', {})
+                name = athlete.get('displayName', '')
+                if not name:
+                    continue
+                key = (team_abbr, athlete.get('id') or name)
+                row = athletes.get(key)
+                if row is None:
+                    row = athletes[key] = len(index)
+                    index.append((team_abbr, athlete.get('id'), name))
+
+                line = athlete_data.get('stats') or []
+                for i, columns in targets:
+                    if i < len(line):
+                        for column, part in columns:
+                            rows.append(row)
+                            cols.append(_COLUMN_INDEX[column])
+                            values.append(line[i])
+                            parts.append(part)
+
+    # Scatter every (athlete, column) value into one matrix; repeated
+    # cells add up, which merges an athlete's categories into one row
+    matrix = np.zeros((len(index), len(STAT_COLUMNS)), dtype=np.int64)
+    if rows:
+        np.add.at(matrix, (np.array(rows), np.array(cols)), parse_numbers(values, parts))
+
+    frame = pd.DataFrame(index, columns=ATHLETE_COLUMNS)
+    return pd.concat([frame, pd.DataFrame(matrix, columns=STAT_COLUMNS)], axis=1)
+
+
+def parse_numbers(values, parts):
+    """
+    Integer stat values from ESPN strings, vectorized
+
+    part 0 is the leading number ('2-14' -> 2, '21/30' -> 21), part 1 the
+    number after the separator ('21/30' -> 30); blanks and '--' become 0
+    """
+    numbers = pd.Series(values, dtype=str).str.extract(r'^\s*(-?\d+)(?:\s*[/-](\d+))?')
+    picked = np.where(np.asarray(parts) == 0, numbers[0], numbers[1])
+    return pd.to_numeric(pd.Series(picked), errors='coerce').fillna(0).astype(np.int64).to_numpy()
@@ -2,25 +2,43 @@
 ESPN 2025 Stats Fetcher
 Fetches current 2025 season stats from ESPN API
 """
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import requests
-from database.db_manager import DatabaseManager
+from collections import Counter
+from src.database.db_manager import DatabaseManager
+from src.database.player_resolver import PlayerResolver, print_misses
+from src.database.ingest_state import IngestState, content_hash
+from src.data_collection.espn_box_score import flatten_box_score, STAT_COLUMNS
+from src.data_collection.fetch_games import get_current_nfl_week, GAMES_SOURCE
+from src.data_collection.payload_archive import get_archive
 from datetime import datetime
 import time
 
+# ingest_state source name for ESPN box-score player stats
+BOX_SCORE_SOURCE = 'espn_box_scores'
+
+# payload_archive source for game summaries (keyed by ESPN event id)
+SUMMARY_SOURCE = 'espn_summary'
+
 class ESPN2025Fetcher:
     """Fetch 2025 season stats from ESPN API"""
+
+    GAME_ID_QUERY = """
+            SELECT game_id, home_team_id, away_team_id
+            FROM games
+            WHERE season = %s AND week = %s
+            AND home_team_id = %s AND away_team_id = %s
+            LIMIT 1
+        """
     
     def __init__(self):
         self.db = DatabaseManager()
+        self.state = IngestState(self.db)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-        self.player_name_to_id = {}
+        self.resolver = None
         self.game_cache = {}
         
         self.espn_to_nfl = {
@@ -40,12 +58,10 @@ class ESPN2025Fetcher:
         print("LOADING ACTIVE 2025 PLAYERS")
         print("="*70)
         
-        players = self.db.get_active_players_for_season(2025)
-        for player in players:
-            self.player_name_to_id[player['name'].lower()] = player['player_id']
+        self.resolver = PlayerResolver.load(self.db, seasons=[2025], active_only=True)
         
-        print(f"✓ Loaded {len(players)} active players")
-        return players
+        print(f"✓ Loaded {len(self.resolver)} active players")
+        return self.resolver
     
     def get_week_schedule(self, season, week):
         """Get games for a specific week from ESPN"""
@@ -57,9 +73,9 @@ class ESPN2025Fetcher:
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            payload = get_archive().fetch(GAMES_SOURCE, url, params=params, season=season, week=week,
+                                          session=self.session, timeout=10)
+            data = payload.json()
             
             games = data.get('events', [])
             print(f"  Found {len(games)} games for Week {week}")
@@ -69,15 +85,15 @@ class ESPN2025Fetcher:
             print(f"  ✗ Error fetching week {week} schedule: {e}")
             return []
     
-    def get_player_stats_for_game(self, game_id):
-        """Get player statistics for a specific game"""
+    def get_player_stats_for_game(self, game_id, season=None, week=None):
+        """Get player statistics for a specific game (None when the fetch failed)"""
         url = f"http://site.api.espn.com/apis/site/v2/sports/football/nfl/summary"
         params = {'event': game_id}
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            payload = get_archive().fetch(SUMMARY_SOURCE, url, params=params, season=season, week=week,
+                                          key=str(game_id), session=self.session, timeout=10)
+            data = payload.json()
             
             boxscore = data.get('boxscore', {})
             players = boxscore.get('players', [])
@@ -86,59 +102,7 @@ class ESPN2025Fetcher:
             
         except Exception as e:
             print(f"    ✗ Error fetching game {game_id} stats: {e}")
-            return []
-    
-    def normalize_player_name(self, name):
-        """Normalize player names for matching"""
-        name = name.replace(' Jr.', '').replace(' Sr.', '')
-        name = name.replace(' II', '').replace(' III', '').replace(' IV', '')
-        parts = name.split()
-        if len(parts) == 3 and len(parts[1]) <= 2:
-            name = f"{parts[0]} {parts[2]}"
-        
-        return name.strip().lower()
-    
-    def parse_player_stats(self, stat_data, position_category):
-        """Parse individual player stat line"""
-        stats = {
-            'pass_attempts': 0, 'pass_completions': 0, 'pass_yards': 0,
-            'pass_touchdowns': 0, 'interceptions': 0, 'sacks_taken': 0,
-            'rush_attempts': 0, 'rush_yards': 0, 'rush_touchdowns': 0,
-            'targets': 0, 'receptions': 0, 'receiving_yards': 0,
-            'receiving_touchdowns': 0, 'fumbles': 0, 'fumbles_lost': 0
-        }
-        
-        stat_labels = stat_data.get('labels', [])
-        stat_values = stat_data.get('stats', [])
-        
-        if not stat_labels or not stat_values:
-            return stats
-        
-        stat_dict = dict(zip(stat_labels, stat_values))
-        
-        if position_category == 'passing':
-            if 'C/ATT' in stat_dict:
-                comp_att = stat_dict['C/ATT'].split('/')
-                if len(comp_att) == 2:
-                    stats['pass_completions'] = int(comp_att[0])
-                    stats['pass_attempts'] = int(comp_att[1])
-            stats['pass_yards'] = int(stat_dict.get('YDS', 0))
-            stats['pass_touchdowns'] = int(stat_dict.get('TD', 0))
-            stats['interceptions'] = int(stat_dict.get('INT', 0))
-            stats['sacks_taken'] = int(stat_dict.get('SACKS', 0) if 'SACKS' in stat_dict else 0)
-        
-        elif position_category == 'rushing':
-            stats['rush_attempts'] = int(stat_dict.get('CAR', 0))
-            stats['rush_yards'] = int(stat_dict.get('YDS', 0))
-            stats['rush_touchdowns'] = int(stat_dict.get('TD', 0))
-        
-        elif position_category == 'receiving':
-            stats['receptions'] = int(stat_dict.get('REC', 0))
-            stats['receiving_yards'] = int(stat_dict.get('YDS', 0))
-            stats['receiving_touchdowns'] = int(stat_dict.get('TD', 0))
-            stats['targets'] = int(stat_dict.get('TGTS', 0) if 'TGTS' in stat_dict else 0)
-        
-        return stats
+            return None
     
     def find_game_id(self, home_team_abbr, away_team_abbr, season, week):
         """Find game_id in our database"""
@@ -148,20 +112,29 @@ class ESPN2025Fetcher:
         if not home_team or not away_team:
             return None, None, None
         
-        game = self.db.execute_query("""
-            SELECT game_id, home_team_id, away_team_id
-            FROM games
-            WHERE season = %s AND week = %s
-            AND home_team_id = %s AND away_team_id = %s
-            LIMIT 1
-        """, (season, week, home_team['team_id'], away_team['team_id']))
+        game = self.db.execute_query(
+            self.GAME_ID_QUERY, (season, week, home_team['team_id'], away_team['team_id'])
+        )
         
         if game:
             return game[0]['game_id'], home_team['team_id'], away_team['team_id']
         return None, None, None
     
-    def process_week(self, season, week):
-        """Process all games for a specific week"""
+    @staticmethod
+    def schedule_signature(games):
+        """Game ids, statuses and scores: changes whenever a box score can have changed"""
+        signature = []
+        for game in games:
+            competition = game.get('competitions', [{}])[0]
+            signature.append((
+                game.get('id'),
+                game.get('status', {}).get('type', {}).get('name'),
+                sorted((c.get('homeAway'), c.get('score')) for c in competition.get('competitors', []))
+            ))
+        return sorted(signature, key=lambda s: str(s[0]))
+    
+    def process_week(self, season, week, force=False):
+        """Process all games for a specific week (skipped when nothing changed since the last run, unless force)"""
         print(f"\nProcessing Week {week}...")
         
         games = self.get_week_schedule(season, week)
@@ -170,7 +143,16 @@ class ESPN2025Fetcher:
             print(f"  No games found for Week {week}")
             return 0
         
+        digest = content_hash(self.schedule_signature(games))
+        is_final = all(g.get('status', {}).get('type', {}).get('completed') for g in games)
+        if not force and self.state.is_unchanged(BOX_SCORE_SOURCE, season, week, digest):
+            self.state.touch(BOX_SCORE_SOURCE, season, week, is_final)
+            print(f"  - Week {week} unchanged since last fetch")
+            return 0
+        
         total_stats_added = 0
+        failed_games = 0
+        week_misses = Counter()
         
         for game_data in games:
             try:
@@ -194,68 +176,68 @@ class ESPN2025Fetcher:
                 
                 game_id, home_team_id, away_team_id = self.find_game_id(home_abbr, away_abbr, season, week)
                 
+                # Both misses below leave the week unrecorded so the next run retries it
                 if not game_id:
                     print(f"  ⚠️  Game not found in DB: {home_abbr} vs {away_abbr}")
+                    failed_games += 1
                     continue
                 
                 espn_game_id = game_data.get('id')
-                player_stats = self.get_player_stats_for_game(espn_game_id)
+                player_stats = self.get_player_stats_for_game(espn_game_id, season, week)
+                if player_stats is None:
+                    failed_games += 1
+                    continue
                 
-                for team_stats in player_stats:
-                    team_abbr = team_stats.get('team', {}).get('abbreviation', '')
-                    team_abbr = self.espn_to_nfl.get(team_abbr, team_abbr)
-                    
-                    team_obj = self.db.get_team_by_abbreviation(team_abbr)
-                    if not team_obj:
-                        continue
-                    team_id = team_obj['team_id']
-                    for category in team_stats.get('statistics', []):
-                        category_name = category.get('name', '').lower()
-                        athletes = category.get('athletes', [])
-                        for athlete_data in athletes:
-                            athlete = athlete_data.get('athlete', {})
-                            player_name = athlete.get('displayName', '')
-                            if not player_name:
-                                continue
-                            normalized_name = self.normalize_player_name(player_name)
-                            player_id = self.player_name_to_id.get(normalized_name)
-                            if not player_id:
-                                continue 
-                            stats = self.parse_player_stats(athlete_data, category_name)
-                            try:
-                                self.db.add_player_game_stat(
-                                    player_id=player_id,
-                                    game_id=game_id,
-                                    team_id=team_id,
-                                    season=season,
-                                    week=week,
-                                    **stats
-                                )
-                                total_stats_added += 1
-                            except Exception as e:
-                                if "Duplicate entry" not in str(e):
-                                    pass
-                                time.sleep(0.5)
+                # One wide row per athlete: passing/rushing/receiving merged
+                box_score = flatten_box_score(player_stats)
+                if box_score.empty:
+                    continue
+                team_abbrs = box_score['team_abbr'].map(lambda abbr: self.espn_to_nfl.get(abbr, abbr))
+                team_ids = [self.db.reference.team_id(abbr) for abbr in team_abbrs]
+                
+                # Whole box score resolved at once against the in-memory roster index
+                player_ids, misses = self.resolver.resolve_many(
+                    box_score['name'].tolist(), team_ids=team_ids
+                )
+                week_misses.update(misses)
+                
+                rows = [
+                    (player_id, game_id, team_id, season, week, *stats)
+                    for player_id, team_id, stats in zip(
+                        player_ids, team_ids,
+                        box_score[STAT_COLUMNS].itertuples(index=False, name=None))
+                    if player_id and team_id
+                ]
+                self.db.add_player_game_stats(STAT_COLUMNS, rows)
+                total_stats_added += len(rows)
             except Exception as e:
                 print(f"  ✗ Error processing game: {e}")
+                failed_games += 1
                 continue
         
         print(f"  ✓ Added {total_stats_added} player stats for Week {week}")
+        print_misses(week_misses)
+        if not failed_games:
+            # Only a clean week becomes a watermark; failures are retried next run
+            self.state.record(BOX_SCORE_SOURCE, season, week, digest, total_stats_added, is_final)
         return total_stats_added
     
-    def fetch_2025_season(self, start_week=1, end_week=18):
-        """Fetch 2025 season stats week by week"""
+    def fetch_2025_season(self, start_week=1, end_week=18, force=False):
+        """Fetch 2025 season stats week by week, skipping weeks already recorded Final"""
         print("\n" + "="*70)
         print("FETCHING 2025 SEASON FROM ESPN")
         print("="*70)
-        print(f"\nFetching weeks {start_week} to {end_week}...")
+        
+        weeks = self.state.pending_weeks(BOX_SCORE_SOURCE, 2025, range(start_week, end_week + 1), force)
+        print(f"\nFetching weeks {start_week} to {end_week}: {len(weeks)} not yet Final...")
         
         total_added = 0
         
-        for week in range(start_week, end_week + 1):
-            added = self.process_week(2025, week)
+        for week in weeks:
+            added = self.process_week(2025, week, force)
             total_added += added
-            time.sleep(1)
+            if not get_archive().replay:
+                time.sleep(1)
         return total_added
     
     def verify_data(self):
@@ -283,18 +265,18 @@ class ESPN2025Fetcher:
         print("-" * 40)
         print(f"{'TOTAL':<8} {total:<12}")
     
-    def run(self, start_week=1, end_week=None):
-        """Run the full fetch process"""
+    def run(self, start_week=1, end_week=None, force=False):
+        """Run the full fetch process (end_week defaults to the current week)"""
         print("\n" + "="*70)
         print("GRIDIRON PROPHET - ESPN 2025 STATS FETCHER")
         print("="*70)
         print(f"\nStarted at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         if end_week is None:
-            end_week = 6
+            end_week = get_current_nfl_week()
             print(f"\nAuto-fetching weeks {start_week}-{end_week}")
         
         self.load_active_players()
-        total = self.fetch_2025_season(start_week, end_week)
+        total = self.fetch_2025_season(start_week, end_week, force)
         self.verify_data()
         
         print("\n" + "="*70)
@@ -305,4 +287,4 @@ class ESPN2025Fetcher:
 if __name__ == "__main__":
     fetcher = ESPN2025Fetcher()
     
-    fetcher.run(start_week=1, end_week=6)
\ No newline at end of file
+    fetcher.run(start_week=1)
\ No newline at end of file
@@ -2,12 +2,9 @@
 ESPN 2025 Schedule Fetcher
 Fetches the complete 2025 season schedule and adds missing games
 """
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import requests
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
 from datetime import datetime
 import time
 
@@ -1,8 +1,4 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
 import requests
 import time
 from datetime import datetime
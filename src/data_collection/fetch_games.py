@@ -1,35 +1,39 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import requests
 from datetime import datetime
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
+from src.database.ingest_state import IngestState, content_hash
+from src.data_collection.payload_archive import get_archive
+
+# ingest_state source name for scoreboard game results
+GAMES_SOURCE = 'espn_scoreboard'
 
 class NFLGameFetcher:
     
     def __init__(self):
         self.db = DatabaseManager()
+        self.state = IngestState(self.db)
         self.base_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
     
     def get_team_id_by_abbreviation(self, abbr):
-        team = self.db.get_team_by_abbreviation(abbr)
-        return team['team_id'] if team else None
+        return self.db.reference.team_id(abbr)
     
-    def fetch_scoreboard(self, season=2024, week=None):
+    def fetch_scoreboard_data(self, season=2024, week=None):
+        """Raw scoreboard JSON for a week (archived; raises requests' exceptions)"""
         url = f"{self.base_url}/scoreboard"
         
         params = {}
         if week:
             params['week'] = week
             params['seasontype'] = 2
+            params['dates'] = season
         
+        return get_archive().fetch(GAMES_SOURCE, url, params=params, season=season, week=week).json()
+    
+    def fetch_scoreboard(self, season=2024, week=None):
         print(f"Fetching games for {season} season, week {week if week else 'current'}...")
         
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self.fetch_scoreboard_data(season, week)
             
             return self.parse_scoreboard_data(data, season, week)
             
@@ -111,18 +115,8 @@ class NFLGameFetcher:
         for game in games:
             try:
                 game_id = self.db.add_game_safe(**game)
-                home_team = self.db.get_team_by_abbreviation(
-                    self.db.execute_query(
-                        "SELECT abbreviation FROM teams WHERE team_id = %s",
-                        (game['home_team_id'],)
-                    )[0]['abbreviation']
-                )
-                away_team = self.db.get_team_by_abbreviation(
-                    self.db.execute_query(
-                        "SELECT abbreviation FROM teams WHERE team_id = %s",
-                        (game['away_team_id'],)
-                    )[0]['abbreviation']
-                )
+                home_team = self.db.reference.team(game['home_team_id'])
+                away_team = self.db.reference.team(game['away_team_id'])
                 
                 score_info = ""
                 if game['home_score'] is not None:
@@ -138,6 +132,47 @@ class NFLGameFetcher:
                     print(f"✗ Error saving game: {e}")
         
         return added_count
+    
+    def ingest_week(self, season, week, force=False):
+        """
+        Fetch one week and write it only if it changed since the last fetch
+        (always with force)
+
+        Returns the number of games written (0 when unchanged or empty)
+        """
+        games = self.fetch_scoreboard(season=season, week=week)
+        if not games:
+            print(f"No games found for Week {week}")
+            return 0
+        
+        digest = content_hash(games)
+        is_final = all(game['game_status'] == 'Final' for game in games)
+        if not force and self.state.is_unchanged(GAMES_SOURCE, season, week, digest):
+            self.state.touch(GAMES_SOURCE, season, week, is_final)
+            print(f"- Week {week} unchanged since last fetch ({len(games)} games)")
+            return 0
+        
+        print(f"Found {len(games)} games for Week {week}")
+        added = self.save_games_to_db(games)
+        if added == len(games):
+            # Only a clean week becomes a watermark; failures are retried next run
+            self.state.record(GAMES_SOURCE, season, week, digest, added, is_final)
+        return added
+    
+    def ingest_weeks(self, season, start_week, end_week, force=False):
+        """
+        Ingest the weeks in start_week..end_week that are missing or not yet
+        Final; weeks already recorded Final are skipped without a request
+        """
+        weeks = self.state.pending_weeks(GAMES_SOURCE, season, range(start_week, end_week + 1), force)
+        skipped = end_week - start_week + 1 - len(weeks)
+        if skipped:
+            print(f"⏭️  {skipped} week(s) already Final, fetching {weeks or 'nothing'}")
+        
+        total = 0
+        for week in weeks:
+            total += self.ingest_week(season, week, force)
+        return total
 
 def get_current_nfl_week() -> int:
     SEASON_2025_WEEKS = {
@@ -193,16 +228,10 @@ def main():
     completed_week = current_week - 1
     
     print(f"📅 Current Week: {current_week}")
-    print(f"🎯 Fetching completed games from Week {completed_week}")
-    
-    games = fetcher.fetch_scoreboard(season=season, week=completed_week)
+    print(f"🎯 Fetching completed games through Week {completed_week}")
     
-    if games:
-        print(f"\nFound {len(games)} games")
-        added = fetcher.save_games_to_db(games)
-        print(f"\n✓ Successfully added {added} games to database!")
-    else:
-        print("No games found")
+    added = fetcher.ingest_weeks(season, 1, completed_week)
+    print(f"\n✓ Successfully added {added} games to database!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,5 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import nfl_data_py as nfl
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
 from datetime import datetime
 
 def fetch_historical_games(seasons):
@@ -2,21 +2,24 @@
 Historical Data Fetcher for Active 2025 Players
 Fetches 2022-2024 game statistics for all players currently on 2025 rosters
 """
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import nfl_data_py as nfl
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
+from src.database.player_resolver import PlayerResolver, print_misses
+from src.database.ingest_state import IngestState, frame_hash
 import pandas as pd
 from datetime import datetime
 
+# ingest_state source name for nfl_data_py weekly player stats
+WEEKLY_STATS_SOURCE = 'nfl_weekly_stats'
+
 class HistoricalDataFetcher:
     """Fetch historical statistics for active 2025 players"""
     
     def __init__(self):
         self.db = DatabaseManager()
-        self.player_name_to_id = {}
+        self.state = IngestState(self.db)
+        self.resolver = None
         self.game_cache = {}
     
     def get_active_players(self):
@@ -25,13 +28,10 @@ class HistoricalDataFetcher:
         print("LOADING ACTIVE 2025 PLAYERS")
         print("="*70)
         
-        players = self.db.get_active_players_for_season(2025)
-        
-        for player in players:
-            self.player_name_to_id[player['name']] = player['player_id']
+        self.resolver = PlayerResolver.load(self.db, seasons=[2025], active_only=True)
         
-        print(f"✓ Loaded {len(players)} active players for 2025 season")
-        return players
+        print(f"✓ Loaded {len(self.resolver)} active players for 2025 season")
+        return self.resolver
     
     def fetch_historical_stats(self, seasons=[2022, 2023, 2024]):
         """Fetch weekly stats for specified seasons"""
@@ -84,17 +84,12 @@ class HistoricalDataFetcher:
         self.game_cache[cache_key] = game_id
         return game_id
     
-    def process_stat_row(self, row):
-        """Process a single stat row and return formatted data"""
+    def process_stat_row(self, row, player_id):
+        """Process a single stat row (already resolved to player_id) and return formatted data"""
         try:
-            player_name = row.get('player_display_name')
-            if not player_name or pd.isna(player_name):
-                return None
-            
-            if player_name not in self.player_name_to_id:
+            if not player_id:
                 return None
             
-            player_id = self.player_name_to_id[player_name]
             season = int(row.get('season'))
             week = int(row.get('week'))
             game_id = self.find_or_create_game(row, season, week)
@@ -160,31 +155,64 @@ class HistoricalDataFetcher:
         
         total_rows = len(stats_df)
         
-        for idx, row in stats_df.iterrows():
-            if (idx + 1) % 1000 == 0:
-                print(f"  Progress: {idx + 1}/{total_rows} rows processed "
-                      f"({added_count} added, {skipped_count} skipped)...")
-            
-            stats = self.process_stat_row(row)
-            
-            if stats is None:
-                skipped_count += 1
+        # Every row's player in one pass over the in-memory 2025 roster index
+        player_ids, misses = self.resolver.resolve_many(
+            stats_df['player_display_name'].tolist(),
+            positions=stats_df['position'].tolist() if 'position' in stats_df else None
+        )
+        
+        # Completed seasons: each week is Final, and a week whose rows hash the
+        # same as last time is skipped without touching the database
+        unchanged_weeks = 0
+        processed = 0
+        for (season, week), week_rows in sorted(stats_df.groupby(['season', 'week']).indices.items()):
+            season, week = int(season), int(week)
+            week_df = stats_df.iloc[week_rows]
+            digest = frame_hash(week_df)
+            if self.state.is_unchanged(WEEKLY_STATS_SOURCE, season, week, digest):
+                unchanged_weeks += 1
+                processed += len(week_rows)
                 continue
             
-            try:
-                self.db.add_player_game_stat(**stats)
-                added_count += 1
+            week_added = 0
+            week_errors = error_count
+            week_unmatched = 0
+            for i, (_, row) in zip(week_rows, week_df.iterrows()):
+                processed += 1
+                if processed % 1000 == 0:
+                    print(f"  Progress: {processed}/{total_rows} rows processed "
+                          f"({added_count} added, {skipped_count} skipped)...")
+                
+                stats = self.process_stat_row(row, player_ids[i])
+                
+                if stats is None:
+                    # A resolved player whose game isn't loaded yet is retried next run
+                    if player_ids[i] and not self.find_or_create_game(row, season, week):
+                        week_unmatched += 1
+                    skipped_count += 1
+                    continue
                 
-            except Exception as e:
-                if "Duplicate entry" not in str(e):
-                    error_count += 1
-                    if error_count <= 5:
-                        print(f"  ✗ Error adding stat: {e}")
-                skipped_count += 1
+                try:
+                    self.db.add_player_game_stat(**stats)
+                    added_count += 1
+                    week_added += 1
+                    
+                except Exception as e:
+                    if "Duplicate entry" not in str(e):
+                        error_count += 1
+                        if error_count <= 5:
+                            print(f"  ✗ Error adding stat: {e}")
+                    skipped_count += 1
+            
+            if error_count == week_errors and not week_unmatched:
+                self.state.record(WEEKLY_STATS_SOURCE, season, week, digest, week_added, True)
         
+        if unchanged_weeks:
+            print(f"⏭️  {unchanged_weeks} week(s) unchanged since the last load")
         print("\n" + "="*70)
         print(f"✓ Added {added_count} player-game stat records")
         print(f"- Skipped {skipped_count} records (not 2025 active or no game match)")
+        print_misses(misses)
         if error_count > 0:
             print(f"⚠️  {error_count} errors encountered")
     
@@ -265,6 +293,14 @@ class HistoricalDataFetcher:
         else:
             print("\n✓ All active 2025 players have historical stats!")
     
+    def season_complete(self, season):
+        """True when every week with Final games in the database is recorded in ingest_state"""
+        weeks = {row['week'] for row in self.db.execute_query(
+            "SELECT DISTINCT week FROM games WHERE season = %s AND game_status = 'Final'", (season,)
+        )}
+        recorded = set(self.state.final_weeks(WEEKLY_STATS_SOURCE, season))
+        return bool(weeks) and weeks <= recorded
+    
     def run(self):
         """Run the full historical data fetch process"""
         print("\n" + "="*70)
@@ -276,7 +312,12 @@ class HistoricalDataFetcher:
         if not active_players:
             print("\n✗ No active players found. Run init_rosters_2025.py first!")
             return
-        stats_df = self.fetch_historical_stats(seasons=[2022, 2023, 2024])
+        # Past seasons don't change once every week is recorded
+        seasons = [season for season in [2022, 2023, 2024] if not self.season_complete(season)]
+        if not seasons:
+            print("\n✓ 2022-2024 stats already loaded (see ingest_state); nothing to fetch")
+            return
+        stats_df = self.fetch_historical_stats(seasons=seasons)
         
         if stats_df is None or len(stats_df) == 0:
             print("\n✗ Failed to fetch historical stats. Aborting.")
@@ -1,18 +1,19 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from fetch_games import NFLGameFetcher
+from src.data_collection.fetch_games import NFLGameFetcher, GAMES_SOURCE
+from src.data_collection.payload_archive import get_archive
 import time
 
-def fetch_multiple_weeks(season, start_week, end_week):
+def fetch_multiple_weeks(season, start_week, end_week, force=False):
     """
     Fetch multiple weeks of NFL games
     
+    Weeks already recorded Final in ingest_state are skipped, and a
+    refetched week whose content is unchanged isn't rewritten
+    
     Args:
         season: Year of the season (e.g., 2025)
         start_week: First week to fetch (e.g., 1)
         end_week: Last week to fetch (e.g., 5)
+        force: Refetch every week in the range
     """
     fetcher = NFLGameFetcher()
     
@@ -22,22 +23,20 @@ def fetch_multiple_weeks(season, start_week, end_week):
     
     total_games = 0
     
-    for week in range(start_week, end_week + 1):
+    weeks = fetcher.state.pending_weeks(GAMES_SOURCE, season, range(start_week, end_week + 1), force)
+    if len(weeks) < end_week - start_week + 1:
+        print(f"\n⏭️  Skipping {end_week - start_week + 1 - len(weeks)} week(s) already recorded Final")
+    
+    for week in weeks:
         print(f"\n{'=' * 70}")
         print(f"WEEK {week}")
         print(f"{'=' * 70}")
         
-        games = fetcher.fetch_scoreboard(season=season, week=week)
-        
-        if games:
-            print(f"Found {len(games)} games for Week {week}")
-            added = fetcher.save_games_to_db(games)
-            total_games += added
-            print(f"Added {added} games")
-        else:
-            print(f"No games found for Week {week}")
+        added = fetcher.ingest_week(season, week, force)
+        total_games += added
+        print(f"Added {added} games")
         
-        if week < end_week:
+        if week < weeks[-1] and not get_archive().replay:
             time.sleep(1)
     
     print(f"\n{'=' * 70}")
@@ -1,9 +1,6 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import nfl_data_py as nfl
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
+from src.database.player_resolver import print_misses
 
 def fetch_snap_counts(seasons):
     """
@@ -27,45 +24,26 @@ def fetch_snap_counts(seasons):
     added_to_depth = 0
     skipped_count = 0
     
-    for idx, row in snap_data.iterrows():
+    # Resolve every row's team and player up front: team, season and position
+    # narrow same-named players, all from the shared in-memory indexes
+    team_ids = [db.reference.team_id(abbr) for abbr in snap_data['team'].tolist()]
+    player_ids, misses = db.reference.resolver().resolve_many(
+        snap_data['player'].tolist(),
+        team_ids=team_ids,
+        seasons=[int(s) for s in snap_data['season'].tolist()],
+        positions=snap_data['position'].tolist()
+    )
+    
+    for (idx, row), team_id, player_id in zip(snap_data.iterrows(), team_ids, player_ids):
         try:
-            player_name = row['player']
-            team_abbr = row['team']
             position = row['position']
             season = int(row['season'])
             week = int(row['week'])
             
-            team = db.get_team_by_abbreviation(team_abbr)
-            if not team:
-                skipped_count += 1
-                continue
-            
-            team_id = team['team_id']
-            
-            player = db.execute_query("""
-                SELECT p.player_id 
-                FROM players p
-                JOIN player_seasons ps ON p.player_id = ps.player_id
-                WHERE p.name = %s 
-                AND ps.team_id = %s 
-                AND ps.season = %s
-                AND p.position = %s
-                LIMIT 1
-            """, (player_name, team_id, season, position))
-            
-            if not player:
-                player = db.execute_query("""
-                    SELECT player_id 
-                    FROM players 
-                    WHERE name = %s AND position = %s
-                    LIMIT 1
-                """, (player_name, position))
-            
-            if not player:
+            if not team_id or not player_id:
                 skipped_count += 1
                 continue
             
-            player_id = player[0]['player_id'] 
             offense_snaps = row.get('offense_snaps', 0) or 0
             defense_snaps = row.get('defense_snaps', 0) or 0
             st_snaps = row.get('st_snaps', 0) or 0
@@ -112,6 +90,7 @@ def fetch_snap_counts(seasons):
     print(f"✓ Updated {updated_count} existing depth chart entries")
     print(f"✓ Added {added_to_depth} new depth chart entries with snap counts")
     print(f"✓ Skipped {skipped_count} records (player not found)")
+    print_misses(misses)
     print(f"{'=' * 70}")
     
     summary = db.execute_query("""
@@ -2,20 +2,17 @@
 Clean Roster Initialization for 2025 Season
 Fetches ONLY active 2025 players and properly populates the database
 """
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import nfl_data_py as nfl
-from database.db_manager import DatabaseManager
-import pandas as pd
+from src.database.db_manager import DatabaseManager
+from src.data_collection.roster_sync import RosterSync
 
 class RosterInitializer:
     """Initialize clean 2025 rosters"""
     
     def __init__(self):
         self.db = DatabaseManager()
-        self.player_cache = {}
+        self.roster_sync = RosterSync(self.db, season=2025)
     
     def clear_player_data(self):
         """Clear all player-related data (keeps teams and games)"""
@@ -61,28 +58,6 @@ class RosterInitializer:
             print(f"\n✗ Error clearing data: {e}")
             return False
     
-    def determine_roster_status(self, status_str):
-        """Determine roster status from nfl_data_py status field"""
-        if not status_str or pd.isna(status_str):
-            return 'Active'
-        
-        status = str(status_str).upper().strip()
-        
-        if status in ['ACT', 'ACTIVE', '']:
-            return 'Active'
-        elif 'PRACTICE' in status or status in ['PRA', 'PS']:
-            return 'Practice Squad'
-        elif 'INJURED' in status or status in ['IR', 'RES', 'RESERVE']:
-            return 'Injured Reserve'
-        elif 'PUP' in status:
-            return 'PUP'
-        elif 'NFI' in status:
-            return 'NFI'
-        elif 'SUS' in status or 'SUSPEND' in status:
-            return 'Suspended'
-        else:
-            return 'Active'
-    
     def fetch_2025_rosters(self):
         """Fetch only 2025 rosters from nfl_data_py"""
         print("\n" + "="*70)
@@ -106,84 +81,16 @@ class RosterInitializer:
         print("PROCESSING ROSTERS")
         print("="*70)
         
-        added_players = 0
-        added_seasons = 0
-        skipped = 0
-        errors = []
+        try:
+            result = self.roster_sync.sync(rosters_df)
+        except Exception as e:
+            print(f"\n✗ Roster sync failed: {e}")
+            return
         
-        for idx, row in rosters_df.iterrows():
-            try:
-                team_abbr = row.get('team')
-                if not team_abbr or pd.isna(team_abbr):
-                    skipped += 1
-                    continue
-                
-                team = self.db.get_team_by_abbreviation(team_abbr)
-                if not team:
-                    errors.append(f"Team not found: {team_abbr}")
-                    skipped += 1
-                    continue
-                
-                team_id = team['team_id']
-                name = row.get('player_name') or row.get('full_name')
-                if not name or pd.isna(name):
-                    skipped += 1
-                    continue
-                
-                position = row.get('position', 'UNK')
-                if pd.isna(position):
-                    position = 'UNK'
-                
-                height = row.get('height')
-                weight = row.get('weight')
-                college = row.get('college')
-                
-                if pd.isna(height): height = None
-                if pd.isna(weight): weight = None
-                if pd.isna(college): college = None
-                
-                player_id = self.db.get_or_create_player(
-                    name=name,
-                    position=position,
-                    height=height,
-                    weight=weight,
-                    college=college
-                )
-                
-                if player_id and player_id not in self.player_cache:
-                    added_players += 1
-                    self.player_cache[player_id] = name
-                
-                jersey = row.get('jersey_number')
-                age = row.get('age')
-                years_exp = row.get('years_exp') or row.get('entry_year')
-                status = row.get('status', '')
-                
-                if pd.isna(jersey): jersey = None
-                if pd.isna(age): age = None
-                if pd.isna(years_exp): years_exp = None
-                
-                roster_status = self.determine_roster_status(status)
-                self.db.add_player_season(
-                    player_id=player_id,
-                    season=2025,
-                    team_id=team_id,
-                    position=position,
-                    jersey_number=jersey,
-                    age=age,
-                    years_in_league=years_exp,
-                    roster_status=roster_status,
-                    status='Active'
-                )
-                
-                added_seasons += 1
-                
-                if added_seasons % 100 == 0:
-                    print(f"  Progress: {added_seasons} player-seasons processed...")
-                
-            except Exception as e:
-                errors.append(f"Error processing {row.get('player_name', 'Unknown')}: {e}")
-                skipped += 1
+        added_players = result['players']
+        added_seasons = result['processed']
+        skipped = result['skipped']
+        errors = result['errors']
         
         print("\n" + "="*70)
         print(f"✓ Added {added_players} unique players to database")
@@ -0,0 +1,215 @@
+"""
+Live Scoreboard Poller
+Long-running game-day service: polls the ESPN scoreboard on an adaptive
+interval (every live_interval seconds while a game is in progress, sleeping
+until the next kickoff otherwise), diffs each poll against the last one and
+writes only the games whose row changed. When games go Final the week's
+bets are settled, accuracy is regraded and the analytics mirror refreshed
+right away instead of on Tuesday
+
+    python -m src.data_collection.live_scoreboard [--live-interval 30] [--idle-interval 1800]
+"""
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from src.data_collection.fetch_games import NFLGameFetcher, GAMES_SOURCE, get_current_nfl_week
+from src.database.ingest_state import content_hash
+
+
+def game_signature(game):
+    """(status, home score, away score, date, 'HH:MM') of a parsed or stored game, for diffing"""
+    game_time = game.get('game_time')
+    if hasattr(game_time, 'total_seconds'):     # MySQL TIME comes back as a timedelta
+        minutes = int(game_time.total_seconds()) // 60
+        game_time = f"{minutes // 60:02d}:{minutes % 60:02d}"
+    elif game_time is not None:
+        game_time = str(game_time)[:5]
+    return (game['game_status'], game['home_score'], game['away_score'], str(game['game_date'])[:10], game_time)
+
+
+def _event_state(event):
+    """ESPN status state for an event: 'pre', 'in' or 'post'"""
+    competition = event.get('competitions', [{}])[0]
+    status = competition.get('status') or event.get('status') or {}
+    return status.get('type', {}).get('state', 'pre')
+
+
+def _kickoff(event):
+    """Kickoff as an aware UTC datetime, or None"""
+    try:
+        return datetime.strptime(event['date'], '%Y-%m-%dT%H:%MZ').replace(tzinfo=timezone.utc)
+    except (KeyError, ValueError):
+        return None
+
+
+def _live_line(event):
+    """'BUF 17 @ KC 21 (Q3 4:12)' for an in-progress event"""
+    competition = event.get('competitions', [{}])[0]
+    teams = {c.get('homeAway'): c for c in competition.get('competitors', [])}
+    detail = competition.get('status', {}).get('type', {}).get('shortDetail', '')
+    away, home = teams.get('away', {}), teams.get('home', {})
+    return (f"{away.get('team', {}).get('abbreviation')} {away.get('score')} @ "
+            f"{home.get('team', {}).get('abbreviation')} {home.get('score')} ({detail})")
+
+
+class LiveScoreboardPoller:
+    """Poll the scoreboard and apply per-game deltas to games"""
+
+    def __init__(self, season=2025, live_interval=30, idle_interval=1800, fetcher=None):
+        self.season = season
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.fetcher = fetcher or NFLGameFetcher()
+        self.db = self.fetcher.db
+        self.week = None
+        self.rows = {}           # (home_team_id, away_team_id) -> game_signature last written
+        self.live = {}           # ESPN event id -> last printed live line
+        # Called with (season, week, games) once per poll in which games went Final
+        self.final_hooks = [self.settle_bets, self.grade_predictions, self.refresh_mirror]
+
+    # ---- state -------------------------------------------------------------
+
+    def load_week(self, week):
+        """Seed the diff baseline from the week's games already in the database"""
+        self.week = week
+        self.live = {}
+        self.rows = {
+            (g['home_team_id'], g['away_team_id']): game_signature(g)
+            for g in self.db.get_games_by_week(self.season, week)
+        }
+
+    # ---- polling -----------------------------------------------------------
+
+    def poll(self):
+        """
+        One scoreboard poll: write changed games, run the Final hooks
+
+        Returns (events, changed, finals): the raw events plus the parsed
+        games that were written and the subset that just went Final
+        """
+        week = get_current_nfl_week()
+        if week != self.week:
+            self.load_week(week)
+
+        data = self.fetcher.fetch_scoreboard_data(self.season, week)
+        events = data.get('events', [])
+
+        games, changed, finals = [], [], []
+        for event in events:
+            try:
+                game = self.fetcher.extract_game_info(event, self.season, week)
+            except Exception as e:
+                print(f"  ✗ Error parsing game: {e}")
+                continue
+            if not game:
+                continue
+            games.append(game)
+
+            if _event_state(event) == 'in':
+                line = _live_line(event)
+                if self.live.get(event.get('id')) != line:
+                    self.live[event.get('id')] = line
+                    print(f"  🏈 {line}")
+
+            key = (game['home_team_id'], game['away_team_id'])
+            previous = self.rows.get(key)
+            if previous == game_signature(game):
+                continue
+            changed.append(game)
+            if game['game_status'] == 'Final' and (previous is None or previous[0] != 'Final'):
+                finals.append(game)
+
+        if changed:
+            written = self.fetcher.save_games_to_db(changed)
+            if written == len(changed):
+                for game in changed:
+                    self.rows[(game['home_team_id'], game['away_team_id'])] = game_signature(game)
+            if games and all(g['game_status'] == 'Final' for g in games):
+                self.fetcher.state.record(GAMES_SOURCE, self.season, week, content_hash(games), len(games), True)
+
+        if finals:
+            for hook in self.final_hooks:
+                try:
+                    hook(self.season, week, finals)
+                except Exception as e:
+                    print(f"  ⚠️  {hook.__name__} failed: {e}")
+
+        return events, changed, finals
+
+    def next_interval(self, events):
+        """
+        Seconds until the next poll: live_interval while any game is in
+        progress or about to kick off, otherwise sleep until the next kickoff
+        (at most idle_interval)
+        """
+        if any(_event_state(e) == 'in' for e in events):
+            return self.live_interval
+
+        now = datetime.now(timezone.utc)
+        kickoffs = [k for k in (_kickoff(e) for e in events if _event_state(e) == 'pre') if k]
+        if kickoffs:
+            until = (min(kickoffs) - now).total_seconds()
+            return int(min(self.idle_interval, max(self.live_interval, until)))
+        return self.idle_interval
+
+    def run(self, max_polls=None):
+        """Poll until interrupted (or for max_polls polls)"""
+        print("=" * 70)
+        print(f"LIVE SCOREBOARD - {self.season} (live every {self.live_interval}s, idle up to {self.idle_interval}s)")
+        print("=" * 70)
+
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                polls += 1
+                interval = self.live_interval
+                try:
+                    events, changed, finals = self.poll()
+                    interval = self.next_interval(events)
+                    live = sum(1 for e in events if _event_state(e) == 'in')
+                    print(f"[{datetime.now():%H:%M:%S}] Week {self.week}: {live} live, "
+                          f"{len(changed)} updated, {len(finals)} went Final; next poll in {interval}s")
+                except requests.exceptions.RequestException as e:
+                    print(f"[{datetime.now():%H:%M:%S}] ❌ Scoreboard fetch failed: {e}")
+
+                if max_polls is None or polls < max_polls:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\n⏹️  Stopped live scoreboard")
+
+    # ---- Final hooks ---------------------------------------------------------
+
+    def settle_bets(self, season, week, games):
+        """Settle the week's pending bets against the new final scores"""
+        from src.betting.roi_tracker import ROITracker
+        ROITracker().settle_pending(season, week)
+
+    def grade_predictions(self, season, week, games):
+        """Regrade the weeks whose count of Final games changed"""
+        from src.analysis.calculate_weekly_accuracy import WeeklyAccuracyCalculator
+        WeeklyAccuracyCalculator().recalculate_season(season, incremental=True)
+
+    def refresh_mirror(self, season, week, games):
+        """Re-sync the season's Parquet partitions when the analytics mirror is enabled"""
+        from src.database.analytics_mirror import AnalyticsMirror
+        mirror = AnalyticsMirror.from_env()
+        if mirror:
+            mirror.sync([season])
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Poll the live scoreboard and apply game deltas')
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--live-interval', type=int, default=30, help='Seconds between polls while games are live')
+    parser.add_argument('--idle-interval', type=int, default=1800, help='Longest sleep when no game is live')
+    parser.add_argument('--max-polls', type=int, help='Stop after this many polls')
+    args = parser.parse_args(argv)
+
+    LiveScoreboardPoller(args.season, args.live_interval, args.idle_interval).run(args.max_polls)
+
+
+if __name__ == "__main__":
+    main()
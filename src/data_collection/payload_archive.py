@@ -0,0 +1,263 @@
+"""
+Payload Archive
+Every raw payload the collectors fetch (scoreboard and summary JSON, injury
+HTML, odds JSON) is stored gzip-compressed under its SHA-256 and indexed by
+(source, season, week, key, fetched_at). With PAYLOAD_REPLAY=1 the same
+fetch calls are answered from the archive instead of the network, so a
+changed parser or loader can rebuild history at disk speed:
+
+    python -m src.data_collection.payload_archive list
+    python -m src.data_collection.payload_archive replay box_scores --start 1 --end 6
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Relative roots (including PAYLOAD_ARCHIVE) resolve against the project root,
+# so collectors started from any directory archive into one tree
+ARCHIVE_DIR = os.path.join(PROJECT_ROOT, 'payload_archive')
+
+# Request parameters never written to the index
+SECRET_PARAMS = {'apiKey', 'api_key', 'key', 'token'}
+
+
+class ReplayMiss(requests.exceptions.RequestException):
+    """Replay mode asked for a payload that was never archived"""
+
+
+class Payload(namedtuple('Payload', ['content', 'digest', 'fetched_at', 'entry', 'headers'])):
+    """Raw bytes of one archived fetch plus its index entry (headers only on live fetches)"""
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class PayloadArchive:
+    """Content-addressed store of raw fetches with a (source, season, week, key) index"""
+
+    def __init__(self, root=ARCHIVE_DIR, replay=False):
+        self.root = os.path.join(PROJECT_ROOT, root)
+        self.replay = replay
+        self._lock = threading.Lock()
+        self._index = None          # (source, season, week, key) -> [entry], oldest first
+        self._index_size = 0
+
+    @classmethod
+    def from_env(cls):
+        """Archive at PAYLOAD_ARCHIVE (default <project root>/payload_archive), replaying when PAYLOAD_REPLAY is set"""
+        return cls(os.getenv('PAYLOAD_ARCHIVE', ARCHIVE_DIR),
+                   replay=os.getenv('PAYLOAD_REPLAY', '').lower() in ('1', 'true', 'yes'))
+
+    @property
+    def index_path(self):
+        return os.path.join(self.root, 'index.jsonl')
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest}.gz")
+
+    # ---- storage -----------------------------------------------------------
+
+    def store(self, source, content, season=None, week=None, key=None, url=None, fetched_at=None):
+        """
+        Archive one payload (bytes or str) and index it
+
+        Identical content is stored once; every fetch still gets an index
+        entry so replay can pick the payload as of any fetch. Returns the entry
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(temp, 'wb', compresslevel=6) as f:
+                f.write(content)
+            os.replace(temp, path)
+
+        entry = {
+            'source': source, 'season': season, 'week': week, 'key': key,
+            'fetched_at': (fetched_at or datetime.now()).isoformat(timespec='seconds'),
+            'digest': digest, 'size': len(content), 'url': url
+        }
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        return entry
+
+    def load(self, digest):
+        """Raw bytes of an archived payload"""
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return f.read()
+
+    # ---- index -------------------------------------------------------------
+
+    def _entries(self):
+        """The parsed index, re-read only when the file has grown"""
+        with self._lock:
+            size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+            if self._index is None or size != self._index_size:
+                index = {}
+                if size:
+                    with open(self.index_path, encoding='utf-8') as f:
+                        for line in f:
+                            if line.strip():
+                                entry = json.loads(line)
+                                lookup = (entry['source'], entry['season'], entry['week'], entry['key'])
+                                index.setdefault(lookup, []).append(entry)
+                self._index, self._index_size = index, size
+            return self._index
+
+    def entries(self, source=None, season=None, week=None):
+        """Index entries (oldest first) matching the given source / season / week"""
+        found = []
+        for (s, se, wk, _), entries in self._entries().items():
+            if ((source is None or s == source) and (season is None or se == season)
+                    and (week is None or wk == week)):
+                found.extend(entries)
+        return sorted(found, key=lambda e: e['fetched_at'])
+
+    def latest(self, source, season=None, week=None, key=None, as_of=None):
+        """Newest payload for an exact (source, season, week, key), optionally fetched by as_of"""
+        entries = self._entries().get((source, season, week, key), [])
+        if as_of is not None:
+            as_of = as_of.isoformat(timespec='seconds') if isinstance(as_of, datetime) else as_of
+            entries = [e for e in entries if e['fetched_at'] <= as_of]
+        if not entries:
+            return None
+        entry = entries[-1]
+        return Payload(self.load(entry['digest']), entry['digest'],
+                       datetime.fromisoformat(entry['fetched_at']), entry, {})
+
+    # ---- fetching ----------------------------------------------------------
+
+    def fetch(self, source, url, params=None, season=None, week=None, key=None,
+              session=None, headers=None, timeout=30):
+        """
+        GET url and archive the body, or in replay mode return the archived one
+
+        Raises requests' exceptions like a plain GET (ReplayMiss is one of
+        them), so collectors keep their existing error handling
+        """
+        if self.replay:
+            payload = self.latest(source, season, week, key)
+            if payload is None:
+                raise ReplayMiss(f"{source} season={season} week={week} key={key} not in {self.root}")
+            return payload
+
+        response = (session or requests).get(url, params=params, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        shown = {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS}
+        entry = self.store(source, response.content, season, week, key,
+                           url=f"{url}?{requests.compat.urlencode(shown)}" if shown else url)
+        return Payload(response.content, entry['digest'],
+                       datetime.fromisoformat(entry['fetched_at']), entry, response.headers)
+
+
+_archive = None
+
+
+def get_archive():
+    """Process-wide archive configured from the environment"""
+    global _archive
+    if _archive is None:
+        _archive = PayloadArchive.from_env()
+    return _archive
+
+
+def set_replay(enabled=True):
+    """Switch the process-wide archive into (or out of) replay mode"""
+    get_archive().replay = enabled
+
+
+def print_summary(archive, source=None):
+    """Payload counts and sizes per source and season"""
+    groups = {}
+    for entry in archive.entries(source):
+        group = groups.setdefault((entry['source'], entry['season']),
+                                  {'fetches': 0, 'bytes': 0, 'digests': set(), 'weeks': set(), 'last': None})
+        group['fetches'] += 1
+        group['bytes'] += entry['size']
+        group['digests'].add(entry['digest'])
+        if entry['week'] is not None:
+            group['weeks'].add(entry['week'])
+        group['last'] = entry['fetched_at']
+
+    print(f"\n{'Source':<20} {'Season':>6} {'Weeks':>6} {'Fetches':>8} {'Unique':>7} {'Raw MB':>8}  Last fetch")
+    print("-" * 80)
+    for (name, season), g in sorted(groups.items(), key=lambda item: (item[0][0], item[0][1] or 0)):
+        print(f"{name:<20} {season or '-':>6} {len(g['weeks']) or '-':>6} {g['fetches']:>8} "
+              f"{len(g['digests']):>7} {g['bytes'] / 1e6:>8.1f}  {g['last']}")
+
+
+def replay(target, season=2025, start_week=1, end_week=None):
+    """Re-run a collector's parse and load steps from archived payloads only"""
+    set_replay(True)
+    print(f"\n⏪ Replaying {target} from {get_archive().root} (no network)")
+
+    if target == 'games':
+        from src.data_collection.fetch_games import NFLGameFetcher
+        fetcher = NFLGameFetcher()
+        end_week = end_week or max([e['week'] for e in get_archive().entries('espn_scoreboard', season)] or [0])
+        return fetcher.ingest_weeks(season, start_week, end_week, force=True)
+
+    if target == 'box_scores':
+        from src.data_collection.fetch_2025_espn import ESPN2025Fetcher
+        fetcher = ESPN2025Fetcher()
+        end_week = end_week or max([e['week'] for e in get_archive().entries('espn_scoreboard', season)] or [0])
+        fetcher.load_active_players()
+        return fetcher.fetch_2025_season(start_week, end_week, force=True)
+
+    if target == 'injuries':
+        from src.data_collection.smart_injury_updater import fetch_espn_injuries, update_injuries_smart
+        from src.database.db_manager import DatabaseManager
+        db = DatabaseManager()
+        weeks = sorted({e['week'] for e in get_archive().entries('espn_injuries', season)})
+        weeks = [w for w in weeks if w >= start_week and (end_week is None or w <= end_week)]
+        for week in weeks:
+            injuries = fetch_espn_injuries(week=week)
+            if injuries:
+                stats = update_injuries_smart(db, injuries, current_week=week)
+                print(f"  Week {week}: {stats}")
+        return len(weeks)
+
+    raise ValueError(f"unknown replay target: {target}")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Inspect or replay the raw payload archive')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    listing = sub.add_parser('list', help='Summarize archived payloads')
+    listing.add_argument('--source')
+
+    rerun = sub.add_parser('replay', help='Re-parse and reload archived payloads without the network')
+    rerun.add_argument('target', choices=['games', 'box_scores', 'injuries'])
+    rerun.add_argument('--season', type=int, default=2025)
+    rerun.add_argument('--start', type=int, default=1, help='First week')
+    rerun.add_argument('--end', type=int, help='Last week (default: last archived week)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'list':
+        print_summary(get_archive(), args.source)
+    else:
+        replay(args.target, args.season, args.start, args.end)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,4 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager
 
 def populate_nfl_teams():
     """Populate the database with all 32 NFL teams"""
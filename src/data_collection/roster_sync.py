@@ -0,0 +1,238 @@
+"""
+Roster Sync
+Set-based roster load shared by init_rosters_2025 and smart_roster_updater.
+The roster frame is staged into a temp table with one bulk insert; missing
+players, the player_seasons upsert and duplicate cleanup are then a handful
+of join statements instead of several round trips per player
+"""
+import pandas as pd
+
+from src.database.db_manager import DatabaseManager
+
+STAGE_TABLE = 'tmp_roster_stage'
+
+STAGE_COLUMNS = ('name', 'position', 'height', 'weight', 'college', 'team_id',
+                 'jersey_number', 'age', 'years_in_league', 'roster_status')
+
+STAGE_DDL = f"""
+                CREATE TEMPORARY TABLE {STAGE_TABLE} (
+                    name VARCHAR(100) NOT NULL,
+                    position VARCHAR(10) NOT NULL,
+                    height VARCHAR(10),
+                    weight INT,
+                    college VARCHAR(100),
+                    team_id INT NOT NULL,
+                    jersey_number INT,
+                    age INT,
+                    years_in_league INT,
+                    roster_status VARCHAR(30),
+                    player_id INT
+                )
+            """
+
+# The statements applied to the staged roster (the index advisor EXPLAINs them too)
+NEW_PLAYERS_QUERY = f"""
+                INSERT INTO players (name, position, height, weight, college)
+                SELECT s.name, s.position, s.height, s.weight, s.college
+                FROM {STAGE_TABLE} s
+                LEFT JOIN players p ON p.name = s.name AND p.position = s.position
+                WHERE p.player_id IS NULL
+            """
+
+PLAYER_IDS_QUERY = f"""
+                UPDATE {STAGE_TABLE}
+                SET player_id = (
+                    SELECT p.player_id FROM players p
+                    WHERE p.name = {STAGE_TABLE}.name AND p.position = {STAGE_TABLE}.position
+                )
+            """
+
+CHANGES_QUERY = f"""
+                SELECT s.name, t.abbreviation,
+                       ps.team_id AS old_team_id, s.team_id,
+                       ps.roster_status AS old_status, s.roster_status
+                FROM {STAGE_TABLE} s
+                JOIN player_seasons ps ON ps.player_id = s.player_id AND ps.season = %s
+                JOIN teams t ON t.team_id = s.team_id
+            """
+
+# The WHERE keeps SQLite from reading the upsert's ON as a join constraint
+UPSERT_QUERY = f"""
+                INSERT INTO player_seasons
+                (player_id, season, team_id, position, jersey_number, age,
+                 years_in_league, roster_status, status)
+                SELECT s.player_id, %s, s.team_id, s.position, s.jersey_number, s.age,
+                       s.years_in_league, s.roster_status, 'Active'
+                FROM {STAGE_TABLE} s
+                WHERE s.player_id IS NOT NULL
+                ON DUPLICATE KEY UPDATE
+                    team_id = VALUES(team_id),
+                    position = VALUES(position),
+                    jersey_number = VALUES(jersey_number),
+                    age = VALUES(age),
+                    years_in_league = VALUES(years_in_league),
+                    roster_status = VALUES(roster_status),
+                    updated_at = NOW()
+            """
+
+
+def determine_roster_status(status_str):
+    """Map an nfl_data_py roster status code to our roster_status values"""
+    if not status_str or pd.isna(status_str):
+        return 'Active'
+
+    status = str(status_str).upper().strip()
+
+    if status in ['ACT', 'ACTIVE', '']:
+        return 'Active'
+    elif 'PRACTICE' in status or status in ['PRA', 'PS']:
+        return 'Practice Squad'
+    elif 'INJURED' in status or status in ['IR', 'RES', 'RESERVE']:
+        return 'Injured Reserve'
+    elif 'PUP' in status:
+        return 'PUP'
+    elif 'NFI' in status:
+        return 'NFI'
+    elif 'SUS' in status or 'SUSPEND' in status:
+        return 'Suspended'
+    else:
+        return 'Active'
+
+
+def _value(value):
+    """Plain Python value for a frame cell (None for NaN, unwrapped NumPy scalars)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+class RosterSync:
+    """Upsert a season's roster frame into players and player_seasons"""
+
+    def __init__(self, db=None, season=2025):
+        self.db = db or DatabaseManager()
+        self.season = season
+
+    def stage_rows(self, rosters_df):
+        """
+        Clean roster rows into STAGE_COLUMNS tuples
+
+        Returns (rows, processed, skipped, errors); a player listed twice keeps
+        the later row, like the per-row upsert did
+        """
+        staged = {}
+        processed = 0
+        skipped = 0
+        errors = []
+
+        for row in rosters_df.to_dict('records'):
+            team_abbr = _value(row.get('team'))
+            if not team_abbr:
+                skipped += 1
+                continue
+
+            team = self.db.reference.team(team_abbr)
+            if not team:
+                errors.append(f"Team not found: {team_abbr}")
+                skipped += 1
+                continue
+
+            name = _value(row.get('player_name')) or _value(row.get('full_name'))
+            if not name:
+                skipped += 1
+                continue
+
+            position = _value(row.get('position')) or 'UNK'
+            years_exp = _value(row.get('years_exp')) or _value(row.get('entry_year'))
+
+            staged[(name, position)] = (
+                name, position,
+                _value(row.get('height')), _value(row.get('weight')), _value(row.get('college')),
+                team['team_id'],
+                _value(row.get('jersey_number')), _value(row.get('age')), years_exp,
+                determine_roster_status(row.get('status', ''))
+            )
+            processed += 1
+
+        return list(staged.values()), processed, skipped, errors
+
+    def sync(self, rosters_df):
+        """
+        Stage the roster and apply it in one transaction
+
+        Returns {'processed', 'skipped', 'errors', 'players', 'new_players',
+        'new_seasons', 'trades', 'status_changes'}: players is the number of
+        distinct players on the roster, new_players those created in players
+        and new_seasons the player_seasons rows inserted rather than updated
+        """
+        rows, processed, skipped, errors = self.stage_rows(rosters_df)
+        summary = {
+            'processed': processed, 'skipped': skipped, 'errors': errors, 'players': len(rows),
+            'new_players': 0, 'new_seasons': 0, 'trades': 0, 'status_changes': 0
+        }
+        if not rows:
+            return summary
+
+        with self.db.session() as session:
+            session.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+            session.execute(STAGE_DDL)
+            session.execute_many(f"""
+                INSERT INTO {STAGE_TABLE} ({', '.join(STAGE_COLUMNS)})
+                VALUES ({', '.join(['%s'] * len(STAGE_COLUMNS))})
+            """, rows)
+
+            summary['new_players'] = session.execute(NEW_PLAYERS_QUERY)
+            session.execute(PLAYER_IDS_QUERY)
+
+            changes = session.query(CHANGES_QUERY, (self.season,))
+            for change in changes:
+                if change['old_team_id'] != change['team_id']:
+                    print(f"  🔄 TRADE: {change['name']} → {change['abbreviation']}")
+                    summary['trades'] += 1
+                if change['old_status'] != change['roster_status']:
+                    summary['status_changes'] += 1
+            summary['new_seasons'] = len(rows) - len(changes)
+
+            session.execute(UPSERT_QUERY, (self.season,))
+
+            session.execute(f"DROP TABLE {STAGE_TABLE}")
+
+        return summary
+
+    def remove_duplicates(self):
+        """
+        Keep only the newest player_seasons row per player for the season
+
+        Returns (duplicates, removed): one report row per affected player
+        (name, count, teams) and the number of rows deleted
+        """
+        duplicates = self.db.execute_query("""
+            SELECT
+                ps.player_id,
+                p.name,
+                COUNT(*) as count,
+                GROUP_CONCAT(t.abbreviation) as teams
+            FROM player_seasons ps
+            JOIN players p ON ps.player_id = p.player_id
+            JOIN teams t ON ps.team_id = t.team_id
+            WHERE ps.season = %s
+            GROUP BY ps.player_id, p.name
+            HAVING COUNT(*) > 1
+        """, (self.season,))
+        if not duplicates:
+            return duplicates, 0
+
+        # The derived table lets MySQL read the table it is deleting from
+        removed = self.db.execute_update("""
+            DELETE FROM player_seasons
+            WHERE season = %s
+            AND player_season_id NOT IN (
+                SELECT keep_id FROM (
+                    SELECT MAX(player_season_id) AS keep_id
+                    FROM player_seasons
+                    WHERE season = %s
+                    GROUP BY player_id
+                ) AS keep
+            )
+        """, (self.season, self.season))
+        return duplicates, removed
@@ -1,15 +1,10 @@
-import sys
-from pathlib import Path
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import time
 
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from src.database.db_manager import DatabaseManager
+from src.database.player_resolver import print_misses
+from src.data_collection.payload_archive import get_archive
 
 SEASON_2025_WEEKS = {
     1: ("2025-09-05", "2025-09-09"),
@@ -34,6 +29,24 @@ SEASON_2025_WEEKS = {
 
 ESPN_INJURY_URL = "https://www.espn.com/nfl/injuries"
 
+# payload_archive source for the injury report page
+INJURY_SOURCE = 'espn_injuries'
+
+EXISTING_INJURIES_QUERY = """
+        SELECT 
+            p.name,
+            t.abbreviation,
+            i.injury_status,
+            i.week,
+            i.injury_id,
+            i.player_id
+        FROM injuries i
+        JOIN players p ON i.player_id = p.player_id
+        LEFT JOIN player_seasons ps ON i.player_id = ps.player_id AND i.season = ps.season
+        LEFT JOIN teams t ON ps.team_id = t.team_id
+        WHERE i.season = 2025
+    """
+
 def get_current_week() -> int:
     today = datetime.now().date()
     
@@ -51,83 +64,29 @@ def get_current_week() -> int:
     return 1
 
 
-def normalize_player_name(name):
-    name = name.replace(' Jr.', '').replace(' Sr.', '')
-    name = name.replace(' II', '').replace(' III', '').replace(' IV', '')
-    parts = name.split()
-    if len(parts) == 3 and len(parts[1]) <= 2:
-        name = f"{parts[0]} {parts[2]}"
-    return name.strip().lower()
+def fetch_injury_page(week: Optional[int] = None):
+    """The ESPN injury page as an archived Payload (raises requests' exceptions)"""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    return get_archive().fetch(INJURY_SOURCE, ESPN_INJURY_URL, season=2025, week=week or get_current_week(),
+                               headers=headers, timeout=30)
+
 
+def fetch_espn_injuries(week: Optional[int] = None) -> List[Dict]:
+    """
+    Download (or in replay mode load the archived) ESPN injury page and parse it
 
-def fetch_espn_injuries() -> List[Dict]:
+    week defaults to the current week; date_reported is the day the page
+    was fetched
+    """
     print(f"🔍 Fetching injuries from ESPN...")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
+    week = week or get_current_week()
     
     try:
-        response = requests.get(ESPN_INJURY_URL, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        injuries = []
-        
-        main_wrapper = soup.find('div', class_='Wrapper')
-        if not main_wrapper:
-            print("❌ Could not find main Wrapper on ESPN page")
-            return []
-        
-        all_elements = main_wrapper.find_all(['div'], class_=['Table__Title', 'ResponsiveTable'])
-        
-        teams_and_tables = []
-        pending_tables = []
-        
-        for element in all_elements:
-            if 'Table__Title' in element.get('class', []):
-                team_name = element.text.strip()
-                teams_and_tables.append({
-                    'team': team_name,
-                    'tables': pending_tables + []
-                })
-                pending_tables = []
-            
-            elif 'ResponsiveTable' in element.get('class', []):
-                pending_tables.append(element)
-        
-        team_count = 0
-        for team_data in teams_and_tables:
-            team_name = team_data['team']
-            team_count += 1
-            
-            for table in team_data['tables']:
-                rows = table.find_all('tr')[1:]
-                
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) < 4:
-                        continue
-                    
-                    player_name = cols[0].text.strip()
-                    position = cols[1].text.strip()
-                    injury_description = cols[2].text.strip()
-                    injury_status = cols[3].text.strip()
-                    
-                    injuries.append({
-                        'player_name': player_name,
-                        'team': team_name,
-                        'position': position,
-                        'injury_status': injury_status,
-                        'injury_description': injury_description,
-                        'date_reported': datetime.now().strftime('%Y-%m-%d'),
-                        'season': 2025,
-                        'week': get_current_week()
-                    })
-        
-        print(f"✓ Processed {team_count} teams")
-        print(f"✅ Found {len(injuries)} injuries across all teams")
-        return injuries
+        payload = fetch_injury_page(week)
+        return parse_espn_injuries(payload.text, week, payload.fetched_at.strftime('%Y-%m-%d'))
         
     except Exception as e:
         print(f"❌ Error fetching injuries: {e}")
@@ -136,30 +95,97 @@ def fetch_espn_injuries() -> List[Dict]:
         return []
 
 
-def find_player_id(db, player_name, team_id, player_cache):
-    normalized_name = normalize_player_name(player_name)
+# Team header and table containers, in document order, inside the page's main Wrapper
+_SECTION_XPATH = (
+    "(//div[contains(concat(' ', normalize-space(@class), ' '), ' Wrapper ')])[1]"
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' Table__Title ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' ResponsiveTable ')]"
+)
+
+
+def extract_injury_rows(html: str) -> List[tuple]:
+    """
+    (team, player, position, description, status) for every injury row
+
+    Only the team headers, table rows and their cells are touched: lxml
+    parses the page and one XPath picks the sections, so a poll costs a few
+    milliseconds. A table belongs to the next team header in document order
+    (ESPN nests the header inside its table's container)
+    """
+    try:
+        from lxml import html as lxml_html
+    except ImportError:
+        return _extract_injury_rows_soup(html)
+    
+    document = lxml_html.fromstring(html)
+    rows = []
+    pending_tables = []
+    for element in document.xpath(_SECTION_XPATH):
+        if 'Table__Title' in element.get('class', '').split():
+            team_name = element.text_content().strip()
+            for table in pending_tables:
+                for row in table.xpath('.//tr')[1:]:
+                    cols = row.xpath('.//td')
+                    if len(cols) >= 4:
+                        rows.append((team_name, *(col.text_content().strip() for col in cols[:4])))
+            pending_tables = []
+        else:
+            pending_tables.append(element)
+    return rows
+
+
+def _extract_injury_rows_soup(html: str) -> List[tuple]:
+    """extract_injury_rows with BeautifulSoup, for installs without lxml"""
+    from bs4 import BeautifulSoup
     
-    cache_key = f"{normalized_name}_{team_id}"
-    if cache_key in player_cache:
-        return player_cache[cache_key]
+    main_wrapper = BeautifulSoup(html, 'html.parser').find('div', class_='Wrapper')
+    if not main_wrapper:
+        return []
     
-    result = db.execute_query("""
-        SELECT p.player_id
-        FROM players p
-        JOIN player_seasons ps ON p.player_id = ps.player_id
-        WHERE LOWER(p.name) = %s 
-        AND ps.team_id = %s 
-        AND ps.season = 2025
-        LIMIT 1
-    """, (normalized_name, team_id))
+    rows = []
+    pending_tables = []
+    for element in main_wrapper.find_all(['div'], class_=['Table__Title', 'ResponsiveTable']):
+        if 'Table__Title' in element.get('class', []):
+            team_name = element.text.strip()
+            for table in pending_tables:
+                for row in table.find_all('tr')[1:]:
+                    cols = row.find_all('td')
+                    if len(cols) >= 4:
+                        rows.append((team_name, *(col.text.strip() for col in cols[:4])))
+            pending_tables = []
+        elif 'ResponsiveTable' in element.get('class', []):
+            pending_tables.append(element)
+    return rows
+
+
+def parse_espn_injuries(html: str, week: int, date_reported: str) -> List[Dict]:
+    """Injury rows from the ESPN injuries page HTML"""
+    rows = extract_injury_rows(html)
+    if not rows:
+        print("❌ No injury tables found on ESPN page")
+        return []
     
-    player_id = result[0]['player_id'] if result else None
-    player_cache[cache_key] = player_id
+    injuries = [
+        {
+            'player_name': player_name,
+            'team': team_name,
+            'position': position,
+            'injury_status': injury_status,
+            'injury_description': injury_description,
+            'date_reported': date_reported,
+            'season': 2025,
+            'week': week
+        }
+        for team_name, player_name, position, injury_description, injury_status in rows
+    ]
     
-    return player_id
+    print(f"✓ Processed {len({row[0] for row in rows})} teams")
+    print(f"✅ Found {len(injuries)} injuries across all teams")
+    return injuries
 
 
-def update_injuries_smart(db: DatabaseManager, injuries: List[Dict]) -> Dict[str, int]:
+def update_injuries_smart(db: DatabaseManager, injuries: List[Dict],
+                          current_week: Optional[int] = None) -> Dict[str, int]:
     stats = {
         'new': 0,
         'updated': 0,
@@ -168,23 +194,9 @@ def update_injuries_smart(db: DatabaseManager, injuries: List[Dict]) -> Dict[str
         'not_found': 0
     }
     
-    current_week = get_current_week()
-    player_cache = {}
+    current_week = current_week or get_current_week()
     
-    existing = db.execute_query("""
-        SELECT 
-            p.name,
-            t.abbreviation,
-            i.injury_status,
-            i.week,
-            i.injury_id,
-            i.player_id
-        FROM injuries i
-        JOIN players p ON i.player_id = p.player_id
-        LEFT JOIN player_seasons ps ON i.player_id = ps.player_id AND i.season = ps.season
-        LEFT JOIN teams t ON ps.team_id = t.team_id
-        WHERE i.season = 2025
-    """)
+    existing = db.execute_query(EXISTING_INJURIES_QUERY)
     
     existing_map = {
         (row['name'], row['abbreviation']): {
@@ -198,17 +210,21 @@ def update_injuries_smart(db: DatabaseManager, injuries: List[Dict]) -> Dict[str
     
     fetched_players = set()
     
-    for injury in injuries:
-        team_abbrev = get_team_abbreviation(injury['team'])
-        
-        team_data = db.get_team_by_abbreviation(team_abbrev)
+    # Resolve the whole report against the in-memory player index up front
+    teams = [db.reference.team(injury['team']) for injury in injuries]
+    player_ids, misses = db.reference.resolver().resolve_many(
+        [injury['player_name'] for injury in injuries],
+        team_ids=[team['team_id'] if team else None for team in teams],
+        seasons=[2025] * len(injuries)
+    )
+    
+    for injury, team_data, player_id in zip(injuries, teams, player_ids):
         if not team_data:
             stats['not_found'] += 1
             continue
         
         team_id = team_data['team_id']
-        
-        player_id = find_player_id(db, injury['player_name'], team_id, player_cache)
+        team_abbrev = team_data['abbreviation']
         
         if not player_id:
             stats['not_found'] += 1
@@ -288,27 +304,63 @@ def update_injuries_smart(db: DatabaseManager, injuries: List[Dict]) -> Dict[str
             """, (data['injury_id'],))
             stats['resolved'] += 1
     
+    print_misses(misses)
     return stats
 
 
-def get_team_abbreviation(team_name: str) -> str:
-    team_map = {
-        'Arizona Cardinals': 'ARI', 'Atlanta Falcons': 'ATL', 'Baltimore Ravens': 'BAL',
-        'Buffalo Bills': 'BUF', 'Carolina Panthers': 'CAR', 'Chicago Bears': 'CHI',
-        'Cincinnati Bengals': 'CIN', 'Cleveland Browns': 'CLE', 'Dallas Cowboys': 'DAL',
-        'Denver Broncos': 'DEN', 'Detroit Lions': 'DET', 'Green Bay Packers': 'GB',
-        'Houston Texans': 'HOU', 'Indianapolis Colts': 'IND', 'Jacksonville Jaguars': 'JAX',
-        'Kansas City Chiefs': 'KC', 'Las Vegas Raiders': 'LV', 'Los Angeles Chargers': 'LAC',
-        'Los Angeles Rams': 'LA', 'Miami Dolphins': 'MIA', 'Minnesota Vikings': 'MIN',
-        'New England Patriots': 'NE', 'New Orleans Saints': 'NO', 'New York Giants': 'NYG',
-        'New York Jets': 'NYJ', 'Philadelphia Eagles': 'PHI', 'Pittsburgh Steelers': 'PIT',
-        'San Francisco 49ers': 'SF', 'Seattle Seahawks': 'SEA', 'Tampa Bay Buccaneers': 'TB',
-        'Tennessee Titans': 'TEN', 'Washington Commanders': 'WAS'
-    }
-    return team_map.get(team_name, team_name)
+def print_update_stats(stats: Dict[str, int]):
+    print("\n" + "-"*60)
+    print("✅ UPDATE COMPLETE:")
+    print(f"  🆕 New Injuries: {stats['new']}")
+    print(f"  🔄 Updated: {stats['updated']}")
+    print(f"  ➖ Unchanged: {stats['unchanged']}")
+    print(f"  ✅ Resolved: {stats['resolved']}")
+    print(f"  ⚠️  Not Found in Roster: {stats['not_found']}")
+    print("-"*60)
+
+
+def poll_injuries(db: DatabaseManager, interval: int, max_polls: Optional[int] = None):
+    """
+    Re-check the injury page every interval seconds (game-day mode)
+
+    A page identical to the previous poll (same content digest) is not
+    parsed or applied, so most polls cost one request
+    """
+    last_digest = None
+    polls = 0
+    print(f"⏱️  Polling ESPN injuries every {interval}s (Ctrl+C to stop)")
+    try:
+        while max_polls is None or polls < max_polls:
+            polls += 1
+            week = get_current_week()
+            try:
+                payload = fetch_injury_page(week)
+                if payload.digest == last_digest:
+                    print(f"[{datetime.now():%H:%M:%S}] ➖ No changes")
+                else:
+                    injuries = parse_espn_injuries(payload.text, week, payload.fetched_at.strftime('%Y-%m-%d'))
+                    if injuries:
+                        stats = update_injuries_smart(db, injuries, current_week=week)
+                        print(f"[{datetime.now():%H:%M:%S}] 🆕 {stats['new']} new, 🔄 {stats['updated']} updated, "
+                              f"✅ {stats['resolved']} resolved")
+                        last_digest = payload.digest
+            except Exception as e:
+                print(f"[{datetime.now():%H:%M:%S}] ❌ Poll failed: {e}")
+            
+            if max_polls is None or polls < max_polls:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped polling")
 
 
-def main():
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Update 2025 injuries from the ESPN injury report')
+    parser.add_argument('--poll', type=int, metavar='SECONDS',
+                        help='Keep running and re-check the report every SECONDS')
+    parser.add_argument('--max-polls', type=int, help='Stop after this many polls')
+    args = parser.parse_args(argv)
+    
     db = DatabaseManager()
     
     try:
@@ -318,6 +370,10 @@ def main():
         print(f"📅 Current Week: {get_current_week()}")
         print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d')}")
         
+        if args.poll:
+            poll_injuries(db, args.poll, args.max_polls)
+            return
+        
         injuries = fetch_espn_injuries()
         
         if not injuries:
@@ -326,15 +382,7 @@ def main():
         
         print(f"\n💾 Updating database...")
         stats = update_injuries_smart(db, injuries)
-        
-        print("\n" + "-"*60)
-        print("✅ UPDATE COMPLETE:")
-        print(f"  🆕 New Injuries: {stats['new']}")
-        print(f"  🔄 Updated: {stats['updated']}")
-        print(f"  ➖ Unchanged: {stats['unchanged']}")
-        print(f"  ✅ Resolved: {stats['resolved']}")
-        print(f"  ⚠️  Not Found in Roster: {stats['not_found']}")
-        print("-"*60)
+        print_update_stats(stats)
         
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -343,4 +391,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,16 +1,13 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import nfl_data_py as nfl
-from database.db_manager import DatabaseManager
-import pandas as pd
+from src.database.db_manager import DatabaseManager
+from src.data_collection.roster_sync import RosterSync
 from datetime import datetime
 
 class SmartRosterUpdater:
     
     def __init__(self):
         self.db = DatabaseManager()
+        self.roster_sync = RosterSync(self.db, season=2025)
         self.updates_made = {
             'new_players': 0,
             'trades': 0,
@@ -34,46 +31,16 @@ class SmartRosterUpdater:
             print(f"✗ Error fetching rosters: {e}")
             return None
     
-    def determine_roster_status(self, status_str):
-        if not status_str or pd.isna(status_str):
-            return 'Active'
-        
-        status = str(status_str).upper().strip()
-        
-        if status in ['ACT', 'ACTIVE', '']:
-            return 'Active'
-        elif 'PRACTICE' in status or status in ['PRA', 'PS']:
-            return 'Practice Squad'
-        elif 'INJURED' in status or status in ['IR', 'RES', 'RESERVE']:
-            return 'Injured Reserve'
-        elif 'PUP' in status:
-            return 'PUP'
-        elif 'NFI' in status:
-            return 'NFI'
-        elif 'SUS' in status or 'SUSPEND' in status:
-            return 'Suspended'
-        else:
-            return 'Active'
-    
     def remove_duplicates(self):
         print("\n" + "="*70)
         print("CHECKING FOR DUPLICATE PLAYER_SEASONS")
         print("="*70)
         
-        duplicates = self.db.execute_query("""
-            SELECT 
-                ps.player_id,
-                p.name,
-                COUNT(*) as count,
-                GROUP_CONCAT(ps.player_season_id) as ids,
-                GROUP_CONCAT(t.abbreviation) as teams
-            FROM player_seasons ps
-            JOIN players p ON ps.player_id = p.player_id
-            JOIN teams t ON ps.team_id = t.team_id
-            WHERE ps.season = 2025
-            GROUP BY ps.player_id
-            HAVING COUNT(*) > 1
-        """)
+        try:
+            duplicates, removed = self.roster_sync.remove_duplicates()
+        except Exception as e:
+            self.updates_made['errors'].append(f"Error removing duplicates: {e}")
+            return
         
         if not duplicates:
             print("✓ No duplicates found")
@@ -82,26 +49,11 @@ class SmartRosterUpdater:
         print(f"⚠️  Found {len(duplicates)} players with duplicate 2025 records")
         
         for dup in duplicates:
-            ids = [int(x) for x in dup['ids'].split(',')]
-            teams = dup['teams'].split(',')
-            
             print(f"\n  Player: {dup['name']}")
-            print(f"  Teams: {', '.join(teams)}")
-            print(f"  Keeping most recent record, removing {len(ids)-1} duplicate(s)")
-            
-            keep_id = max(ids)
-            remove_ids = [x for x in ids if x != keep_id]
-            
-            for remove_id in remove_ids:
-                try:
-                    self.db.execute_update(
-                        "DELETE FROM player_seasons WHERE player_season_id = %s",
-                        (remove_id,)
-                    )
-                    self.updates_made['duplicates_removed'] += 1
-                except Exception as e:
-                    self.updates_made['errors'].append(f"Error removing duplicate for {dup['name']}: {e}")
+            print(f"  Teams: {dup['teams'].replace(',', ', ')}")
+            print(f"  Keeping most recent record, removing {dup['count']-1} duplicate(s)")
         
+        self.updates_made['duplicates_removed'] += removed
         print(f"\n✓ Removed {self.updates_made['duplicates_removed']} duplicate records")
     
     def update_rosters(self, rosters_df):
@@ -109,115 +61,21 @@ class SmartRosterUpdater:
         print("UPDATING ROSTERS")
         print("="*70)
         
-        processed = 0
-        skipped = 0
+        try:
+            result = self.roster_sync.sync(rosters_df)
+        except Exception as e:
+            self.updates_made['errors'].append(f"Error syncing rosters: {e}")
+            print(f"✗ Roster sync failed: {e}")
+            return
         
-        for idx, row in rosters_df.iterrows():
-            try:
-                team_abbr = row.get('team')
-                if not team_abbr or pd.isna(team_abbr):
-                    skipped += 1
-                    continue
-                
-                team = self.db.get_team_by_abbreviation(team_abbr)
-                if not team:
-                    self.updates_made['errors'].append(f"Team not found: {team_abbr}")
-                    skipped += 1
-                    continue
-                
-                team_id = team['team_id']
-                name = row.get('player_name') or row.get('full_name')
-                if not name or pd.isna(name):
-                    skipped += 1
-                    continue
-                
-                position = row.get('position', 'UNK')
-                if pd.isna(position):
-                    position = 'UNK'
-                
-                height = row.get('height')
-                weight = row.get('weight')
-                college = row.get('college')
-                
-                if pd.isna(height): height = None
-                if pd.isna(weight): weight = None
-                if pd.isna(college): college = None
-                
-                player_id = self.db.get_or_create_player(
-                    name=name,
-                    position=position,
-                    height=height,
-                    weight=weight,
-                    college=college
-                )
-                
-                existing = self.db.execute_query("""
-                    SELECT player_season_id, team_id, roster_status
-                    FROM player_seasons
-                    WHERE player_id = %s AND season = 2025
-                    LIMIT 1
-                """, (player_id,))
-                
-                jersey = row.get('jersey_number')
-                age = row.get('age')
-                years_exp = row.get('years_exp') or row.get('entry_year')
-                status = row.get('status', '')
-                
-                if pd.isna(jersey): jersey = None
-                if pd.isna(age): age = None
-                if pd.isna(years_exp): years_exp = None
-                
-                roster_status = self.determine_roster_status(status)
-                
-                if existing:
-                    old_team_id = existing[0]['team_id']
-                    old_status = existing[0]['roster_status']
-                    
-                    if old_team_id != team_id:
-                        print(f"  🔄 TRADE: {name} → {team_abbr}")
-                        self.updates_made['trades'] += 1
-                    
-                    if old_status != roster_status:
-                        self.updates_made['status_changes'] += 1
-                    
-                    self.db.execute_update("""
-                        UPDATE player_seasons
-                        SET team_id = %s,
-                            position = %s,
-                            jersey_number = %s,
-                            age = %s,
-                            years_in_league = %s,
-                            roster_status = %s,
-                            updated_at = NOW()
-                        WHERE player_season_id = %s
-                    """, (team_id, position, jersey, age, years_exp, roster_status,
-                          existing[0]['player_season_id']))
-                else:
-                    self.db.add_player_season(
-                        player_id=player_id,
-                        season=2025,
-                        team_id=team_id,
-                        position=position,
-                        jersey_number=jersey,
-                        age=age,
-                        years_in_league=years_exp,
-                        roster_status=roster_status,
-                        status='Active'
-                    )
-                    self.updates_made['new_players'] += 1
-                
-                processed += 1
-                
-                if processed % 200 == 0:
-                    print(f"  Progress: {processed} players processed...")
-                
-            except Exception as e:
-                self.updates_made['errors'].append(f"Error processing {row.get('player_name', 'Unknown')}: {e}")
-                skipped += 1
+        self.updates_made['new_players'] += result['new_seasons']
+        self.updates_made['trades'] += result['trades']
+        self.updates_made['status_changes'] += result['status_changes']
+        self.updates_made['errors'].extend(result['errors'])
         
-        print(f"\n✓ Processed {processed} players")
-        if skipped > 0:
-            print(f"⚠️  Skipped {skipped} records")
+        print(f"\n✓ Processed {result['processed']} players")
+        if result['skipped'] > 0:
+            print(f"⚠️  Skipped {result['skipped']} records")
     
     def print_summary(self):
         print("\n" + "="*70)
@@ -0,0 +1,213 @@
+"""
+Columnar Analytics Mirror
+Copies games, player_game_stats, depth_charts and injuries into Parquet
+partitioned by season/week so the heavy aggregations can scan columns
+in-process instead of OR-joining row-store MySQL tables
+"""
+import os
+from decimal import Decimal
+
+from src.database.db_manager import DatabaseManager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Relative roots (including ANALYTICS_MIRROR) resolve against the project
+# root, so the Streamlit server, the CLI and the Tuesday workflow share one tree
+MIRROR_DIR = os.path.join(PROJECT_ROOT, 'analytics_mirror')
+
+# Tables mirrored per season, partitioned by these columns
+PARTITIONED_TABLES = {
+    'games': ['season', 'week'],
+    'player_game_stats': ['season', 'week'],
+    'depth_charts': ['season', 'week'],
+    'injuries': ['season', 'week']
+}
+
+# Small lookup tables copied whole
+LOOKUP_TABLES = ['teams']
+
+
+def _to_arrow(rows):
+    """Convert DB rows or a chunk frame to an Arrow table (DECIMAL -> float, TIME -> seconds)"""
+    import pandas as pd
+    import pyarrow as pa
+
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+    for col in df.columns:
+        sample = df[col].dropna()
+        if sample.empty or df[col].dtype != object:
+            continue
+        first = sample.iloc[0]
+        if isinstance(first, Decimal):
+            df[col] = df[col].astype(float)
+        elif isinstance(first, pd.Timedelta) or hasattr(first, 'total_seconds'):
+            df[col] = df[col].map(lambda v: v.total_seconds() if v is not None else None)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+class AnalyticsMirror:
+    """Sync and scan the Parquet mirror"""
+
+    def __init__(self, root=MIRROR_DIR, db=None):
+        self.root = os.path.join(PROJECT_ROOT, root)
+        self.db = db or DatabaseManager()
+        self._frames = {}
+
+    @classmethod
+    def from_env(cls):
+        """The mirror named by ANALYTICS_MIRROR, or None if unset / not synced yet"""
+        root = os.getenv('ANALYTICS_MIRROR')
+        if not root:
+            return None
+        mirror = cls(root)
+        return mirror if mirror.is_available() else None
+
+    def is_available(self):
+        return all(os.path.isdir(os.path.join(self.root, t)) for t in list(PARTITIONED_TABLES) + LOOKUP_TABLES)
+
+    def sync(self, seasons=None):
+        """
+        Mirror the given seasons (default: every season in games)
+
+        Re-syncing a season replaces its partitions, so this is safe to run
+        after every ingest
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        if seasons is None:
+            seasons = [r['season'] for r in self.db.execute_query(
+                "SELECT DISTINCT season FROM games ORDER BY season"
+            )]
+
+        written = {}
+
+        for table in LOOKUP_TABLES:
+            rows = self.db.execute_query(f"SELECT * FROM {table}")
+            os.makedirs(os.path.join(self.root, table), exist_ok=True)
+            pq.write_table(_to_arrow(rows), os.path.join(self.root, table, f"{table}.parquet"))
+            written[table] = len(rows)
+
+        for table, partition_cols in PARTITIONED_TABLES.items():
+            written[table] = 0
+            for season in seasons:
+                # Stream the season so only Arrow's columnar copy is held, never a dict per row
+                chunks = [
+                    _to_arrow(chunk) for chunk in self.db.iter_query(
+                        f"SELECT * FROM {table} WHERE season = %s", (season,), output='pandas'
+                    )
+                ]
+                if not chunks:
+                    continue
+                season_table = pa.concat_tables(chunks, promote_options='permissive')
+                ds.write_dataset(
+                    season_table,
+                    os.path.join(self.root, table),
+                    format='parquet',
+                    partitioning=partition_cols,
+                    partitioning_flavor='hive',
+                    existing_data_behavior='delete_matching',
+                    basename_template=f"{table}-{{i}}.parquet"
+                )
+                written[table] += season_table.num_rows
+
+        self._frames.clear()
+        return written
+
+    def scan(self, table, columns=None, filters=None):
+        """
+        Read a mirrored table into a DataFrame
+
+        Only the requested columns are decoded and filters (pyarrow DNF, e.g.
+        [('season', '=', 2025), ('week', '<', 7)]) prune partitions and row
+        groups before anything is loaded
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.root, table)
+        partitioning = None
+        if table in PARTITIONED_TABLES:
+            partitioning = ds.partitioning(
+                pa.schema([(col, pa.int32()) for col in PARTITIONED_TABLES[table]]), flavor='hive'
+            )
+        return pq.read_table(path, columns=columns, filters=filters, partitioning=partitioning).to_pandas()
+
+    def frame(self, table, season, columns=None):
+        """One season of a table, cached in memory for repeated aggregations"""
+        key = (table, season, tuple(columns) if columns else None)
+        if key not in self._frames:
+            self._frames[key] = self.scan(table, columns, [('season', '=', season)])
+        return self._frames[key]
+
+    def lookup(self, table):
+        """A whole lookup table (e.g. teams), cached in memory"""
+        key = (table, None, None)
+        if key not in self._frames:
+            self._frames[key] = self.scan(table)
+        return self._frames[key]
+
+    def sql(self, query):
+        """Run SQL over the mirror with DuckDB (optional dependency)"""
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("AnalyticsMirror.sql requires the duckdb package; use scan() instead")
+
+        con = duckdb.connect()
+        for table in PARTITIONED_TABLES:
+            con.execute(f"""
+                CREATE VIEW {table} AS
+                SELECT * FROM read_parquet('{os.path.join(self.root, table)}/**/*.parquet', hive_partitioning = true)
+            """)
+        for table in LOOKUP_TABLES:
+            con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{os.path.join(self.root, table)}/*.parquet')")
+        return con.execute(query).df()
+
+    def player_career_stats(self, player_id):
+        """Columnar equivalent of DatabaseManager.get_player_career_stats"""
+        stats = self.scan('player_game_stats', filters=[('player_id', '=', player_id)])
+        if stats.empty:
+            return []
+
+        career = stats.groupby('season').agg(
+            games=('game_id', 'size'),
+            total_pass_yards=('pass_yards', 'sum'),
+            total_pass_tds=('pass_touchdowns', 'sum'),
+            total_rush_yards=('rush_yards', 'sum'),
+            total_rush_tds=('rush_touchdowns', 'sum'),
+            total_rec_yards=('receiving_yards', 'sum'),
+            total_rec_tds=('receiving_touchdowns', 'sum'),
+            total_tackles=('tackles', 'sum'),
+            total_sacks=('sacks', 'sum')
+        ).reset_index().sort_values('season', ascending=False)
+
+        return career.to_dict('records')
+
+
+def main(argv=None):
+    import argparse
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description='Sync the Parquet analytics mirror')
+    parser.add_argument('--season', type=int, nargs='+', help='Seasons to sync (default: all)')
+    parser.add_argument('--root', default=os.getenv('ANALYTICS_MIRROR', MIRROR_DIR))
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("SYNCING ANALYTICS MIRROR")
+    print("=" * 70)
+
+    started = datetime.now()
+    written = AnalyticsMirror(args.root).sync(args.season)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    for table, count in written.items():
+        print(f"✓ {table:<20} {count:>8,} rows")
+    print(f"\n✓ Mirror written to {args.root} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""
+Storage Backends for DatabaseManager
+MySQL (the production server) plus embedded SQLite and DuckDB files for
+local development, benchmarks and in-process analytics. Queries are
+written in MySQL syntax everywhere; embedded backends translate them
+"""
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+import pymysql
+from pymysql.constants import CLIENT
+from pymysql.cursors import Cursor, DictCursor, SSCursor
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema')
+
+_LAST_INSERT_ID_UPSERT = re.compile(
+    r'ON DUPLICATE KEY UPDATE\s+(\w+)\s*=\s*LAST_INSERT_ID\(\s*\1\s*\)', re.I
+)
+_UPSERT = re.compile(r'ON DUPLICATE KEY UPDATE', re.I)
+_VALUES_REF = re.compile(r'VALUES\((\w+)\)', re.I)
+
+# Pooled connections idle longer than this are pinged before reuse (proxies drop idle sockets)
+POOL_IDLE_PING_S = 30
+
+# SQLite ':memory:' as a named shared-cache database, so every thread's
+# connection sees the same tables
+SQLITE_MEMORY_URI = 'file:gridiron_memory?mode=memory&cache=shared'
+
+_INSERT_TABLE = re.compile(r'\s*INSERT\s+(?:OR\s+IGNORE\s+)?INTO\s+(\w+)', re.I)
+_auto_keys = None
+
+
+def translate_sql(query, dialect):
+    """
+    Rewrite a MySQL statement for an embedded dialect ('sqlite' or 'duckdb')
+
+    Handles %s placeholders, NOW(), INSERT IGNORE, ON DUPLICATE KEY UPDATE
+    with VALUES(col), and the LAST_INSERT_ID(pk) get-or-create idiom
+    """
+    if dialect == 'mysql':
+        return query
+
+    sql = query.replace('%s', '?')
+    sql = re.sub(r'\bNOW\(\)', 'CURRENT_TIMESTAMP', sql, flags=re.I)
+    sql = re.sub(r'\bINSERT\s+IGNORE\b', 'INSERT OR IGNORE', sql, flags=re.I)
+
+    pk_upsert = _LAST_INSERT_ID_UPSERT.search(sql)
+    if pk_upsert:
+        pk = pk_upsert.group(1)
+        return sql[:pk_upsert.start()] + f"ON CONFLICT DO UPDATE SET {pk} = {pk} RETURNING {pk}"
+
+    upsert = _UPSERT.search(sql)
+    if upsert:
+        assignments = _VALUES_REF.sub(r'excluded.\1', sql[upsert.end():])
+        sql = sql[:upsert.start()] + "ON CONFLICT DO UPDATE SET" + assignments
+
+    return sql
+
+
+def translate_ddl(dialect, schema_path=SCHEMA_PATH):
+    """Translate the MySQL schema file into CREATE statements for a dialect"""
+    with open(schema_path) as f:
+        sql = re.sub(r'--[^\n]*', '', f.read())
+
+    statements = []
+    for table, body in re.findall(r'CREATE TABLE IF NOT EXISTS (\w+) \((.*?)\n\);', sql, flags=re.S):
+        columns = []
+        indexes = []
+        for line in body.strip().splitlines():
+            line = line.strip().rstrip(',')
+            if not line:
+                continue
+
+            index = re.match(r'INDEX (\w+) \((.*)\)', line)
+            if index:
+                indexes.append(f"CREATE INDEX IF NOT EXISTS {table}_{index.group(1)} ON {table} ({index.group(2)})")
+                continue
+            if dialect == 'duckdb' and line.startswith('FOREIGN KEY'):
+                continue
+
+            line = re.sub(r'UNIQUE KEY \w+ ', 'UNIQUE ', line)
+            line = line.replace(' ON UPDATE CURRENT_TIMESTAMP', '')
+            if dialect == 'sqlite':
+                line = line.replace('INT PRIMARY KEY AUTO_INCREMENT', 'INTEGER PRIMARY KEY AUTOINCREMENT')
+            elif 'AUTO_INCREMENT' in line:
+                statements.append(f"CREATE SEQUENCE IF NOT EXISTS {table}_id_seq")
+                line = line.replace('PRIMARY KEY AUTO_INCREMENT', f"PRIMARY KEY DEFAULT nextval('{table}_id_seq')")
+            columns.append(line)
+
+        statements.append(f"CREATE TABLE IF NOT EXISTS {table} (\n    " + ",\n    ".join(columns) + "\n)")
+        statements.extend(indexes)
+
+    return statements
+
+
+def auto_increment_keys(schema_path=SCHEMA_PATH):
+    """{table: AUTO_INCREMENT primary key column} from the schema file"""
+    global _auto_keys
+    if _auto_keys is None:
+        with open(schema_path) as f:
+            sql = f.read()
+        _auto_keys = {}
+        for table, body in re.findall(r'CREATE TABLE IF NOT EXISTS (\w+) \((.*?)\n\);', sql, flags=re.S):
+            key = re.search(r'(\w+) INT PRIMARY KEY AUTO_INCREMENT', body)
+            if key:
+                _auto_keys[table] = key.group(1)
+    return _auto_keys
+
+
+def returning_key(sql):
+    """
+    Add RETURNING <pk> to a single-row INSERT into a schema table
+
+    DuckDB has no lastrowid; the returned key stands in for it so
+    execute_insert and the add_* helpers get the new id back
+    """
+    insert = _INSERT_TABLE.match(sql)
+    if not insert or re.search(r'\bRETURNING\b', sql, re.I):
+        return sql
+    key = auto_increment_keys().get(insert.group(1))
+    if not key:
+        return sql
+    return sql.rstrip().rstrip(';') + f" RETURNING {key}"
+
+
+def run_statements(cursor, statements):
+    """Execute (query, params) pairs one after another; one result list per statement"""
+    results = []
+    for query, params in statements:
+        cursor.execute(query, params or ())
+        results.append(list(cursor.fetchall()))
+    return results
+
+
+class MySQLBackend:
+    """
+    One short-lived pymysql connection per operation (the original behavior),
+    or in remote mode (DB_REMOTE=1) a small pool of persistent autocommit
+    connections that also pipeline batches as one multi-statement round trip
+    """
+
+    dialect = 'mysql'
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, host=None, user=None, password=None, database=None, port=None,
+                 remote=None, pool_size=None):
+        self.host = host or os.getenv('DB_HOST', 'localhost')
+        self.user = user or os.getenv('DB_USER')
+        self.password = password or os.getenv('DB_PASSWORD')
+        self.database = database or os.getenv('DB_NAME')
+        self.port = int(port or os.getenv('DB_PORT', 3306))
+        if remote is None:
+            remote = os.getenv('DB_REMOTE', '').lower() in ('1', 'true', 'yes')
+        self.remote = remote
+        self.pool_size = int(pool_size or os.getenv('DB_POOL_SIZE', 4))
+
+    @property
+    def pipelined(self):
+        """True when run_batch sends a whole batch in one round trip"""
+        return self.remote
+
+    def _open(self):
+        options = {}
+        if self.remote:
+            options = {'autocommit': True, 'client_flag': CLIENT.MULTI_STATEMENTS}
+        return pymysql.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            port=self.port,
+            cursorclass=DictCursor,
+            **options
+        )
+
+    def _pool(self):
+        key = self.cache_key()
+        with self._pools_lock:
+            if key not in self._pools:
+                self._pools[key] = queue.LifoQueue(self.pool_size)
+            return self._pools[key]
+
+    def connect(self):
+        if not self.remote:
+            return self._open()
+        try:
+            connection, last_used = self._pool().get_nowait()
+        except queue.Empty:
+            return self._open()
+        if time.monotonic() - last_used > POOL_IDLE_PING_S:
+            connection.ping(reconnect=True)
+        return connection
+
+    def release(self, connection):
+        if self.remote and connection.open:
+            try:
+                self._pool().put_nowait((connection, time.monotonic()))
+                return
+            except queue.Full:
+                pass
+        connection.close()
+
+    def discard(self, connection, cursor):
+        """
+        Drop a connection whose streaming cursor was abandoned mid-result
+
+        The unread rows keep the connection out of sync (closing the cursor
+        would drain them first), so close it rather than return it to the pool
+        """
+        connection.close()
+
+    def begin(self, connection):
+        """Start a write transaction (pooled remote connections otherwise autocommit)"""
+        if self.remote:
+            connection.begin()
+
+    def run_batch(self, connection, statements):
+        """Run independent SELECTs; remote mode sends them as one multi-statement query"""
+        with connection.cursor() as cursor:
+            if not self.remote:
+                return run_statements(cursor, statements)
+            sql = ';\n'.join(cursor.mogrify(query, params or ()) for query, params in statements)
+            cursor.execute(sql)
+            results = [list(cursor.fetchall())]
+            while cursor.nextset():
+                results.append(list(cursor.fetchall()))
+        return results
+
+    def cache_key(self):
+        """Identifies the database for process-wide caches"""
+        return (self.dialect, self.host, self.port, self.database)
+
+    def streaming_cursor(self, connection):
+        """Unbuffered cursor: rows stay on the server until fetched, as tuples"""
+        return connection.cursor(SSCursor)
+
+    def tuple_cursor(self, connection):
+        """Buffered cursor returning plain tuples (no per-row dict)"""
+        return connection.cursor(Cursor)
+
+
+class _TranslatingCursor:
+    """pymysql-style cursor (dict rows, rowcount, lastrowid) over an embedded DB"""
+
+    def __init__(self, cursor, dialect, tuples=False):
+        self._cursor = cursor
+        self._dialect = dialect
+        self._tuples = tuples
+        self._rows = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def _columns(self):
+        return [col[0] for col in self._cursor.description or []]
+
+    def execute(self, query, params=()):
+        sql = translate_sql(query, self._dialect)
+        if self._dialect == 'duckdb' and not self._tuples:
+            sql = returning_key(sql)
+        self._cursor.execute(sql, tuple(params or ()))
+        self._rows = None
+
+        if self._dialect == 'sqlite':
+            self.rowcount = self._cursor.rowcount
+            self.lastrowid = self._cursor.lastrowid
+
+        if self._tuples:
+            return self.rowcount
+
+        returning = re.search(r'\bRETURNING\b', sql, re.I)
+        if returning or self._dialect == 'duckdb':
+            columns = self._columns()
+            rows = [dict(zip(columns, row)) for row in self._cursor.fetchall()] if columns else []
+            if returning:
+                self.lastrowid = next(iter(rows[0].values())) if rows else None
+                self.rowcount = len(rows)
+            elif columns == ['Count']:
+                self.rowcount = rows[0]['Count'] if rows else 0
+                rows = []
+            self._rows = rows
+
+        return self.rowcount
+
+    def executemany(self, query, params_list):
+        sql = translate_sql(query, self._dialect)
+        self._cursor.executemany(sql, [tuple(p) for p in params_list])
+        self._rows = None
+        self.rowcount = self._cursor.rowcount if self._dialect == 'sqlite' else len(params_list)
+        return self.rowcount
+
+    def fetchall(self):
+        if self._rows is not None:
+            rows, self._rows = self._rows, []
+            return rows
+        if self._tuples:
+            return self._cursor.fetchall()
+        columns = self._columns()
+        return [dict(zip(columns, row)) for row in self._cursor.fetchall()]
+
+    def fetchone(self):
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+    def fetchmany(self, size):
+        """Next size rows (tuples for streaming cursors, otherwise dicts)"""
+        if self._rows is not None:
+            rows, self._rows = self._rows[:size], self._rows[size:]
+            return rows
+        rows = self._cursor.fetchmany(size)
+        if self._tuples:
+            return rows
+        columns = self._columns()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _EmbeddedConnection:
+    def __init__(self, connection, dialect):
+        self._connection = connection
+        self._dialect = dialect
+
+    def cursor(self, tuples=False):
+        return _TranslatingCursor(self._connection.cursor(), self._dialect, tuples)
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+
+class SQLiteBackend:
+    """
+    Embedded SQLite file; one persistent connection per path and thread
+
+    Threads (Streamlit sessions, the refresh worker) never share a
+    connection, so one thread's rollback can't discard another's writes;
+    SQLite's file locking serializes their transactions
+    """
+
+    dialect = 'sqlite'
+    pipelined = False
+    _local = threading.local()
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path) if path != ':memory:' else path
+
+    def _thread_connections(self):
+        if not hasattr(self._local, 'connections'):
+            self._local.connections = {}
+        return self._local.connections
+
+    def _open(self):
+        if self.path == ':memory:':
+            return sqlite3.connect(SQLITE_MEMORY_URI, uri=True)
+        return sqlite3.connect(self.path, timeout=30)
+
+    def connect(self):
+        connections = self._thread_connections()
+        key = (self.dialect, self.path)
+        if key not in connections:
+            connections[key] = self._open()
+        return _EmbeddedConnection(connections[key], self.dialect)
+
+    def release(self, connection):
+        pass
+
+    def discard(self, connection, cursor):
+        """An abandoned stream only needs its cursor finalized; the connection stays"""
+        cursor.close()
+
+    def begin(self, connection):
+        pass
+
+    def run_batch(self, connection, statements):
+        """In-process, so there is no round trip to save; run the statements in order"""
+        with connection.cursor() as cursor:
+            return run_statements(cursor, statements)
+
+    def cache_key(self):
+        return (self.dialect, self.path)
+
+    def streaming_cursor(self, connection):
+        """Embedded cursors already step through results lazily; just return tuples"""
+        return connection.cursor(tuples=True)
+
+    def tuple_cursor(self, connection):
+        return connection.cursor(tuples=True)
+
+    def close(self):
+        """Close this thread's connection for the path"""
+        connection = self._thread_connections().pop((self.dialect, self.path), None)
+        if connection is not None:
+            connection.close()
+
+    def create_schema(self):
+        connection = self.connect()
+        cursor = connection._connection.cursor()
+        for statement in translate_ddl(self.dialect):
+            cursor.execute(statement)
+        connection.commit()
+
+
+class DuckDBBackend(SQLiteBackend):
+    """Embedded DuckDB file (needs the optional duckdb package)"""
+
+    dialect = 'duckdb'
+    # A DuckDB file opens once per process; each thread gets its own cursor()
+    # on it, which DuckDB makes safe to use concurrently
+    _databases = {}
+    _databases_lock = threading.Lock()
+
+    def _open(self):
+        with self._databases_lock:
+            if self.path not in self._databases:
+                try:
+                    import duckdb
+                except ImportError:
+                    raise ImportError("DB_BACKEND=duckdb requires the duckdb package (pip install duckdb)")
+                self._databases[self.path] = duckdb.connect(self.path)
+            return self._databases[self.path].cursor()
+
+
+def create_backend(name=None, path=None):
+    """Build the backend named by DB_BACKEND (mysql, sqlite or duckdb)"""
+    name = (name or os.getenv('DB_BACKEND', 'mysql')).lower()
+
+    if name == 'mysql':
+        return MySQLBackend()
+
+    path = path or os.getenv('DB_PATH', f"gridiron.{name}")
+    if name == 'sqlite':
+        return SQLiteBackend(path)
+    if name == 'duckdb':
+        return DuckDBBackend(path)
+
+    raise ValueError(f"Unknown DB_BACKEND '{name}' (expected mysql, sqlite or duckdb)")
@@ -1,60 +1,363 @@
-import pymysql
-from pymysql.cursors import DictCursor
 from contextlib import contextmanager
-import os
-from dotenv import load_dotenv
-load_dotenv('config/.env')
+import time
+from decimal import Decimal
+from src.database.query_profiler import get_active_profiler, check_slow_query, profile as profile_queries
+from src.database.backends import create_backend, MySQLBackend
+from src.database.reference_cache import ReferenceCache
+
+# Column that moves whenever a collector writes to the table; together with the
+# row count it gives a cheap change token for cache invalidation
+DATA_VERSION_COLUMNS = {
+    'teams': 'updated_at',
+    'players': 'updated_at',
+    'player_seasons': 'updated_at',
+    'games': 'updated_at',
+    'injuries': 'updated_at',
+    'depth_charts': 'updated_at',
+    'betting_lines': 'timestamp',
+    'weekly_accuracy': 'calculated_date'
+}
+
+CHUNK_OUTPUTS = ('dicts', 'tuples', 'numpy', 'pandas')
+
+# Low-cardinality string columns query_frame stores as pandas categoricals
+CATEGORY_COLUMNS = {
+    'abbreviation', 'team', 'home_team', 'away_team', 'opponent',
+    'position', 'injury_status', 'practice_status', 'game_status'
+}
+
+
+def _column_array(name, values, dtype, downcast):
+    """One column of a result set as a typed NumPy/pandas array"""
+    import numpy as np
+    import pandas as pd
+
+    if dtype is not None:
+        if dtype == 'category':
+            return pd.Categorical(values)
+        return pd.Series(values, dtype=object).astype(dtype).array
+    if name in CATEGORY_COLUMNS:
+        return pd.Categorical(values)
+
+    first = next((v for v in values if v is not None), None)
+    if isinstance(first, int) and not isinstance(first, bool):
+        if None in values:
+            array = np.array(values, dtype=float)
+            return array.astype(np.float32) if downcast else array
+        array = np.array(values, dtype=np.int64)
+        if downcast and len(array):
+            low, high = array.min(), array.max()
+            for int_type in (np.int8, np.int16, np.int32):
+                if np.iinfo(int_type).min <= low and high <= np.iinfo(int_type).max:
+                    return array.astype(int_type)
+        return array
+    if isinstance(first, (float, Decimal)):
+        array = np.array(values, dtype=float)
+        return array.astype(np.float32) if downcast else array
+    return np.array(values, dtype=object)
+
+
+def _build_frame(rows, columns, dtypes=None, downcast=True):
+    """
+    Columnar DataFrame straight from row tuples
+
+    Declared dtypes win; otherwise ints and floats are downcast to the
+    smallest type that holds the values and CATEGORY_COLUMNS become categoricals
+    """
+    import pandas as pd
+
+    dtypes = dtypes or {}
+    values_by_column = list(zip(*rows)) if rows else [()] * len(columns)
+    return pd.DataFrame({
+        name: _column_array(name, values, dtypes.get(name), downcast)
+        for name, values in zip(columns, values_by_column)
+    }, columns=columns)
+
+
+def _shape_chunk(rows, columns, output):
+    """Turn a chunk of row tuples into the container iter_query was asked for"""
+    if output == 'tuples':
+        return rows
+    if output == 'dicts':
+        return [dict(zip(columns, row)) for row in rows]
+    if output == 'numpy':
+        import numpy as np
+        return np.rec.fromrecords(rows, names=columns)
+    import pandas as pd
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+class DatabaseSession:
+    """
+    Statements sharing one connection and transaction, from DatabaseManager.session()
+
+    Needed when later statements depend on per-connection state such as
+    TEMPORARY staging tables
+    """
+
+    def __init__(self, db, connection):
+        self.db = db
+        self.connection = connection
+
+    def query(self, query, params=None):
+        """SELECT on the session connection; returns dict rows"""
+        started = time.perf_counter()
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, params or ())
+            results = cursor.fetchall()
+        self.db._record('query', query, started, len(results))
+        return results
+
+    def execute(self, query, params=None):
+        """INSERT/UPDATE/DELETE/DDL on the session connection; returns affected rows"""
+        started = time.perf_counter()
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, params or ())
+            rowcount = cursor.rowcount
+        self.db._record('update', query, started, rowcount)
+        self.db.reference.invalidate_for(query)
+        return rowcount
+
+    def execute_many(self, query, params_list):
+        """One statement for many parameter rows (a multi-row INSERT on MySQL)"""
+        if not params_list:
+            return 0
+        started = time.perf_counter()
+        with self.connection.cursor() as cursor:
+            cursor.executemany(query, params_list)
+            rowcount = cursor.rowcount
+        self.db._record('many', query, started, rowcount)
+        self.db.reference.invalidate_for(query)
+        return rowcount
+
+
 class DatabaseManager:
     """Manages database connections and operations for Gridiron Prophet"""
     
-    def __init__(self):
-        self.host = os.getenv('DB_HOST', 'localhost')
-        self.user = os.getenv('DB_USER')
-        self.password = os.getenv('DB_PASSWORD')
-        self.database = os.getenv('DB_NAME')
-        self.port = int(os.getenv('DB_PORT', 3306))
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: MySQLBackend / SQLiteBackend / DuckDBBackend instance;
+                     defaults to the one named by DB_BACKEND (mysql)
+        """
+        self.backend = backend or create_backend()
+        if isinstance(self.backend, MySQLBackend):
+            self.host = self.backend.host
+            self.user = self.backend.user
+            self.password = self.backend.password
+            self.database = self.backend.database
+            self.port = self.backend.port
         
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        connection = pymysql.connect(
-            host=self.host,
-            user=self.user,
-            password=self.password,
-            database=self.database,
-            port=self.port,
-            cursorclass=DictCursor
-        )
+        """Context manager for database connections (one transaction, committed on exit)"""
+        connection = self.backend.connect()
         try:
+            self.backend.begin(connection)
             yield connection
             connection.commit()
         except Exception as e:
             connection.rollback()
             raise e
         finally:
-            connection.close()
+            self.backend.release(connection)
+    
+    @contextmanager
+    def _read_connection(self):
+        """Connection for SELECTs: no transaction to open or commit, so no extra round trips"""
+        connection = self.backend.connect()
+        try:
+            yield connection
+        finally:
+            self.backend.release(connection)
+
+    @contextmanager
+    def session(self):
+        """
+        One connection and transaction for a sequence of dependent statements,
+        committed when the block exits (rolled back on error)
+
+            with db.session() as session:
+                session.execute("CREATE TEMPORARY TABLE ...")
+                session.execute_many("INSERT INTO ...", rows)
+        """
+        with self.get_connection() as connection:
+            yield DatabaseSession(self, connection)
+
+    def _record(self, kind, query, started, rows, round_trip=True):
+        """Report a finished statement to the active query profiler, or just the slow-query log"""
+        profiler = get_active_profiler()
+        if profiler:
+            profiler.record(kind, query, time.perf_counter() - started, rows, round_trip)
+        else:
+            check_slow_query(kind, query, time.perf_counter() - started)
+
+    @property
+    def reference(self):
+        """Process-wide teams/players cache shared by every manager on this database"""
+        return ReferenceCache.for_db(self)
+
+    @staticmethod
+    def profile(label=None, slow_query_ms=None, export_path=None, report=True):
+        """Context manager profiling every query issued inside the block"""
+        return profile_queries(label, slow_query_ms, export_path, report)
     
     def execute_query(self, query, params=None):
         """Execute a SELECT query and return results"""
-        with self.get_connection() as conn:
+        started = time.perf_counter()
+        with self._read_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(query, params or ())
-                return cursor.fetchall()
+                results = cursor.fetchall()
+        self._record('query', query, started, len(results))
+        return results
+
+    def execute_batch(self, statements):
+        """
+        Run independent SELECTs together and return one result list per statement
+
+        On a remote MySQL backend (DB_REMOTE=1) the whole batch goes to the
+        server as a single multi-statement round trip, so a predictor that
+        declares its reads up front pays the network latency once instead of
+        once per query. Other backends run the statements in order on one
+        connection.
+
+        Args:
+            statements: [(query, params), ...]
+        """
+        statements = [(query, params) for query, params in statements]
+        if not statements:
+            return []
+        started = time.perf_counter()
+        with self._read_connection() as conn:
+            results = self.backend.run_batch(conn, statements)
+
+        profiler = get_active_profiler()
+        elapsed = (time.perf_counter() - started) / len(statements)
+        pipelined = self.backend.pipelined
+        for i, ((query, _), rows) in enumerate(zip(statements, results)):
+            if profiler:
+                profiler.record('batch', query, elapsed, len(rows), round_trip=not pipelined or i == 0)
+            else:
+                check_slow_query('batch', query, elapsed)
+        return results
     
-    def execute_insert(self, query, params=None):
-        """Execute an INSERT query and return the last inserted ID"""
+    def query_frame(self, query, params=None, dtypes=None, downcast=True):
+        """
+        Execute a SELECT and return a DataFrame without building dict rows
+
+        Args:
+            dtypes: Optional {column: dtype} overrides (e.g. {'week': 'int64'})
+            downcast: Shrink numeric columns to the smallest int/float type
+        """
+        started = time.perf_counter()
+        with self._read_connection() as conn:
+            cursor = self.backend.tuple_cursor(conn)
+            try:
+                cursor.execute(query, params or ())
+                columns = [col[0] for col in cursor.description]
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        self._record('frame', query, started, len(rows))
+        return _build_frame(rows, columns, dtypes, downcast)
+
+    def iter_query(self, query, params=None, chunk_size=10000, output='dicts'):
+        """
+        Stream a SELECT in chunks through a server-side (unbuffered) cursor
+
+        Only one chunk is held in Python at a time, so memory stays flat no
+        matter how many rows the query returns.
+
+        Args:
+            chunk_size: Rows per yielded chunk
+            output: 'dicts' (list of dict rows), 'tuples' (list of tuples),
+                    'numpy' (record array) or 'pandas' (DataFrame)
+        """
+        if output not in CHUNK_OUTPUTS:
+            raise ValueError(f"output must be one of {', '.join(CHUNK_OUTPUTS)}")
+
+        started = time.perf_counter()
+        total = 0
+        conn = self.backend.connect()
+        cursor = self.backend.streaming_cursor(conn)
+        exhausted = False
+        try:
+            cursor.execute(query, params or ())
+            columns = [col[0] for col in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    exhausted = True
+                    break
+                total += len(rows)
+                yield _shape_chunk(rows, columns, output)
+        finally:
+            # A caller that stops early leaves unread rows on the connection;
+            # it must not go back to the pool in that state
+            if exhausted:
+                cursor.close()
+                self.backend.release(conn)
+            else:
+                self.backend.discard(conn, cursor)
+        self._record('stream', query, started, total)
+
+    def _insert(self, query, params=None):
+        started = time.perf_counter()
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(query, params or ())
-                return cursor.lastrowid
+                lastrowid = cursor.lastrowid
+        self._record('insert', query, started, 1)
+        return lastrowid
+
+    def execute_insert(self, query, params=None):
+        """Execute an INSERT query and return the last inserted ID"""
+        lastrowid = self._insert(query, params)
+        self.reference.invalidate_for(query)
+        return lastrowid
     
     def execute_update(self, query, params=None):
         """Execute an UPDATE or DELETE query and return affected rows"""
+        started = time.perf_counter()
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(query, params or ())
-                return cursor.rowcount
-    
+                rowcount = cursor.rowcount
+        self._record('update', query, started, rowcount)
+        self.reference.invalidate_for(query)
+        return rowcount
+
+    def execute_many(self, query, params_list):
+        """Execute one INSERT/UPDATE for many parameter rows in a single round trip"""
+        if not params_list:
+            return 0
+        started = time.perf_counter()
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(query, params_list)
+                rowcount = cursor.rowcount
+        self._record('many', query, started, rowcount)
+        self.reference.invalidate_for(query)
+        return rowcount
+
+    def get_data_version(self, tables):
+        """
+        Return a change token for the given tables in one query
+
+        The token is a string of row count + latest write time per table, so it
+        changes whenever a collector inserts, updates or deletes rows
+        """
+        tables = sorted(tables)
+        query = " UNION ALL ".join(
+            f"SELECT '{table}' AS table_name, COUNT(*) AS row_count, "
+            f"MAX({DATA_VERSION_COLUMNS[table]}) AS last_write FROM {table}"
+            for table in tables
+        )
+        rows = self.execute_query(query)
+        return "|".join(
+            f"{row['table_name']}:{row['row_count']}:{row['last_write']}" for row in rows
+        )
+
     def add_team(self, name, abbreviation, city=None, conference=None, 
                  division=None, stadium=None, head_coach=None):
         """Add a new team to the database"""
@@ -65,15 +368,12 @@ class DatabaseManager:
         return self.execute_insert(query, (name, abbreviation, city, conference, division, stadium, head_coach))
     
     def get_team_by_abbreviation(self, abbreviation):
-        """Get team details by abbreviation"""
-        query = "SELECT * FROM teams WHERE abbreviation = %s"
-        results = self.execute_query(query, (abbreviation,))
-        return results[0] if results else None
+        """Get team details by abbreviation (feed aliases like WSH/LAR also resolve)"""
+        return self.reference.team(abbreviation)
     
     def get_all_teams(self):
         """Get all teams"""
-        query = "SELECT * FROM teams ORDER BY name"
-        return self.execute_query(query)
+        return self.reference.teams()
     
     def add_player(self, name, position=None, height=None, weight=None, 
                    college=None):
@@ -83,7 +383,9 @@ class DatabaseManager:
             VALUES (%s, %s, %s, %s, %s)
             ON DUPLICATE KEY UPDATE player_id=LAST_INSERT_ID(player_id)
         """
-        return self.execute_insert(query, (name, position, height, weight, college))
+        player_id = self._insert(query, (name, position, height, weight, college))
+        self.reference.remember_player(player_id, name, position)
+        return player_id
     
     def get_player_by_name(self, name, position=None):
         """Get player by name (and optionally position)"""
@@ -98,9 +400,9 @@ class DatabaseManager:
     def get_or_create_player(self, name, position=None, height=None, weight=None, 
                             college=None):
         """Get existing player or create new one, return player_id"""
-        player = self.get_player_by_name(name, position)
-        if player:
-            return player['player_id']
+        player_id = self.reference.player_by_name(name, position)
+        if player_id:
+            return player_id
         return self.add_player(name, position, height, weight, college)
     
     def add_player_season(self, player_id, season, team_id, position=None, 
@@ -121,9 +423,11 @@ class DatabaseManager:
                 roster_status = VALUES(roster_status),
                 status = VALUES(status)
         """
-        return self.execute_insert(query, (player_id, season, team_id, position, 
-                                          jersey_number, age, years_in_league, 
-                                          roster_status, status))
+        result = self._insert(query, (player_id, season, team_id, position, 
+                                     jersey_number, age, years_in_league, 
+                                     roster_status, status))
+        self.reference.remember_player_season(player_id, season, team_id)
+        return result
     
     def get_player_season(self, player_id, season):
         """Get player's team/info for a specific season"""
@@ -295,7 +599,24 @@ class DatabaseManager:
         """
         
         return self.execute_insert(query, tuple(all_vals))
-    
+
+    def add_player_game_stats(self, stat_cols, rows):
+        """
+        Upsert many player-game rows in one statement
+
+        Args:
+            stat_cols: Stat column names following the base columns
+            rows: (player_id, game_id, team_id, season, week, *stats) tuples
+        """
+        all_cols = ['player_id', 'game_id', 'team_id', 'season', 'week'] + list(stat_cols)
+        query = f"""
+            INSERT INTO player_game_stats ({', '.join(all_cols)})
+            VALUES ({', '.join(['%s'] * len(all_cols))})
+            ON DUPLICATE KEY UPDATE
+                {', '.join([f"{col} = VALUES({col})" for col in stat_cols])}
+        """
+        return self.execute_many(query, rows)
+
     def get_player_stats_by_season(self, player_id, season):
         """Get all game stats for a player in a season"""
         query = """
@@ -0,0 +1,206 @@
+"""
+Index Advisor
+Makes sure the composite indexes behind the predictors' and collectors' hot
+predicates exist, and runs EXPLAIN on those queries to report full table scans.
+Safe to run repeatedly: indexes that already exist (or are covered by a wider
+index with the same leading columns) are left alone
+"""
+import re
+
+from src.database.db_manager import DatabaseManager
+
+# (table, index name, columns) - leading columns match the hot WHERE/JOIN predicates
+RECOMMENDED_INDEXES = [
+    ('games', 'idx_season_week_status', ('season', 'week', 'game_status')),
+    ('player_game_stats', 'idx_team_game', ('team_id', 'game_id')),
+    # depth_order makes it covering for the AVG(snap)/MIN(depth) importance lookup
+    ('depth_charts', 'idx_player_snap', ('player_id', 'snap_percentage', 'depth_order')),
+    ('depth_charts', 'idx_team_season_week', ('team_id', 'season', 'week')),
+    ('injuries', 'idx_season_week_player', ('season', 'week', 'player_id')),
+    ('player_seasons', 'idx_player_season', ('player_id', 'season')),
+]
+
+# Lookup tables (and their aliases) small enough that a full scan is the right plan,
+# plus the injury query's materialized per-player subquery and the roster stage
+# table, which the roster sync reads whole by design
+SMALL_TABLES = {'teams', 'ht', 'at', 't', 'latest', 'tmp_roster_stage', 's'}
+
+def hot_queries(season=2025, week=7, team_id=1, team_abbr='KC', player_id=1):
+    """
+    (label, sql, sample params) for the queries issued on every prediction
+    run and every collector pass, taken from the modules that run them so
+    the report can't drift
+    """
+    from src.analysis.defensive_rankings import DefensiveRankings
+    from src.analysis.injury_impact import InjuryImpactAnalyzer
+    from src.data_collection import roster_sync
+    from src.data_collection.fetch_2025_espn import ESPN2025Fetcher
+    from src.data_collection.smart_injury_updater import EXISTING_INJURIES_QUERY
+    from src.models.advanced_predictor import AdvancedNFLPredictor
+    from src.models.game_predictor import NFLGamePredictor
+    from src.models.master_betting_predictor import MasterBettingPredictor
+
+    return [
+        ('training games (game_predictor)',
+         *NFLGamePredictor._training_games_query([season - 1, season], week - 1)),
+        ('current stats (master_betting_predictor)',
+         *MasterBettingPredictor._current_stats_query(team_abbr, season, week)),
+        ('historical stats (master_betting_predictor)',
+         *MasterBettingPredictor._historical_query(team_abbr)),
+        ('QB performance (advanced_predictor)', AdvancedNFLPredictor.QB_QUERY, (team_id, season, week)),
+        ('rushing performance (advanced_predictor)', AdvancedNFLPredictor.RUSH_QUERY, (team_id, season, week)),
+        ('key player snaps (advanced_predictor)', AdvancedNFLPredictor.SNAP_QUERY, (team_id, season, week)),
+        ('pass defense (defensive_rankings)', *DefensiveRankings._pass_defense_query(season, week - 1)),
+        ('run defense (defensive_rankings)', *DefensiveRankings._run_defense_query(season, week - 1)),
+        ('points allowed (defensive_rankings)', *DefensiveRankings._points_allowed_query(season, week - 1)),
+        ('team injuries (injury_impact)',
+         InjuryImpactAnalyzer.TEAM_INJURIES_QUERY, (season, week, team_abbr, season)),
+        ('player importance (injury_impact)', InjuryImpactAnalyzer.IMPORTANCE_QUERY, (player_id,)),
+        ('player depth (injury_impact)', InjuryImpactAnalyzer.DEPTH_QUERY, (player_id,)),
+        ('existing injuries (smart_injury_updater)', EXISTING_INJURIES_QUERY, ()),
+        ('game lookup (fetch_2025_espn)', ESPN2025Fetcher.GAME_ID_QUERY, (season, week, team_id, team_id + 1)),
+        ('new players (roster_sync)', roster_sync.NEW_PLAYERS_QUERY, ()),
+        ('player ids (roster_sync)', roster_sync.PLAYER_IDS_QUERY, ()),
+        ('roster changes (roster_sync)', roster_sync.CHANGES_QUERY, (season,)),
+        ('player_seasons upsert (roster_sync)', roster_sync.UPSERT_QUERY, (season,)),
+    ]
+
+
+class IndexAdvisor:
+    """Check, create and EXPLAIN-verify the hot-query indexes"""
+
+    def __init__(self, db=None):
+        self.db = db or DatabaseManager()
+        self.dialect = self.db.backend.dialect
+
+    def existing_indexes(self, table):
+        """{index name: (columns in order)} for a table"""
+        if self.dialect == 'mysql':
+            rows = self.db.execute_query(f"SHOW INDEX FROM {table}")
+            indexes = {}
+            for row in sorted(rows, key=lambda r: (r['Key_name'], r['Seq_in_index'])):
+                indexes.setdefault(row['Key_name'], []).append(row['Column_name'])
+            return {name: tuple(cols) for name, cols in indexes.items()}
+
+        if self.dialect == 'sqlite':
+            indexes = {}
+            for index in self.db.execute_query(f"PRAGMA index_list({table})"):
+                info = self.db.execute_query(f"PRAGMA index_info({index['name']})")
+                indexes[index['name']] = tuple(c['name'] for c in sorted(info, key=lambda c: c['seqno']))
+            return indexes
+
+        rows = self.db.execute_query(
+            "SELECT index_name, expressions FROM duckdb_indexes() WHERE table_name = %s", (table,)
+        )
+        return {r['index_name']: tuple(re.findall(r'\w+', str(r['expressions']))) for r in rows}
+
+    def missing_indexes(self):
+        """Recommended indexes not already served by an index with the same leading columns"""
+        missing = []
+        cache = {}
+        for table, name, columns in RECOMMENDED_INDEXES:
+            if table not in cache:
+                cache[table] = self.existing_indexes(table)
+            if not any(cols[:len(columns)] == columns for cols in cache[table].values()):
+                missing.append((table, name, columns))
+        return missing
+
+    def ensure_indexes(self, dry_run=False):
+        """Create any missing recommended index; returns the ones created (or that would be)"""
+        missing = self.missing_indexes()
+        for table, name, columns in missing:
+            print(f"  {'Would create' if dry_run else 'Creating'} {table}.{name} ({', '.join(columns)})")
+            if not dry_run:
+                # Embedded backends namespace index names per table, like translate_ddl
+                index_name = name if self.dialect == 'mysql' else f"{table}_{name}"
+                self.db.execute_update(f"CREATE INDEX {index_name} ON {table} ({', '.join(columns)})")
+        if not missing:
+            print("  ✓ All recommended indexes present")
+        return missing
+
+    def explain(self, sql, params=(), query=None):
+        """
+        Return [(table, access, detail)] for each table access in the plan;
+        access is 'full scan', 'index scan' or 'index lookup'. query runs the
+        EXPLAIN (default db.execute_query; a session's query for temp tables)
+        """
+        query = query or self.db.execute_query
+        if self.dialect == 'mysql':
+            accesses = []
+            for row in query("EXPLAIN " + sql, params):
+                kind = {'ALL': 'full scan', 'index': 'index scan'}.get(row['type'], 'index lookup')
+                accesses.append((row['table'], kind, f"key={row['key']} rows={row['rows']}"))
+            return accesses
+
+        if self.dialect == 'sqlite':
+            accesses = []
+            for row in query("EXPLAIN QUERY PLAN " + sql, params):
+                detail = row['detail']
+                match = re.match(r'(SCAN|SEARCH) (\w+)', detail)
+                if not match:
+                    continue
+                if match.group(1) == 'SEARCH':
+                    kind = 'index lookup'
+                elif 'INDEX' in detail:
+                    kind = 'index scan'
+                else:
+                    kind = 'full scan'
+                accesses.append((match.group(2), kind, detail))
+            return accesses
+
+        # DuckDB scans columnar segments with zone maps; indexes only serve constraints
+        return []
+
+    def report_full_scans(self, queries=None):
+        """
+        EXPLAIN every hot query and print the ones that scan whole tables
+
+        Runs in one session with an empty roster stage table, since the
+        roster sync statements read from that temporary table
+        """
+        from src.data_collection.roster_sync import STAGE_DDL, STAGE_TABLE
+
+        findings = []
+        with self.db.session() as session:
+            session.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+            session.execute(STAGE_DDL)
+            for label, sql, params in queries or hot_queries():
+                scans = [a for a in self.explain(sql, params, session.query)
+                         if a[1] == 'full scan' and a[0] not in SMALL_TABLES]
+                status = "⚠️ " if scans else "✓ "
+                print(f"  {status}{label}")
+                for table, kind, detail in scans:
+                    print(f"       {kind} on {table}: {detail}")
+                findings.extend((label, table, detail) for table, kind, detail in scans)
+            session.execute(f"DROP TABLE {STAGE_TABLE}")
+        return findings
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Check and create indexes for the hot query predicates')
+    parser.add_argument('--dry-run', action='store_true', help='Report missing indexes without creating them')
+    args = parser.parse_args(argv)
+
+    advisor = IndexAdvisor()
+
+    print("=" * 70)
+    print("INDEX ADVISOR")
+    print("=" * 70)
+
+    print("\n📇 Recommended indexes:")
+    advisor.ensure_indexes(dry_run=args.dry_run)
+
+    print("\n🔍 EXPLAIN on hot queries:")
+    findings = advisor.report_full_scans()
+
+    print("\n" + "=" * 70)
+    if findings:
+        print(f"⚠️  {len(findings)} full table scans remaining")
+    else:
+        print("✓ No full scans on hot queries")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Ingest State
+Per (source, season, week) watermark of the last successful fetch: content
+hash, rows written and whether the week was Final. Collectors ask it which
+weeks still need work (missing, not yet Final) and skip the writes for a
+refetched week whose content hash hasn't changed
+"""
+import hashlib
+import json
+
+from src.database.db_manager import DatabaseManager
+
+INGEST_STATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS ingest_state (
+        source VARCHAR(50) NOT NULL,
+        season INT NOT NULL,
+        week INT NOT NULL,
+        content_hash CHAR(64),
+        row_count INT NOT NULL DEFAULT 0,
+        is_final TINYINT NOT NULL DEFAULT 0,
+        fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (source, season, week)
+    )
+"""
+
+
+def content_hash(payload):
+    """SHA-256 of a JSON-serializable payload (dict keys sorted, dates as strings)"""
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def frame_hash(frame):
+    """SHA-256 over a DataFrame's row hashes (column order and values, not the index)"""
+    import pandas as pd
+    rows = pd.util.hash_pandas_object(frame, index=False).values
+    return hashlib.sha256(','.join(frame.columns).encode() + rows.tobytes()).hexdigest()
+
+
+class IngestState:
+    """Read and write ingest watermarks"""
+
+    def __init__(self, db=None):
+        self.db = db or DatabaseManager()
+        self.db.execute_update(INGEST_STATE_TABLE)
+
+    def weeks(self, source, season):
+        """{week: state row} recorded for a source and season"""
+        rows = self.db.execute_query("""
+            SELECT week, content_hash, row_count, is_final, fetched_at
+            FROM ingest_state
+            WHERE source = %s AND season = %s
+        """, (source, season))
+        return {row['week']: row for row in rows}
+
+    def pending_weeks(self, source, season, weeks, force=False):
+        """The weeks in weeks that are missing or not yet Final (all of them with force)"""
+        if force:
+            return list(weeks)
+        recorded = self.weeks(source, season)
+        return [week for week in weeks if not (week in recorded and recorded[week]['is_final'])]
+
+    def final_weeks(self, source, season):
+        """Sorted weeks recorded as Final"""
+        return sorted(week for week, row in self.weeks(source, season).items() if row['is_final'])
+
+    def last_final_week(self, source, season):
+        """Highest week W such that weeks 1..W are all recorded Final (0 if none)"""
+        final = set(self.final_weeks(source, season))
+        week = 0
+        while week + 1 in final:
+            week += 1
+        return week
+
+    def is_unchanged(self, source, season, week, digest):
+        """True when the week was recorded before with this content hash"""
+        rows = self.db.execute_query("""
+            SELECT content_hash FROM ingest_state
+            WHERE source = %s AND season = %s AND week = %s
+        """, (source, season, week))
+        return bool(rows) and rows[0]['content_hash'] == digest
+
+    def record(self, source, season, week, digest, row_count, is_final):
+        """Save the watermark for a successfully processed week"""
+        self.db.execute_update("""
+            INSERT INTO ingest_state (source, season, week, content_hash, row_count, is_final, fetched_at)
+            VALUES (%s, %s, %s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE
+                content_hash = VALUES(content_hash),
+                row_count = VALUES(row_count),
+                is_final = VALUES(is_final),
+                fetched_at = NOW()
+        """, (source, season, week, digest, row_count, int(bool(is_final))))
+
+    def touch(self, source, season, week, is_final):
+        """Refetched with unchanged content: only move fetched_at (and finality)"""
+        self.db.execute_update("""
+            UPDATE ingest_state SET fetched_at = NOW(), is_final = %s
+            WHERE source = %s AND season = %s AND week = %s
+        """, (int(bool(is_final)), source, season, week))
+
+    def reset(self, source, season=None):
+        """Forget a source's watermarks (optionally one season) so the next run refetches"""
+        if season is None:
+            return self.db.execute_update("DELETE FROM ingest_state WHERE source = %s", (source,))
+        return self.db.execute_update(
+            "DELETE FROM ingest_state WHERE source = %s AND season = %s", (source, season)
+        )
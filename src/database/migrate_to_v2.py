@@ -1,15 +1,130 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import time
 
-from database.db_manager import DatabaseManager
-import pymysql
+from src.database.db_manager import DatabaseManager
+from src.database.index_advisor import IndexAdvisor
+
+CHUNK_SIZE = 2000
+
+# One row per migration step; written in the same transaction as the chunk it
+# describes, so a crash never loses or repeats a committed chunk
+CHECKPOINT_TABLE = """
+    CREATE TABLE IF NOT EXISTS migration_checkpoints (
+        step VARCHAR(50) PRIMARY KEY,
+        last_id INT NOT NULL DEFAULT 0,
+        migrated INT NOT NULL DEFAULT 0,
+        skipped INT NOT NULL DEFAULT 0,
+        completed TINYINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
 
 class SchemaV2Migration:
     """Migrate from V1 to V2 schema with multi-season support"""
     
-    def __init__(self):
+    def __init__(self, chunk_size=CHUNK_SIZE):
         self.db = DatabaseManager()
+        self.chunk_size = chunk_size
+    
+    def _count_rows(self, table):
+        return self.db.execute_query(f"SELECT COUNT(*) as count FROM {table}")[0]['count']
+    
+    def get_checkpoint(self, step):
+        """Saved progress for a step (last migrated primary key and counters)"""
+        rows = self.db.execute_query("SELECT * FROM migration_checkpoints WHERE step = %s", (step,))
+        return rows[0] if rows else {'step': step, 'last_id': 0, 'migrated': 0, 'skipped': 0, 'completed': 0}
+    
+    def reset_checkpoints(self):
+        self.db.execute_update(CHECKPOINT_TABLE)
+        self.db.execute_update("DELETE FROM migration_checkpoints")
+    
+    def _table_exists(self, table):
+        try:
+            self.db.execute_query(f"SELECT 1 FROM {table} LIMIT 1")
+            return True
+        except Exception:
+            return False
+
+    def mark_completed(self, step):
+        """Record a one-shot step (backup, schema) as done"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self._save_checkpoint(cursor, {'step': step, 'last_id': 0, 'migrated': 0,
+                                               'skipped': 0, 'completed': 1})
+
+    def _save_checkpoint(self, cursor, checkpoint):
+        cursor.execute("""
+            INSERT INTO migration_checkpoints (step, last_id, migrated, skipped, completed)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                last_id = VALUES(last_id),
+                migrated = VALUES(migrated),
+                skipped = VALUES(skipped),
+                completed = VALUES(completed)
+        """, (checkpoint['step'], checkpoint['last_id'], checkpoint['migrated'],
+              checkpoint['skipped'], checkpoint['completed']))
+    
+    def migrate_in_chunks(self, step, table, pk, write_chunk):
+        """
+        Stream table in primary-key order (keyset pagination) and hand each chunk
+        to write_chunk(cursor, rows) -> (migrated, skipped)
+        
+        The chunk's writes and its checkpoint commit together; a rerun picks
+        up after the last committed chunk
+        """
+        checkpoint = self.get_checkpoint(step)
+        if checkpoint['completed']:
+            print(f"✓ {step} already migrated ({checkpoint['migrated']} rows) - skipping")
+            return checkpoint
+        
+        total = self._count_rows(table)
+        if checkpoint['last_id']:
+            print(f"♻️  Resuming {step} after {pk} {checkpoint['last_id']} "
+                  f"({checkpoint['migrated']} migrated so far)")
+        print(f"Found {total} {step} records to migrate")
+        
+        done = self.db.execute_query(
+            f"SELECT COUNT(*) as count FROM {table} WHERE {pk} <= %s", (checkpoint['last_id'],)
+        )[0]['count']
+        chunk_number = 0
+        
+        while True:
+            started = time.perf_counter()
+            rows = self.db.execute_query(
+                f"SELECT * FROM {table} WHERE {pk} > %s ORDER BY {pk} LIMIT %s",
+                (checkpoint['last_id'], self.chunk_size)
+            )
+            if not rows:
+                break
+            
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    migrated, skipped = write_chunk(cursor, rows)
+                    checkpoint['last_id'] = rows[-1][pk]
+                    checkpoint['migrated'] += migrated
+                    checkpoint['skipped'] += skipped
+                    self._save_checkpoint(cursor, checkpoint)
+            
+            chunk_number += 1
+            done += len(rows)
+            elapsed = time.perf_counter() - started
+            print(f"  Chunk {chunk_number}: {len(rows)} rows in {elapsed:.2f}s "
+                  f"({len(rows) / max(elapsed, 1e-6):,.0f} rows/s) - {done}/{total}")
+        
+        checkpoint['completed'] = 1
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self._save_checkpoint(cursor, checkpoint)
+        
+        return checkpoint
+    
+    def load_player_mapping(self):
+        """Old (backup) player_id -> new player_id, matched on name and position"""
+        rows = self.db.execute_query("""
+            SELECT b.player_id as old_id, p.player_id as new_id
+            FROM players_backup_v1 b
+            JOIN players p ON p.name = b.name AND p.position = b.position
+        """)
+        return {r['old_id']: r['new_id'] for r in rows}
         
     def backup_existing_data(self):
         """Create backup tables before migration"""
@@ -19,11 +134,18 @@ class SchemaV2Migration:
         
         tables_to_backup = ['players', 'injuries', 'depth_charts']
         
+        # Never overwrite a backup: after the V2 tables are created it is the
+        # only copy of the V1 data
+        existing = [f"{t}_backup_v1" for t in tables_to_backup if self._table_exists(f"{t}_backup_v1")]
+        if existing:
+            print(f"✗ {', '.join(existing)} already exist from an earlier run")
+            print("  Verify them and drop them by hand before backing up again")
+            return False
+        
         for table in tables_to_backup:
             backup_table = f"{table}_backup_v1"
             
             try:
-                self.db.execute_update(f"DROP TABLE IF EXISTS {backup_table}")
                 self.db.execute_update(f"CREATE TABLE {backup_table} AS SELECT * FROM {table}")
                 
                 count = self.db.execute_query(f"SELECT COUNT(*) as count FROM {backup_table}")
@@ -69,67 +191,56 @@ class SchemaV2Migration:
         print("STEP 3: MIGRATING PLAYER DATA")
         print("="*70)
         
-        old_players = self.db.execute_query("SELECT * FROM players_backup_v1")
-        print(f"Found {len(old_players)} player records to migrate")
+        known = {
+            (r['name'], r['position']): r['player_id']
+            for r in self.db.execute_query("SELECT player_id, name, position FROM players")
+        }
+        season_guess = 2024
         
-        player_mapping = {}
-        migrated = 0
-        skipped = 0
+        def write_chunk(cursor, rows):
+            inserted = 0
+            new_players = {}
+            for old_player in rows:
+                key = (old_player['name'], old_player['position'])
+                if key not in known and key not in new_players:
+                    new_players[key] = (old_player['name'], old_player['position'], old_player['height'],
+                                        old_player['weight'], old_player['college'])
+            
+            if new_players:
+                cursor.execute("SELECT COALESCE(MAX(player_id), 0) as max_id FROM players")
+                max_id = cursor.fetchone()['max_id']
+                cursor.executemany("""
+                    INSERT IGNORE INTO players (name, position, height, weight, college)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, list(new_players.values()))
+                # Count the rows that actually landed: INSERT IGNORE skips
+                # players a previous (resumed) run already created
+                cursor.execute("SELECT player_id, name, position FROM players WHERE player_id > %s", (max_id,))
+                created = cursor.fetchall()
+                inserted = len(created)
+                for r in created:
+                    known[(r['name'], r['position'])] = r['player_id']
+            
+            seasons = [
+                (known[(p['name'], p['position'])], season_guess, p['team_id'], p['position'],
+                 p['jersey_number'], p['age'], p['years_in_league'], p['status'])
+                for p in rows
+                if p['team_id'] and (p['name'], p['position']) in known
+            ]
+            if seasons:
+                cursor.executemany("""
+                    INSERT IGNORE INTO player_seasons 
+                    (player_id, season, team_id, position, jersey_number, age, years_in_league, status)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """, seasons)
+            
+            return inserted, len(rows) - len(seasons)
         
-        for old_player in old_players:
-            try:
-                existing = self.db.execute_query(
-                    "SELECT player_id FROM players WHERE name = %s AND position = %s",
-                    (old_player['name'], old_player['position'])
-                )
-                
-                if existing:
-                    new_player_id = existing[0]['player_id']
-                else:
-                    new_player_id = self.db.execute_insert("""
-                        INSERT INTO players (name, position, height, weight, college)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (
-                        old_player['name'],
-                        old_player['position'],
-                        old_player['height'],
-                        old_player['weight'],
-                        old_player['college']
-                    ))
-                    migrated += 1
-                
-                player_mapping[old_player['player_id']] = new_player_id
-                
-                if old_player['team_id']:
-                    season_guess = 2024
-                    
-                    try:
-                        self.db.execute_insert("""
-                            INSERT INTO player_seasons 
-                            (player_id, season, team_id, position, jersey_number, age, years_in_league, status)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        """, (
-                            new_player_id,
-                            season_guess,
-                            old_player['team_id'],
-                            old_player['position'],
-                            old_player['jersey_number'],
-                            old_player['age'],
-                            old_player['years_in_league'],
-                            old_player['status']
-                        ))
-                    except pymysql.err.IntegrityError:
-                        skipped += 1
-                
-                if migrated % 500 == 0:
-                    print(f"  Progress: {migrated} unique players created...")
-                    
-            except Exception as e:
-                if "Duplicate entry" not in str(e):
-                    print(f"  Error migrating {old_player['name']}: {e}")
+        checkpoint = self.migrate_in_chunks('players', 'players_backup_v1', 'player_id', write_chunk)
+        player_mapping = self.load_player_mapping()
         
-        print(f"\n✓ Migrated {migrated} unique players")
-        print(f"✓ Created player_season records (skipped {skipped} duplicates)")
+        print(f"\n✓ Migrated {checkpoint['migrated']} unique players")
+        print(f"✓ Created player_season records (skipped {checkpoint['skipped']} without a team)")
         print(f"✓ Player ID mapping created: {len(player_mapping)} entries")
         
         return player_mapping
@@ -140,53 +251,33 @@ class SchemaV2Migration:
         print("STEP 4: MIGRATING INJURY DATA")
         print("="*70)
         
-        old_injuries = self.db.execute_query("SELECT * FROM injuries_backup_v1")
-        print(f"Found {len(old_injuries)} injury records to migrate")
-        
-        migrated = 0
-        skipped = 0
-        
-        for old_injury in old_injuries:
-            try:
-                old_player_id = old_injury['player_id']
-                new_player_id = player_mapping.get(old_player_id)
-                
+        def write_chunk(cursor, rows):
+            inserts = []
+            for old_injury in rows:
+                new_player_id = player_mapping.get(old_injury['player_id'])
                 if not new_player_id:
-                    skipped += 1
                     continue
-                
                 date_reported = old_injury['date_reported']
                 season = date_reported.year if date_reported else 2024
-                
-                self.db.execute_insert("""
+                inserts.append((
+                    new_player_id, season, old_injury['game_id'], old_injury['injury_status'],
+                    old_injury['body_part'], old_injury['date_reported'], old_injury['expected_return_date'],
+                    old_injury['practice_status'], old_injury['notes']
+                ))
+            
+            if inserts:
+                cursor.executemany("""
                     INSERT INTO injuries 
                     (player_id, season, game_id, injury_status, body_part, 
                      date_reported, expected_return_date, practice_status, notes)
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    new_player_id,
-                    season,
-                    old_injury['game_id'],
-                    old_injury['injury_status'],
-                    old_injury['body_part'],
-                    old_injury['date_reported'],
-                    old_injury['expected_return_date'],
-                    old_injury['practice_status'],
-                    old_injury['notes']
-                ))
-                
-                migrated += 1
-                
-                if migrated % 500 == 0:
-                    print(f"  Progress: {migrated} injuries migrated...")
-                    
-            except Exception as e:
-                if "Duplicate entry" not in str(e):
-                    print(f"  Error migrating injury: {e}")
-                skipped += 1
+                """, inserts)
+            return len(inserts), len(rows) - len(inserts)
+        
+        checkpoint = self.migrate_in_chunks('injuries', 'injuries_backup_v1', 'injury_id', write_chunk)
         
-        print(f"\n✓ Migrated {migrated} injury records")
-        print(f"✓ Skipped {skipped} records")
+        print(f"\n✓ Migrated {checkpoint['migrated']} injury records")
+        print(f"✓ Skipped {checkpoint['skipped']} records")
     
     def migrate_depth_charts_data(self, player_mapping):
         """Migrate depth charts from V1 to V2"""
@@ -194,55 +285,54 @@ class SchemaV2Migration:
         print("STEP 5: MIGRATING DEPTH CHART DATA")
         print("="*70)
         
+        def write_chunk(cursor, rows):
+            inserts = [
+                (entry['team_id'], player_mapping[entry['player_id']], entry.get('season', 2024),
+                 entry.get('week', 1), entry['position'], entry.get('depth_order', 99),
+                 entry.get('snap_percentage', 0))
+                for entry in rows
+                if entry['player_id'] in player_mapping
+            ]
+            if not inserts:
+                return 0, len(rows)
+            # Duplicate (player, season, week) rows are ignored, not counted;
+            # executemany's rowcount is the attempted rows on some backends,
+            # so count the table inside the chunk's transaction instead
+            cursor.execute("SELECT COUNT(*) as count FROM depth_charts")
+            before = cursor.fetchone()['count']
+            cursor.executemany("""
+                INSERT IGNORE INTO depth_charts 
+                (team_id, player_id, season, week, position, depth_order, snap_percentage)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, inserts)
+            cursor.execute("SELECT COUNT(*) as count FROM depth_charts")
+            written = cursor.fetchone()['count'] - before
+            return written, len(rows) - written
+        
         try:
-            old_depth = self.db.execute_query("SELECT * FROM depth_charts_backup_v1")
-            print(f"Found {len(old_depth)} depth chart records to migrate")
-            
-            migrated = 0
-            skipped = 0
-            
-            for old_entry in old_depth:
-                try:
-                    old_player_id = old_entry['player_id']
-                    new_player_id = player_mapping.get(old_player_id)
-                    
-                    if not new_player_id:
-                        skipped += 1
-                        continue
-                    
-                    self.db.execute_insert("""
-                        INSERT INTO depth_charts 
-                        (team_id, player_id, season, week, position, depth_order, snap_percentage)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """, (
-                        old_entry['team_id'],
-                        new_player_id,
-                        old_entry.get('season', 2024),
-                        old_entry.get('week', 1),
-                        old_entry['position'],
-                        old_entry.get('depth_order', 99),
-                        old_entry.get('snap_percentage', 0)
-                    ))
-                    
-                    migrated += 1
-                    
-                except pymysql.err.IntegrityError:
-                    skipped += 1
-                except Exception as e:
-                    if "Duplicate entry" not in str(e):
-                        print(f"  Error migrating depth chart entry: {e}")
-                    skipped += 1
-            
-            print(f"\n✓ Migrated {migrated} depth chart records")
-            print(f"✓ Skipped {skipped} records")
+            checkpoint = self.migrate_in_chunks('depth_charts', 'depth_charts_backup_v1', 'depth_chart_id', write_chunk)
+            print(f"\n✓ Migrated {checkpoint['migrated']} depth chart records")
+            print(f"✓ Skipped {checkpoint['skipped']} records")
             
         except Exception as e:
             print(f"No depth chart data to migrate: {e}")
     
+    def ensure_indexes(self):
+        """Create the composite indexes the hot queries rely on (idempotent)"""
+        print("\n" + "="*70)
+        print("STEP 6: HOT-QUERY INDEXES")
+        print("="*70)
+        
+        advisor = IndexAdvisor(self.db)
+        advisor.ensure_indexes()
+        
+        print("\nEXPLAIN on hot queries:")
+        advisor.report_full_scans()
+    
     def verify_migration(self):
         """Verify the migration was successful"""
         print("\n" + "="*70)
-        print("STEP 6: VERIFICATION")
+        print("STEP 7: VERIFICATION")
         print("="*70)
         
         tables = {
@@ -282,13 +372,25 @@ class SchemaV2Migration:
             print("Migration cancelled.")
             return
         
-        if not self.backup_existing_data():
-            print("\n✗ Backup failed. Migration aborted.")
-            return
-        
-        if not self.create_new_tables():
-            print("\n✗ Table creation failed. Migration aborted.")
-            return
+        # The backup and schema steps are checkpointed as soon as they finish:
+        # rerunning them after the V2 tables exist would back up the empty
+        # new tables over the V1 copy (or drop migrated rows)
+        self.db.execute_update(CHECKPOINT_TABLE)
+        if self.get_checkpoint('schema')['completed']:
+            print("\n♻️  Found migration checkpoints - resuming (use --reset to start over)")
+        else:
+            if self.get_checkpoint('backup')['completed']:
+                print("\n♻️  V1 data already backed up - skipping the backup step")
+            else:
+                if not self.backup_existing_data():
+                    print("\n✗ Backup failed. Migration aborted.")
+                    return
+                self.mark_completed('backup')
+            
+            if not self.create_new_tables():
+                print("\n✗ Table creation failed. Migration aborted.")
+                return
+            self.mark_completed('schema')
         
         player_mapping = self.migrate_players_data()
         
@@ -296,6 +398,8 @@ class SchemaV2Migration:
         
         self.migrate_depth_charts_data(player_mapping)
         
+        self.ensure_indexes()
+        
         self.verify_migration()
         
         print("\n" + "="*70)
@@ -310,6 +414,18 @@ class SchemaV2Migration:
         print("  - injuries_backup_v1")
         print("  - depth_charts_backup_v1")
 
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Migrate the database to the V2 multi-season schema')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows per batch/checkpoint')
+    parser.add_argument('--reset', action='store_true', help='Discard checkpoints and start from scratch (drop the *_backup_v1 tables first)')
+    args = parser.parse_args(argv)
+    
+    migration = SchemaV2Migration(chunk_size=args.chunk_size)
+    if args.reset:
+        migration.reset_checkpoints()
+    migration.run_migration()
+
+
 if __name__ == "__main__":
-    migration = SchemaV2Migration()
-    migration.run_migration()
\ No newline at end of file
+    main()
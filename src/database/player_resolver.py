@@ -0,0 +1,265 @@
+"""
+Player Resolver
+One name -> player_id index shared by the collectors. Built from a single
+query into typed arrays grouped by interned name key, so resolving a whole
+feed (tens of thousands of rows) is in-memory work with a miss report at the
+end instead of a query per name
+"""
+import re
+from array import array
+from collections import Counter
+
+# Reasons a name did not resolve
+UNKNOWN = 'unknown'
+AMBIGUOUS = 'ambiguous'
+
+_SUFFIXES = re.compile(r'\s+(?:jr|sr|ii|iii|iv|v)\.?$', re.I)
+_PUNCTUATION = re.compile(r"[.'`’]")
+
+
+def normalize_name(name):
+    """Lowercased name without suffixes or middle initials ('A.J. Brown Jr.' -> 'a.j. brown')"""
+    name = name.replace(' Jr.', '').replace(' Sr.', '')
+    name = name.replace(' II', '').replace(' III', '').replace(' IV', '')
+    parts = name.split()
+    if len(parts) == 3 and len(parts[1]) <= 2:
+        name = f"{parts[0]} {parts[2]}"
+    return name.strip().lower()
+
+
+def name_key(name):
+    """
+    Index key every feed's spelling of a name reduces to
+
+    Suffix-stripped, middle initial dropped, lowercased and without periods or
+    apostrophes, so 'A.J. Brown', 'AJ Brown' and 'A.J. Brown Jr.' share a key
+    """
+    name = _SUFFIXES.sub('', ' '.join(name.split()))
+    name = _PUNCTUATION.sub('', normalize_name(name))
+    return ' '.join(name.split())
+
+
+class PlayerResolver:
+    """
+    Array-backed player index
+
+    Rows (one per player-season, or per player without seasons) are sorted by
+    name key; offsets[key] .. offsets[key + 1] is the slice of candidates for
+    a key. Team, season and position narrow the candidates when given and
+    matched; the exact display name breaks remaining ties
+    """
+
+    def __init__(self, rows=()):
+        self._keys = {}          # name key -> code
+        self._exact = {}         # lowercased display name -> code
+        self._positions = {}     # position -> code
+        self._identity = {}      # player_id -> (key code, exact code, position code)
+        self._pending = {}       # (player_id, season) -> row added since the arrays were built
+        self._pending_keys = set()
+        self._build(rows)
+
+    @classmethod
+    def load(cls, db, seasons=None, active_only=False):
+        """
+        Build the index in one query
+
+        Args:
+            seasons: Only players with a player_seasons row in these seasons
+                     (default: every player, with every season they have)
+            active_only: Only roster_status = 'Active' player-seasons
+        """
+        conditions, params = [], []
+        if seasons:
+            conditions.append(f"ps.season IN ({','.join(['%s'] * len(seasons))})")
+            params.extend(seasons)
+        if active_only:
+            conditions.append("ps.roster_status = 'Active'")
+        join = 'JOIN' if conditions else 'LEFT JOIN'
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        query = f"""
+            SELECT p.player_id, p.name, p.position, ps.season, ps.team_id
+            FROM players p
+            {join} player_seasons ps ON p.player_id = ps.player_id
+            {where}
+        """
+        rows = []
+        for chunk in db.iter_query(query, tuple(params), chunk_size=20000, output='tuples'):
+            rows.extend(chunk)
+        return cls(rows)
+
+    # ---- index -------------------------------------------------------------
+
+    @staticmethod
+    def _code(table, value):
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(table)
+        return code
+
+    def _encode(self, player_id, name, position):
+        identity = (
+            self._code(self._keys, name_key(name)),
+            self._code(self._exact, name.strip().lower()),
+            -1 if position is None else self._code(self._positions, position),
+        )
+        self._identity[player_id] = identity
+        return identity
+
+    def _build(self, rows):
+        encoded = []
+        for player_id, name, position, season, team_id in rows:
+            if not name:
+                continue
+            key, exact, pos = self._encode(player_id, name, position)
+            encoded.append((key, player_id, season or 0, -1 if team_id is None else team_id, pos, exact))
+        self._store(encoded)
+
+    def _store(self, encoded):
+        """Sort encoded rows by key into the typed arrays and key offsets"""
+        encoded.sort()
+        self._player_ids = array('q', (r[1] for r in encoded))
+        self._seasons = array('h', (r[2] for r in encoded))
+        self._team_ids = array('i', (r[3] for r in encoded))
+        self._position_codes = array('i', (r[4] for r in encoded))
+        self._exact_codes = array('i', (r[5] for r in encoded))
+
+        offsets = array('i', [0]) * (len(self._keys) + 1)
+        for r in encoded:
+            offsets[r[0] + 1] += 1
+        for i in range(1, len(offsets)):
+            offsets[i] += offsets[i - 1]
+        self._offsets = offsets
+        self._pending.clear()
+        self._pending_keys.clear()
+
+    def _rows(self):
+        """Every indexed row as (key, player_id, season, team_id, position, exact), pending included"""
+        rows = []
+        for key in range(len(self._offsets) - 1):
+            for i in range(self._offsets[key], self._offsets[key + 1]):
+                row = (key, self._player_ids[i], self._seasons[i], self._team_ids[i],
+                       self._position_codes[i], self._exact_codes[i])
+                if (row[1], row[2]) not in self._pending:
+                    rows.append(row)
+        return rows + list(self._pending.values())
+
+    def __len__(self):
+        """Distinct players indexed"""
+        return len(self._identity)
+
+    def add(self, player_id, name=None, season=None, team_id=None, position=None):
+        """
+        Index a player (-season) written after the resolver was built
+
+        A later row for the same player and season replaces the earlier one
+        (a trade or release); name and position default to what is indexed
+        """
+        if name is not None:
+            identity = self._encode(player_id, name, position)
+        else:
+            identity = self._identity.get(player_id)
+            if identity is None:
+                return False
+        key, exact, pos = identity
+        season = season or 0
+        self._pending[(player_id, season)] = (
+            key, player_id, season, -1 if team_id is None else team_id, pos, exact
+        )
+        self._pending_keys.add(key)
+        if len(self._pending) > 5000:
+            self._store(self._rows())
+        return True
+
+    # ---- resolution --------------------------------------------------------
+
+    def _candidates(self, key):
+        """[(player_id, season, team_id, position, exact)] for a key code"""
+        candidates = []
+        if key < len(self._offsets) - 1:
+            start, end = self._offsets[key], self._offsets[key + 1]
+            candidates = [
+                (player_id, season, team_id, pos, exact)
+                for player_id, season, team_id, pos, exact in zip(
+                    self._player_ids[start:end], self._seasons[start:end], self._team_ids[start:end],
+                    self._position_codes[start:end], self._exact_codes[start:end])
+                if (player_id, season) not in self._pending
+            ]
+        if key in self._pending_keys:
+            candidates.extend(r[1:] for r in self._pending.values() if r[0] == key)
+        return candidates
+
+    def _choose(self, name, team_id, season, position):
+        """player_id, or UNKNOWN / AMBIGUOUS"""
+        key = self._keys.get(name_key(name))
+        if key is None:
+            return UNKNOWN
+        candidates = self._candidates(key)
+        if not candidates:
+            return UNKNOWN
+
+        position_code = self._positions.get(position, -2) if position is not None else None
+        for column, value in ((1, season), (2, team_id), (3, position_code)):
+            if value is None:
+                continue
+            narrowed = [c for c in candidates if c[column] == value]
+            if narrowed:
+                candidates = narrowed
+
+        player_ids = {c[0] for c in candidates}
+        if len(player_ids) == 1:
+            return candidates[0][0]
+        exact = self._exact.get(name.strip().lower())
+        player_ids = {c[0] for c in candidates if c[4] == exact}
+        if len(player_ids) == 1:
+            return player_ids.pop()
+        return AMBIGUOUS
+
+    def resolve(self, name, team_id=None, season=None, position=None):
+        """player_id for one name, or None if it is unknown or ambiguous"""
+        if not name:
+            return None
+        found = self._choose(name, team_id, season, position)
+        return None if found in (UNKNOWN, AMBIGUOUS) else found
+
+    def resolve_many(self, names, team_ids=None, seasons=None, positions=None):
+        """
+        Resolve a batch of names (with optional parallel team/season/position lists)
+
+        Returns (player_ids, misses): player_ids lines up with names (None for
+        misses) and misses is a Counter of (name, reason) -> occurrences
+        """
+        count = len(names)
+        team_ids = team_ids if team_ids is not None else [None] * count
+        seasons = seasons if seasons is not None else [None] * count
+        positions = positions if positions is not None else [None] * count
+
+        player_ids = []
+        misses = Counter()
+        seen = {}
+        for name, team_id, season, position in zip(names, team_ids, seasons, positions):
+            if not name or name != name:   # None / NaN
+                player_ids.append(None)
+                continue
+            lookup = (name, team_id, season, position)
+            found = seen.get(lookup)
+            if found is None:
+                found = seen[lookup] = self._choose(name, team_id, season, position)
+            if found in (UNKNOWN, AMBIGUOUS):
+                misses[(name, found)] += 1
+                player_ids.append(None)
+            else:
+                player_ids.append(found)
+        return player_ids, misses
+
+
+def print_misses(misses, top=10):
+    """Summarize a resolve_many miss report"""
+    if not misses:
+        return
+    by_reason = Counter()
+    for (_, reason), count in misses.items():
+        by_reason[reason] += count
+    print(f"  ⚠️  {sum(misses.values())} unresolved player rows "
+          f"({', '.join(f'{count} {reason}' for reason, count in by_reason.items())})")
+    for (name, reason), count in misses.most_common(top):
+        print(f"     {name:<28} {reason:<10} x{count}")
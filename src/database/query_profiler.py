@@ -0,0 +1,227 @@
+"""
+Query Profiler
+Records every DatabaseManager call while active: call site, SQL fingerprint,
+latency and rows. Statements slower than DB_SLOW_QUERY_MS (or a profile's own
+threshold) are logged with their call site whether or not a profile is open
+"""
+import os
+import re
+import sys
+import json
+import time
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+
+# Frames from these files are skipped when resolving the caller of a query
+_INTERNAL_FILES = ('db_manager.py', 'query_profiler.py', 'contextlib.py')
+
+logger = logging.getLogger(__name__)
+
+# Each thread has its own stack of open profiles, so queries from the
+# Streamlit sessions or the refresh worker never land in another thread's profile
+_local = threading.local()
+
+
+def fingerprint(query):
+    """Normalize SQL so calls differing only in literals group together"""
+    sql = re.sub(r'--[^\n]*', ' ', query)
+    sql = re.sub(r'/\*.*?\*/', ' ', sql, flags=re.S)
+    sql = re.sub(r"'(?:[^'\\]|\\.)*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    sql = sql.replace('%s', '?')
+    sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)+\s*\)', '(?+)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def _call_site():
+    """First stack frame outside the database layer, as file:line (function)"""
+    frame = sys._getframe(1)
+    while frame and os.path.basename(frame.f_code.co_filename) in _INTERNAL_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return 'unknown'
+    filename = os.path.relpath(frame.f_code.co_filename)
+    return f"{filename}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+
+def _profilers():
+    if not hasattr(_local, 'profilers'):
+        _local.profilers = []
+    return _local.profilers
+
+
+def get_active_profiler():
+    """Return the innermost profiler active in this thread, or None"""
+    profilers = _profilers()
+    return profilers[-1] if profilers else None
+
+
+def slow_query_threshold():
+    """DB_SLOW_QUERY_MS as a float, or None when unset"""
+    value = os.getenv('DB_SLOW_QUERY_MS')
+    return float(value) if value else None
+
+
+def check_slow_query(kind, query, elapsed, threshold_ms=None, site=None):
+    """
+    Log a statement that took at least threshold_ms (default DB_SLOW_QUERY_MS)
+
+    Returns the slow-query entry (call site, fingerprint, latency, stack) or
+    None when the statement was fast enough or no threshold is set
+    """
+    threshold_ms = slow_query_threshold() if threshold_ms is None else threshold_ms
+    elapsed_ms = elapsed * 1000
+    if threshold_ms is None or elapsed_ms < threshold_ms:
+        return None
+
+    site = site or _call_site()
+    stack = ''.join(traceback.format_stack()[:-2])
+    logger.warning("Slow %s (%.0fms >= %.0fms) at %s: %s",
+                   kind, elapsed_ms, threshold_ms, site, fingerprint(query)[:200])
+    logger.debug("Stack for slow query at %s:\n%s", site, stack)
+    return {
+        'call_site': site,
+        'fingerprint': fingerprint(query),
+        'elapsed_ms': elapsed_ms,
+        'stack': stack
+    }
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, int(round(pct / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+class QueryProfiler:
+    """Collect per-call-site and per-fingerprint query statistics"""
+
+    def __init__(self, label=None, slow_query_ms=None):
+        if slow_query_ms is None:
+            slow_query_ms = slow_query_threshold()
+
+        self.label = label
+        self.slow_query_ms = slow_query_ms
+        self.started_at = datetime.now()
+        self.elapsed = None
+        self.calls = []
+        self.slow_queries = []
+
+    def record(self, kind, query, elapsed, rows, round_trip=True):
+        """
+        Record one executed statement (elapsed in seconds)
+
+        round_trip is False for statements that rode along in a pipelined
+        batch sent with an earlier one
+        """
+        site = _call_site()
+        elapsed_ms = elapsed * 1000
+
+        self.calls.append({
+            'kind': kind,
+            'call_site': site,
+            'fingerprint': fingerprint(query),
+            'elapsed_ms': elapsed_ms,
+            'rows': rows,
+            'round_trip': round_trip
+        })
+
+        if self.slow_query_ms is not None:
+            slow = check_slow_query(kind, query, elapsed, self.slow_query_ms, site)
+            if slow:
+                self.slow_queries.append(slow)
+
+    def _aggregate(self, key):
+        groups = {}
+        for call in self.calls:
+            groups.setdefault(call[key], []).append(call)
+
+        stats = []
+        for name, calls in groups.items():
+            latencies = [c['elapsed_ms'] for c in calls]
+            stats.append({
+                key: name,
+                'count': len(calls),
+                'total_ms': sum(latencies),
+                'mean_ms': sum(latencies) / len(latencies),
+                'p95_ms': _percentile(latencies, 95),
+                'rows': sum(c['rows'] for c in calls)
+            })
+
+        return sorted(stats, key=lambda s: s['total_ms'], reverse=True)
+
+    def by_call_site(self):
+        return self._aggregate('call_site')
+
+    def by_fingerprint(self):
+        return self._aggregate('fingerprint')
+
+    def summary(self):
+        """Everything recorded, as a JSON-serializable dict"""
+        latencies = [c['elapsed_ms'] for c in self.calls]
+        return {
+            'label': self.label,
+            'started_at': self.started_at.isoformat(),
+            'elapsed_s': self.elapsed,
+            'total_queries': len(self.calls),
+            'round_trips': sum(1 for c in self.calls if c['round_trip']),
+            'total_query_ms': sum(latencies),
+            'p95_ms': _percentile(latencies, 95) if latencies else 0,
+            'rows': sum(c['rows'] for c in self.calls),
+            'by_call_site': self.by_call_site(),
+            'by_fingerprint': self.by_fingerprint(),
+            'slow_queries': self.slow_queries
+        }
+
+    def export_json(self, path):
+        """Write the summary to a JSON file"""
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+    def print_report(self, top=15):
+        """Print the heaviest call sites"""
+        summary = self.summary()
+
+        print("\n" + "=" * 70)
+        print(f"QUERY PROFILE{' - ' + self.label if self.label else ''}")
+        print("=" * 70)
+        print(f"Queries: {summary['total_queries']}  |  Round trips: {summary['round_trips']}  |  DB time: {summary['total_query_ms']:.0f}ms  |  "
+              f"p95: {summary['p95_ms']:.1f}ms  |  Rows: {summary['rows']}")
+        if self.elapsed is not None:
+            print(f"Wall time: {self.elapsed:.2f}s")
+
+        print(f"\n{'Calls':>6} {'Total ms':>10} {'Mean':>8} {'p95':>8} {'Rows':>8}  Call site")
+        print("-" * 70)
+        for s in summary['by_call_site'][:top]:
+            print(f"{s['count']:>6} {s['total_ms']:>10.1f} {s['mean_ms']:>8.1f} {s['p95_ms']:>8.1f} "
+                  f"{s['rows']:>8}  {s['call_site']}")
+
+        if self.slow_queries:
+            print(f"\n🐢 {len(self.slow_queries)} slow queries (>= {self.slow_query_ms:.0f}ms)")
+        print("=" * 70)
+
+
+@contextmanager
+def profile(label=None, slow_query_ms=None, export_path=None, report=True):
+    """
+    Profile every DatabaseManager query issued inside the block
+
+    Applies to all DatabaseManager instances used by this thread, so one
+    analyze_week() is captured even though its helpers open their own managers
+    """
+    profiler = QueryProfiler(label, slow_query_ms)
+    _profilers().append(profiler)
+    started = time.perf_counter()
+    try:
+        yield profiler
+    finally:
+        profiler.elapsed = time.perf_counter() - started
+        _profilers().remove(profiler)
+        if report:
+            profiler.print_report()
+        if export_path:
+            profiler.export_json(export_path)
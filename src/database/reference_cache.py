@@ -0,0 +1,180 @@
+"""
+Reference Data Cache
+Process-wide, in-memory copy of the teams table and the shared player
+resolver, so collectors resolve abbreviations, ESPN aliases, team names and
+player names without a round trip per lookup. Loaded lazily on first use;
+DatabaseManager writes through on its own helpers and invalidates on any
+other write to teams, players or player_seasons
+"""
+import re
+import threading
+
+from src.database.player_resolver import PlayerResolver
+
+REFERENCE_TABLES = ('teams', 'players', 'player_seasons')
+
+# Abbreviations different feeds use for the same franchise (ESPN, nfl_data_py,
+# pre-relocation codes); every member resolves to whichever one teams stores
+TEAM_ALIASES = [
+    ('LA', 'LAR', 'STL'),
+    ('WAS', 'WSH'),
+    ('JAX', 'JAC'),
+    ('LV', 'OAK'),
+    ('LAC', 'SD'),
+]
+
+_WRITE_TARGET = re.compile(
+    r'^\s*(?:INSERT(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?)\s+`?(\w+)',
+    re.I
+)
+
+
+def written_table(query):
+    """Table an INSERT/UPDATE/DELETE statement writes to, or None"""
+    match = _WRITE_TARGET.match(query)
+    return match.group(1).lower() if match else None
+
+
+class ReferenceCache:
+    """Teams by id/abbreviation/alias/name and players by name+team+season"""
+
+    # One cache per database (backend key), shared by every DatabaseManager
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.RLock()
+        self._teams = None
+        self._players = None
+        self._resolver = None
+
+    @classmethod
+    def for_db(cls, db):
+        key = db.backend.cache_key()
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(db)
+            return cls._instances[key]
+
+    @classmethod
+    def clear_all(cls):
+        with cls._instances_lock:
+            cls._instances.clear()
+
+    # ---- teams -------------------------------------------------------------
+
+    def _team_index(self):
+        with self._lock:
+            if self._teams is None:
+                rows = self.db.execute_query("SELECT * FROM teams")
+                by_key = {}
+                for row in rows:
+                    by_key[row['team_id']] = row
+                    by_key[row['abbreviation'].upper()] = row
+                    by_key[row['name'].lower()] = row
+                for group in TEAM_ALIASES:
+                    stored = next((by_key[a] for a in group if a in by_key), None)
+                    if stored:
+                        for alias in group:
+                            by_key.setdefault(alias, stored)
+                self._teams = by_key
+            return self._teams
+
+    def team(self, key):
+        """Team row for a team_id, abbreviation, feed alias or full name; None if unknown"""
+        if key is None:
+            return None
+        index = self._team_index()
+        if isinstance(key, int):
+            row = index.get(key)
+        else:
+            key = key.strip()
+            row = index.get(key.upper()) or index.get(key.lower())
+        return dict(row) if row else None
+
+    def team_id(self, key):
+        row = self.team(key)
+        return row['team_id'] if row else None
+
+    def team_abbr(self, team_id):
+        row = self.team(team_id)
+        return row['abbreviation'] if row else None
+
+    def teams(self):
+        """Every team row, ordered by name like get_all_teams"""
+        rows = {row['team_id']: row for row in self._team_index().values()}
+        return [dict(row) for row in sorted(rows.values(), key=lambda r: r['name'])]
+
+    # ---- players -----------------------------------------------------------
+
+    def _player_index(self):
+        """{(name, position): player_id} over the players master table"""
+        with self._lock:
+            if self._players is None:
+                rows = self.db.execute_query("SELECT player_id, name, position FROM players")
+                index = {}
+                for row in rows:
+                    index.setdefault((row['name'], row['position']), row['player_id'])
+                    index.setdefault((row['name'], None), row['player_id'])
+                self._players = index
+            return self._players
+
+    def resolver(self):
+        """PlayerResolver over every player and player-season, loaded on first use"""
+        with self._lock:
+            if self._resolver is None:
+                self._resolver = PlayerResolver.load(self.db)
+            return self._resolver
+
+    def player_id(self, name, team_id=None, season=2025):
+        """
+        player_id for a display name on a team in a season
+
+        Names are compared by PlayerResolver's key (no Jr./III, no middle
+        initial, no periods). When the team doesn't match, a name that is
+        unique within the season still resolves; ambiguous names return None
+        """
+        return self.resolver().resolve(name, team_id, season)
+
+    def player_by_name(self, name, position=None):
+        """player_id by exact stored name (and position), like get_player_by_name"""
+        return self._player_index().get((name, position))
+
+    def remember_player(self, player_id, name, position=None):
+        """Write-through after inserting into players"""
+        with self._lock:
+            if player_id and self._players is not None:
+                self._players.setdefault((name, position), player_id)
+                self._players.setdefault((name, None), player_id)
+            if player_id and self._resolver is not None:
+                self._resolver.add(player_id, name, position=position)
+
+    def remember_player_season(self, player_id, season, team_id):
+        """Write-through after upserting player_seasons"""
+        with self._lock:
+            if self._resolver is None or not player_id:
+                return
+            if not self._resolver.add(player_id, season=season, team_id=team_id):
+                # A player the resolver has never seen; its name is one lookup away
+                rows = self.db.execute_query("SELECT name, position FROM players WHERE player_id = %s", (player_id,))
+                if rows:
+                    self._resolver.add(player_id, rows[0]['name'], season, team_id, rows[0]['position'])
+
+    # ---- invalidation ------------------------------------------------------
+
+    def invalidate(self, table=None):
+        """Drop cached data for a reference table (default: everything)"""
+        with self._lock:
+            if table in (None, 'teams'):
+                self._teams = None
+            if table in (None, 'players'):
+                self._players = None
+            if table in (None, 'players', 'player_seasons'):
+                self._resolver = None
+
+    def invalidate_for(self, query):
+        """Invalidate whatever reference table a raw write statement touches"""
+        table = written_table(query)
+        if table in REFERENCE_TABLES:
+            self.invalidate(table)
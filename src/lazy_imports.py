@@ -0,0 +1,41 @@
+"""
+Lazy Imports
+Module placeholders that import the real module on first attribute access, so
+entry points only pay for pandas / numpy / plotly / requests when a code path
+actually uses them
+"""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module until one of its attributes is used"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = name
+
+    def _load(self):
+        # import_module takes the import lock, so concurrent first use is safe
+        module = importlib.import_module(self.__dict__['_lazy_target'])
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """
+    Return name's module if it is already loaded, otherwise a LazyModule
+
+        pd = lazy_import('pandas')   # nothing imported yet
+        pd.DataFrame(...)            # pandas imported here
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
@@ -1,29 +1,15 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from database.db_manager import DatabaseManager
-from analysis.defensive_rankings import DefensiveRankings
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from src.database.db_manager import DatabaseManager
+from src.analysis.defensive_rankings import DefensiveRankings
+from src.lazy_imports import lazy_import
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
 import warnings
 warnings.filterwarnings('ignore')
 
 class AdvancedNFLPredictor:
     """Advanced NFL game predictor with player stats, snap counts, and matchup analysis"""
     
-    def __init__(self):
-        self.db = DatabaseManager()
-        self.defensive_ranker = DefensiveRankings()
-        self.model = None
-        self.feature_columns = []
-    
-    def get_team_qb_performance(self, team_id, season, through_week):
-        """Get QB performance for a team up to a certain week"""
-        query = """
+    QB_QUERY = """
             SELECT 
                 AVG(pgs.pass_yards) as avg_pass_yards,
                 AVG(pgs.pass_touchdowns) as avg_pass_tds,
@@ -38,16 +24,8 @@ class AdvancedNFLPredictor:
             AND pgs.pass_attempts > 5
             AND g.game_status = 'Final'
         """
-        result = self.db.execute_query(query, (team_id, season, through_week))
-        return result[0] if result else {
-            'avg_pass_yards': 0, 'avg_pass_tds': 0, 
-            'avg_interceptions': 0, 'completion_pct': 0,
-            'total_pass_yards': 0
-        }
-    
-    def get_team_rushing_performance(self, team_id, season, through_week):
-        """Get rushing performance for a team"""
-        query = """
+
+    RUSH_QUERY = """
             SELECT 
                 AVG(pgs.rush_yards) as avg_rush_yards,
                 AVG(pgs.rush_touchdowns) as avg_rush_tds,
@@ -60,14 +38,8 @@ class AdvancedNFLPredictor:
             AND pgs.rush_attempts > 0
             AND g.game_status = 'Final'
         """
-        result = self.db.execute_query(query, (team_id, season, through_week))
-        return result[0] if result else {
-            'avg_rush_yards': 0, 'avg_rush_tds': 0, 'total_rush_yards': 0
-        }
-    
-    def get_key_player_snap_counts(self, team_id, season, week):
-        """Get average snap counts for key positions"""
-        query = """
+
+    SNAP_QUERY = """
             SELECT 
                 position,
                 AVG(snap_percentage) as avg_snap_pct,
@@ -79,7 +51,38 @@ class AdvancedNFLPredictor:
             AND snap_percentage IS NOT NULL
             GROUP BY position
         """
-        results = self.db.execute_query(query, (team_id, season, week))
+    
+    def __init__(self):
+        self.db = DatabaseManager()
+        self.defensive_ranker = DefensiveRankings()
+        self.model = None
+        self.feature_columns = []
+    
+    def _mirror_team_stats(self, team_id, season, through_week):
+        """A team's Final-game box scores before through_week, from the Parquet mirror"""
+        stats = self.defensive_ranker._mirror_season(season)[1]
+        return stats[(stats['team_id'] == team_id) & (stats['week'] < through_week)]
+    
+    @staticmethod
+    def _mean_or_none(series):
+        return float(series.mean()) if len(series) else None
+
+    @staticmethod
+    def _qb_result(result):
+        return result[0] if result else {
+            'avg_pass_yards': 0, 'avg_pass_tds': 0, 
+            'avg_interceptions': 0, 'completion_pct': 0,
+            'total_pass_yards': 0
+        }
+
+    @staticmethod
+    def _rush_result(result):
+        return result[0] if result else {
+            'avg_rush_yards': 0, 'avg_rush_tds': 0, 'total_rush_yards': 0
+        }
+
+    @staticmethod
+    def _snap_result(results):
         snap_dict = {}
         for row in results:
             pos = row['position']
@@ -87,6 +90,83 @@ class AdvancedNFLPredictor:
             snap_dict[f'{pos}_max_snap'] = row['max_snap_pct'] or 0
         return snap_dict
     
+    def get_team_qb_performance(self, team_id, season, through_week):
+        """Get QB performance for a team up to a certain week"""
+        if self.defensive_ranker.mirror:
+            stats = self._mirror_team_stats(team_id, season, through_week)
+            stats = stats[stats['pass_attempts'] > 5]
+            completion_pct = stats['pass_completions'] * 100.0 / stats['pass_attempts'].replace(0, np.nan)
+            return {
+                'avg_pass_yards': self._mean_or_none(stats['pass_yards']),
+                'avg_pass_tds': self._mean_or_none(stats['pass_touchdowns']),
+                'avg_interceptions': self._mean_or_none(stats['interceptions']),
+                'completion_pct': self._mean_or_none(completion_pct.dropna()),
+                'total_pass_yards': int(stats['pass_yards'].sum()) if len(stats) else None
+            }
+        
+        return self._qb_result(self.db.execute_query(self.QB_QUERY, (team_id, season, through_week)))
+    
+    def get_team_rushing_performance(self, team_id, season, through_week):
+        """Get rushing performance for a team"""
+        if self.defensive_ranker.mirror:
+            stats = self._mirror_team_stats(team_id, season, through_week)
+            stats = stats[stats['rush_attempts'] > 0]
+            return {
+                'avg_rush_yards': self._mean_or_none(stats['rush_yards']),
+                'avg_rush_tds': self._mean_or_none(stats['rush_touchdowns']),
+                'total_rush_yards': int(stats['rush_yards'].sum()) if len(stats) else None
+            }
+        
+        return self._rush_result(self.db.execute_query(self.RUSH_QUERY, (team_id, season, through_week)))
+    
+    def get_key_player_snap_counts(self, team_id, season, week):
+        """Get average snap counts for key positions"""
+        if self.defensive_ranker.mirror:
+            depth = self.defensive_ranker.mirror.frame('depth_charts', season)
+            depth = depth[(depth['team_id'] == team_id) & (depth['week'] < week) & depth['snap_percentage'].notna()]
+            snaps = depth.groupby('position')['snap_percentage'].agg(['mean', 'max'])
+            snap_dict = {}
+            for pos, row in snaps.iterrows():
+                snap_dict[f'{pos}_avg_snap'] = row['mean'] or 0
+                snap_dict[f'{pos}_max_snap'] = row['max'] or 0
+            return snap_dict
+        
+        return self._snap_result(self.db.execute_query(self.SNAP_QUERY, (team_id, season, week)))
+
+    def get_matchup_player_stats(self, home_id, away_id, season, week):
+        """
+        QB, rushing and snap-count stats for both teams of a game
+
+        Returns (home_qb, away_qb, home_rush, away_rush, home_snaps, away_snaps);
+        the six database reads go out as one batch (one round trip on a remote database)
+        """
+        if self.defensive_ranker.mirror:
+            return (
+                self.get_team_qb_performance(home_id, season, week),
+                self.get_team_qb_performance(away_id, season, week),
+                self.get_team_rushing_performance(home_id, season, week),
+                self.get_team_rushing_performance(away_id, season, week),
+                self.get_key_player_snap_counts(home_id, season, week),
+                self.get_key_player_snap_counts(away_id, season, week),
+            )
+        
+        results = self.db.execute_batch([
+            (self.QB_QUERY, (home_id, season, week)),
+            (self.QB_QUERY, (away_id, season, week)),
+            (self.RUSH_QUERY, (home_id, season, week)),
+            (self.RUSH_QUERY, (away_id, season, week)),
+            (self.SNAP_QUERY, (home_id, season, week)),
+            (self.SNAP_QUERY, (away_id, season, week)),
+        ])
+        return (
+            self._qb_result(results[0]),
+            self._qb_result(results[1]),
+            self._rush_result(results[2]),
+            self._rush_result(results[3]),
+            self._snap_result(results[4]),
+            self._snap_result(results[5]),
+        )
+    
     def build_features(self, seasons):
         """Build comprehensive feature set"""
         print("Building advanced feature set...")
@@ -120,12 +200,8 @@ class AdvancedNFLPredictor:
             def_rankings = self.defensive_ranker.get_all_defensive_rankings(season, week - 1)
             home_def = def_rankings[def_rankings['team_id'] == home_id]
             away_def = def_rankings[def_rankings['team_id'] == away_id]
-            home_qb = self.get_team_qb_performance(home_id, season, week)
-            away_qb = self.get_team_qb_performance(away_id, season, week)
-            home_rush = self.get_team_rushing_performance(home_id, season, week)
-            away_rush = self.get_team_rushing_performance(away_id, season, week)
-            home_snaps = self.get_key_player_snap_counts(home_id, season, week)
-            away_snaps = self.get_key_player_snap_counts(away_id, season, week)
+            (home_qb, away_qb, home_rush, away_rush,
+             home_snaps, away_snaps) = self.get_matchup_player_stats(home_id, away_id, season, week)
             feature_dict = {
                 'game_id': game['game_id'],
                 'season': season,
@@ -163,6 +239,11 @@ class AdvancedNFLPredictor:
     
     def train_model(self, seasons):
         """Train advanced prediction model"""
+        # sklearn is the slowest import in the project; only training needs it
+        from sklearn.model_selection import train_test_split
+        from sklearn.ensemble import GradientBoostingClassifier
+        from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+        
         print("=" * 70)
         print("TRAINING ADVANCED NFL PREDICTION MODEL")
         print("=" * 70)
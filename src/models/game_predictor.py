@@ -1,13 +1,9 @@
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from src.database.db_manager import DatabaseManager
+from src.lazy_imports import lazy_import
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
 import pickle
 
 class NFLGamePredictor:
@@ -20,20 +16,30 @@ class NFLGamePredictor:
         self.model = None
         self.feature_columns = None
     
-    def fetch_training_data(self, seasons, max_week_2025=None):
+    def fetch_training_data(self, seasons, max_week_2025=None, current_season=2025):
         """
         Fetch historical game data for training
         
         Args:
             seasons: List of seasons (e.g., [2022, 2023, 2024, 2025])
-            max_week_2025: Only include 2025 games up to this week
+            max_week_2025: Only include current_season games up to this week
+            current_season: The in-progress season max_week_2025 applies to
         """
         print("Fetching game data from database...")
+        query, params = self._training_games_query(seasons, max_week_2025, current_season)
+        games = self.db.query_frame(query, params)
+        
+        print(f"Found {len(games)} completed games")
+        
+        return games
+
+    @staticmethod
+    def _training_games_query(seasons, max_week_2025=None, current_season=2025):
         where_clauses = [f"g.season IN ({','.join(['%s'] * len(seasons))})"]
         params = list(seasons)
-        if max_week_2025 and 2025 in seasons:
-            where_clauses.append("(g.season < 2025 OR g.week <= %s)")
-            params.append(max_week_2025)
+        if max_week_2025 and current_season in seasons:
+            where_clauses.append("(g.season < %s OR g.week <= %s)")
+            params.extend([current_season, max_week_2025])
         where_clauses.append("g.game_status = 'Final'")
         query = f"""
             SELECT 
@@ -53,12 +59,7 @@ class NFLGamePredictor:
             WHERE {' AND '.join(where_clauses)}
             ORDER BY g.season, g.week
         """
-        
-        games = self.db.execute_query(query, tuple(params))
-        
-        print(f"Found {len(games)} completed games")
-        
-        return pd.DataFrame(games)
+        return query, tuple(params)
     
     def calculate_team_stats(self, games_df):
         """
@@ -125,21 +126,27 @@ class NFLGamePredictor:
         
         return pd.DataFrame(features_list)
     
-    def train_model(self, seasons, max_week_2025=None):
+    def train_model(self, seasons, max_week_2025=None, current_season=2025):
         """
         Train the prediction model
         
         Args:
             seasons: List of seasons to train on (e.g., [2022, 2023, 2024, 2025])
-            max_week_2025: For 2025, only include games up to this week (for weekly updates)
+            max_week_2025: For current_season, only include games up to this week (for weekly updates)
+            current_season: The in-progress season max_week_2025 applies to
         """
+        # sklearn is the slowest import in the project; only training needs it
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+        
         print("=" * 70)
         print("TRAINING NFL GAME PREDICTION MODEL")
         print("=" * 70)
         
         if max_week_2025:
-            print(f"Including 2025 games through Week {max_week_2025}")
-        games_df = self.fetch_training_data(seasons, max_week_2025)
+            print(f"Including {current_season} games through Week {max_week_2025}")
+        games_df = self.fetch_training_data(seasons, max_week_2025, current_season)
         features_df = self.calculate_team_stats(games_df)
         features_df = features_df[features_df['week'] > 1].copy()
         print(f"\nUsing {len(features_df)} games for training")
@@ -250,10 +257,19 @@ class NFLGamePredictor:
             'away_win_probability': probability[0]
         }
 
-if __name__ == "__main__":
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Train and save the game outcome model')
+    parser.add_argument('--seasons', type=int, nargs='+', default=[2022, 2023, 2024])
+    args = parser.parse_args(argv)
+
     predictor = NFLGamePredictor()
-    accuracy = predictor.train_model([2022, 2023, 2024])
+    accuracy = predictor.train_model(args.seasons)
     predictor.save_model()
     print("\n" + "=" * 70)
     print("Training complete! Model ready for predictions.")
-    print("=" * 70)
\ No newline at end of file
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,12 @@
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from database.db_manager import DatabaseManager
-from analysis.injury_impact import InjuryImpactAnalyzer
-from models.game_predictor import NFLGamePredictor
-import requests
-import pandas as pd
-import numpy as np
-from datetime import datetime
-from dotenv import load_dotenv
 
-load_dotenv('config/.env')
+from src.database.db_manager import DatabaseManager
+from src.analysis.injury_impact import InjuryImpactAnalyzer
+from src.models.game_predictor import NFLGamePredictor
+from src.lazy_imports import lazy_import
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+from datetime import datetime
 
 class MasterBettingPredictor:
     """
@@ -30,25 +25,27 @@ class MasterBettingPredictor:
         self.odds_api_key = os.getenv('ODDS_API_KEY')
         self.ml_trained = False
         
-    def train_ml_model(self, max_week_2025=None):
+    def train_ml_model(self, max_week_2025=None, season=2025):
         """
         Train ML model on historical data if not already trained
         
         Args:
-            max_week_2025: If provided, includes 2025 games up to this week
+            max_week_2025: If provided, includes `season` games up to this week
+            season: The season being predicted; trains on the three before it plus this one
         """
         if not self.ml_trained:
             if max_week_2025:
-                print(f"\n🤖 Training ML Model on 2022-2024 + 2025 (through Week {max_week_2025})...")
-                self.ml_predictor.train_model([2022, 2023, 2024, 2025], max_week_2025=max_week_2025)
+                history = [season - 3, season - 2, season - 1]
+                print(f"\n🤖 Training ML Model on {history[0]}-{history[-1]} + {season} (through Week {max_week_2025})...")
+                self.ml_predictor.train_model(history + [season], max_week_2025=max_week_2025, current_season=season)
             else:
                 print("\n🤖 Training ML Model on Historical Data (2022-2024)...")
                 self.ml_predictor.train_model([2022, 2023, 2024])
             self.ml_trained = True
             print("✓ ML Model Ready\n")
     
-    def get_team_current_stats(self, team_abbr, season, through_week):
-        """Get current season stats"""
+    @staticmethod
+    def _current_stats_query(team_abbr, season, through_week):
         query = """
             SELECT 
                 SUM(CASE 
@@ -71,16 +68,22 @@ class MasterBettingPredictor:
             WHERE t.abbreviation = %s
             GROUP BY t.team_id
         """
-        
-        result = self.db.execute_query(query, (season, through_week, team_abbr))
-        
+        return query, (season, through_week, team_abbr)
+
+    @staticmethod
+    def _current_stats_result(result):
         if result and result[0]['wins'] is not None:
             return result[0]
         
         return {'wins': 0, 'losses': 0, 'avg_points_scored': 0.0, 'avg_points_allowed': 0.0}
+
+    def get_team_current_stats(self, team_abbr, season, through_week):
+        """Get current season stats"""
+        query, params = self._current_stats_query(team_abbr, season, through_week)
+        return self._current_stats_result(self.db.execute_query(query, params))
     
-    def get_historical_performance(self, team_abbr, seasons=[2022, 2023, 2024]):
-        """Get team's historical performance trends"""
+    @staticmethod
+    def _historical_query(team_abbr, seasons=[2022, 2023, 2024]):
         query = """
             SELECT 
                 g.season,
@@ -100,9 +103,10 @@ class MasterBettingPredictor:
             GROUP BY g.season
             ORDER BY g.season
         """.format(','.join(['%s'] * len(seasons)))
-        
-        result = self.db.execute_query(query, (team_abbr, *seasons))
-        
+        return query, (team_abbr, *seasons)
+
+    @staticmethod
+    def _historical_result(result):
         if result:
             avg_win_pct = np.mean([r['wins'] / r['games'] for r in result])
             trend = 'improving' if len(result) > 1 and result[-1]['wins']/result[-1]['games'] > avg_win_pct else 'declining'
@@ -113,12 +117,40 @@ class MasterBettingPredictor:
             }
         
         return {'historical_win_pct': 0.5, 'trend': 'neutral', 'seasons_data': []}
+
+    def get_historical_performance(self, team_abbr, seasons=[2022, 2023, 2024]):
+        """Get team's historical performance trends"""
+        query, params = self._historical_query(team_abbr, seasons)
+        return self._historical_result(self.db.execute_query(query, params))
+
+    def get_matchup_stats(self, home_team, away_team, season, week):
+        """
+        Current and historical stats for both teams as one batch of reads
+
+        Returns (home_current, away_current, home_historical, away_historical);
+        on a remote database this is a single round trip instead of four
+        """
+        results = self.db.execute_batch([
+            self._current_stats_query(home_team, season, week),
+            self._current_stats_query(away_team, season, week),
+            self._historical_query(home_team),
+            self._historical_query(away_team),
+        ])
+        return (
+            self._current_stats_result(results[0]),
+            self._current_stats_result(results[1]),
+            self._historical_result(results[2]),
+            self._historical_result(results[3]),
+        )
     
-    def get_ml_prediction_for_game(self, home_team, away_team, season, week):
-        """Get ML model's prediction for this matchup"""
+    def get_ml_prediction_for_game(self, home_team, away_team, season, week,
+                                   home_stats=None, away_stats=None):
+        """Get ML model's prediction for this matchup (pass current stats already fetched to skip the lookups)"""
         
-        home_stats = self.get_team_current_stats(home_team, season, week)
-        away_stats = self.get_team_current_stats(away_team, season, week)
+        if home_stats is None:
+            home_stats = self.get_team_current_stats(home_team, season, week)
+        if away_stats is None:
+            away_stats = self.get_team_current_stats(away_team, season, week)
         
         home_games = home_stats['wins'] + home_stats['losses']
         away_games = away_stats['wins'] + away_stats['losses']
@@ -154,10 +186,9 @@ class MasterBettingPredictor:
             'oddsFormat': 'american'
         }
         
+        from src.data_collection.payload_archive import get_archive
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return get_archive().fetch('odds_api', url, params=params, key='draftkings').json()
         except:
             return None
     
@@ -198,6 +229,131 @@ class MasterBettingPredictor:
                         return {'spread': spread, 'total': total}
         return None
     
+    def combine_prediction_components(self, ml_home_win_prob, home_win_pct, away_win_pct,
+                                      home_historical_pct, away_historical_pct,
+                                      home_scored, away_scored, home_allowed, away_allowed,
+                                      home_injury, away_injury):
+        """
+        Weight the individual prediction factors into spread components
+
+        Works on plain floats for a single game or on NumPy arrays for a
+        whole batch of matchups at once.
+
+        Returns:
+            (components dict, confidence score)
+        """
+        prediction_components = {}
+
+        ml_spread_contribution = (ml_home_win_prob - 0.5) * 20
+        prediction_components['ml_model'] = ml_spread_contribution
+
+        prediction_components['current_record'] = (home_win_pct - away_win_pct) * 8
+
+        prediction_components['historical_trend'] = (home_historical_pct - away_historical_pct) * 5
+
+        prediction_components['offensive_power'] = (home_scored - away_scored) * 0.3
+
+        prediction_components['defensive_strength'] = (away_allowed - home_allowed) * 0.3
+
+        injury_diff = away_injury - home_injury
+        prediction_components['injury_impact'] = injury_diff * 0.3
+
+        prediction_components['home_field'] = 2.5
+
+        confidence_score = (
+            30 * (abs(ml_spread_contribution) > 5) +
+            25 * (abs(prediction_components['current_record']) > 3) +
+            20 * (abs(injury_diff) > 15) +
+            15 * (abs(prediction_components['offensive_power']) > 3) +
+            10 * (abs(prediction_components['defensive_strength']) > 3)
+        )
+
+        return prediction_components, confidence_score
+
+    def confidence_label(self, confidence_score):
+        """Map a confidence score to HIGH / MEDIUM / LOW"""
+        if confidence_score >= 70:
+            return 'HIGH'
+        elif confidence_score >= 45:
+            return 'MEDIUM'
+        return 'LOW'
+
+    def get_all_team_current_stats(self, season, through_week):
+        """Get current season stats for every team in a single query"""
+        query = """
+            SELECT
+                t.abbreviation,
+                SUM(CASE
+                    WHEN (home_team_id = t.team_id AND home_score > away_score)
+                      OR (away_team_id = t.team_id AND away_score > home_score)
+                    THEN 1 ELSE 0
+                END) as wins,
+                SUM(CASE
+                    WHEN (home_team_id = t.team_id AND home_score < away_score)
+                      OR (away_team_id = t.team_id AND away_score < home_score)
+                    THEN 1 ELSE 0
+                END) as losses,
+                AVG(CASE WHEN home_team_id = t.team_id THEN home_score ELSE away_score END) as avg_points_scored,
+                AVG(CASE WHEN home_team_id = t.team_id THEN away_score ELSE home_score END) as avg_points_allowed
+            FROM teams t
+            LEFT JOIN games g ON (g.home_team_id = t.team_id OR g.away_team_id = t.team_id)
+                AND g.season = %s
+                AND g.week < %s
+                AND g.game_status = 'Final'
+            GROUP BY t.team_id, t.abbreviation
+        """
+
+        results = self.db.execute_query(query, (season, through_week))
+
+        team_stats = {}
+        for row in results:
+            team_stats[row['abbreviation']] = {
+                'wins': int(row['wins'] or 0),
+                'losses': int(row['losses'] or 0),
+                'avg_points_scored': float(row['avg_points_scored'] or 0.0),
+                'avg_points_allowed': float(row['avg_points_allowed'] or 0.0)
+            }
+
+        return team_stats
+
+    def get_all_historical_performance(self, seasons=[2022, 2023, 2024]):
+        """Get historical performance trends for every team in a single query"""
+        query = """
+            SELECT
+                t.abbreviation,
+                g.season,
+                SUM(CASE
+                    WHEN (home_team_id = t.team_id AND home_score > away_score)
+                      OR (away_team_id = t.team_id AND away_score > home_score)
+                    THEN 1 ELSE 0
+                END) as wins,
+                COUNT(*) as games
+            FROM teams t
+            JOIN games g ON (g.home_team_id = t.team_id OR g.away_team_id = t.team_id)
+            WHERE g.season IN ({})
+            AND g.game_status = 'Final'
+            GROUP BY t.abbreviation, g.season
+            ORDER BY t.abbreviation, g.season
+        """.format(','.join(['%s'] * len(seasons)))
+
+        results = self.db.execute_query(query, tuple(seasons))
+
+        seasons_by_team = {}
+        for row in results:
+            seasons_by_team.setdefault(row['abbreviation'], []).append(row)
+
+        historical = {}
+        for team_abbr, result in seasons_by_team.items():
+            avg_win_pct = np.mean([r['wins'] / r['games'] for r in result])
+            trend = 'improving' if len(result) > 1 and result[-1]['wins']/result[-1]['games'] > avg_win_pct else 'declining'
+            historical[team_abbr] = {
+                'historical_win_pct': avg_win_pct,
+                'trend': trend,
+                'seasons_data': result
+            }
+
+        return historical
+
     def calculate_comprehensive_prediction(self, home_team, away_team, season, week):
         """
         Master prediction combining all factors:
@@ -210,60 +366,39 @@ class MasterBettingPredictor:
         Returns prediction with BOTH point margin and betting line format
         """
         
-        home_current = self.get_team_current_stats(home_team, season, week)
-        away_current = self.get_team_current_stats(away_team, season, week)
-        
-        home_historical = self.get_historical_performance(home_team)
-        away_historical = self.get_historical_performance(away_team)
+        home_current, away_current, home_historical, away_historical = self.get_matchup_stats(
+            home_team, away_team, season, week
+        )
         
-        ml_home_win_prob = self.get_ml_prediction_for_game(home_team, away_team, season, week)
+        ml_home_win_prob = self.get_ml_prediction_for_game(
+            home_team, away_team, season, week, home_current, away_current
+        )
         
         home_injury = self.injury_analyzer.get_team_injury_impact(home_team, season, week)
         away_injury = self.injury_analyzer.get_team_injury_impact(away_team, season, week)
         
-        prediction_components = {}
-        
-        ml_spread_contribution = (ml_home_win_prob - 0.5) * 20
-        prediction_components['ml_model'] = ml_spread_contribution
-
         home_games = int(home_current['wins']) + int(home_current['losses'])
         away_games = int(away_current['wins']) + int(away_current['losses'])
-        current_record_diff = (int(home_current['wins'])/max(home_games, 1)) - (int(away_current['wins'])/max(away_games, 1))
-        prediction_components['current_record'] = current_record_diff * 8
-
-        prediction_components['historical_trend'] = (float(home_historical['historical_win_pct']) - float(away_historical['historical_win_pct'])) * 5
-
-        prediction_components['offensive_power'] = (float(home_current['avg_points_scored']) - float(away_current['avg_points_scored'])) * 0.3
-
-        prediction_components['defensive_strength'] = (float(away_current['avg_points_allowed']) - float(home_current['avg_points_allowed'])) * 0.3
- 
-        injury_diff = float(away_injury['total_impact']) - float(home_injury['total_impact'])
-        prediction_components['injury_impact'] = injury_diff * 0.3
         
-        prediction_components['home_field'] = 2.5
+        prediction_components, confidence_score = self.combine_prediction_components(
+            ml_home_win_prob,
+            int(home_current['wins']) / max(home_games, 1),
+            int(away_current['wins']) / max(away_games, 1),
+            float(home_historical['historical_win_pct']),
+            float(away_historical['historical_win_pct']),
+            float(home_current['avg_points_scored']),
+            float(away_current['avg_points_scored']),
+            float(home_current['avg_points_allowed']),
+            float(away_current['avg_points_allowed']),
+            float(home_injury['total_impact']),
+            float(away_injury['total_impact'])
+        )
         
         predicted_margin = sum(prediction_components.values())
         
         model_betting_line = -predicted_margin
         
-        confidence_score = 0
-        if abs(ml_spread_contribution) > 5:
-            confidence_score += 30
-        if abs(prediction_components['current_record']) > 3:
-            confidence_score += 25
-        if abs(injury_diff) > 15:
-            confidence_score += 20
-        if abs(prediction_components['offensive_power']) > 3:
-            confidence_score += 15
-        if abs(prediction_components['defensive_strength']) > 3:
-            confidence_score += 10
-        
-        if confidence_score >= 70:
-            confidence = 'HIGH'
-        elif confidence_score >= 45:
-            confidence = 'MEDIUM'
-        else:
-            confidence = 'LOW'
+        confidence = self.confidence_label(confidence_score)
         
         return {
             'home_team': home_team,
@@ -288,6 +423,39 @@ class MasterBettingPredictor:
             }
         }
     
+    def evaluate_edge(self, home_team, away_team, prediction, dk_lines):
+        """
+        Compare the model line against the DraftKings spread
+        
+        Returns:
+            (edge, recommended_bet) - both None when there is no line, and
+            recommended_bet is None when the edge is under 3 points
+        """
+        if not dk_lines or dk_lines['spread'] is None:
+            return None, None
+        
+        dk_spread = dk_lines['spread']
+        edge = prediction['model_betting_line'] - dk_spread
+        recommended_bet = None
+        
+        if abs(edge) >= 3.0:
+            if edge < 0:
+                if dk_spread > 0:
+                    recommended_bet = f"{home_team} +{dk_spread}"
+                elif dk_spread < 0:
+                    recommended_bet = f"{home_team} {dk_spread}"
+                else:
+                    recommended_bet = f"{home_team} PK"
+            else:
+                if dk_spread < 0:
+                    recommended_bet = f"{away_team} +{abs(dk_spread)}"
+                elif dk_spread > 0:
+                    recommended_bet = f"{away_team} {-dk_spread}"
+                else:
+                    recommended_bet = f"{away_team} PK"
+        
+        return edge, recommended_bet
+    
     def save_weekly_report(self, season, week, recommendations):
         """Save weekly analysis to a text file"""
         
@@ -316,7 +484,7 @@ class MasterBettingPredictor:
             
             f.write("\n" + "=" * 80 + "\n")
             f.write("After games complete, update results with:\n")
-            f.write("  python src/betting/roi_tracker.py\n")
+            f.write("  gridiron settle\n")
             f.write("=" * 80 + "\n")
         
         print(f"\n💾 Report saved to: {filename}")
@@ -332,7 +500,7 @@ class MasterBettingPredictor:
         self.train_ml_model()
         
         if store_predictions:
-            from analysis.calculate_weekly_accuracy import WeeklyAccuracyCalculator
+            from src.analysis.calculate_weekly_accuracy import WeeklyAccuracyCalculator
             accuracy_calc = WeeklyAccuracyCalculator()
         
         query = """
@@ -373,28 +541,7 @@ class MasterBettingPredictor:
             
             predicted_winner = 'HOME' if prediction['predicted_margin'] > 0 else 'AWAY'
             
-            edge = None
-            recommended_bet = None
-            
-            if dk_lines and dk_lines['spread'] is not None:
-                dk_spread = dk_lines['spread']
-                edge = prediction['model_betting_line'] - dk_spread
-                
-                if abs(edge) >= 3.0:
-                    if edge < 0:
-                        if dk_spread > 0:
-                            recommended_bet = f"{home} +{dk_spread}"
-                        elif dk_spread < 0:
-                            recommended_bet = f"{home} {dk_spread}"
-                        else:
-                            recommended_bet = f"{home} PK"
-                    else:
-                        if dk_spread < 0:
-                            recommended_bet = f"{away} +{abs(dk_spread)}"
-                        elif dk_spread > 0:
-                            recommended_bet = f"{away} {-dk_spread}"
-                        else:
-                            recommended_bet = f"{away} PK"
+            edge, recommended_bet = self.evaluate_edge(home, away, prediction, dk_lines)
             
             if store_predictions:
                 accuracy_calc.store_prediction(
@@ -477,15 +624,40 @@ class MasterBettingPredictor:
         if store_predictions:
             print("\n💾 Predictions stored in database for accuracy tracking")
             print(f"   After games complete, run:")
-            print(f"   python src/analysis/calculate_weekly_accuracy.py --season {season} --week {week}")
+            print(f"   gridiron grade --season {season} --week {week}")
 
         print("\n💡 Analysis complete! Good luck! 🍀")
         print("=" * 80)
 
-if __name__ == "__main__":
+def prepare_predictor(week=None, season=2025):
+    """
+    A predictor trained on every completed `season` week before `week`
+    (default: the current week); returns (predictor, week). Shared by the
+    prediction, matchup matrix and snapshot steps so one process trains once
+    """
     predictor = MasterBettingPredictor()
-    completed_week = 6
-    if completed_week:
-        print(f"📊 Using 2025 data through Week {completed_week} for training")
-        predictor.train_ml_model(max_week_2025=completed_week)
-    predictor.analyze_week(season=2025, week=7)
\ No newline at end of file
+    week = week or predictor.injury_analyzer.get_current_nfl_week()
+    if week > 1:
+        print(f"📊 Using {season} data through Week {week - 1} for training")
+        predictor.train_ml_model(max_week_2025=week - 1, season=season)
+    return predictor, week
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate betting predictions for a week')
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--week', type=int, help='Week to predict (default: current week)')
+    args = parser.parse_args(argv)
+
+    predictor, week = prepare_predictor(args.week, args.season)
+    if os.getenv('DB_PROFILE'):
+        with predictor.db.profile('analyze_week', export_path=os.getenv('DB_PROFILE')):
+            predictor.analyze_week(season=args.season, week=week)
+    else:
+        predictor.analyze_week(season=args.season, week=week)
+    return predictor, week
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Head-to-Head Matchup Matrix
+Precomputes every ordered home/away pairing for a (season, week) in one batch
+so the MATCHUP tab can look predictions up instead of computing them live
+"""
+
+from src.models.master_betting_predictor import MasterBettingPredictor, prepare_predictor
+from src.lazy_imports import lazy_import
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+from datetime import datetime
+
+COMPONENT_COLUMNS = [
+    'ml_model', 'current_record', 'historical_trend', 'offensive_power',
+    'defensive_strength', 'injury_impact', 'home_field'
+]
+
+MATCHUP_MATRIX_TABLE = """
+    CREATE TABLE IF NOT EXISTS matchup_matrix (
+        season INT NOT NULL,
+        week INT NOT NULL,
+        home_team VARCHAR(10) NOT NULL,
+        away_team VARCHAR(10) NOT NULL,
+        home_record VARCHAR(10),
+        away_record VARCHAR(10),
+        predicted_margin FLOAT,
+        model_betting_line FLOAT,
+        ml_home_win_probability FLOAT,
+        confidence VARCHAR(10),
+        confidence_score INT,
+        ml_model FLOAT,
+        current_record FLOAT,
+        historical_trend FLOAT,
+        offensive_power FLOAT,
+        defensive_strength FLOAT,
+        injury_impact FLOAT,
+        home_field FLOAT,
+        home_injury_impact FLOAT,
+        away_injury_impact FLOAT,
+        critical_home INT,
+        critical_away INT,
+        home_trend VARCHAR(20),
+        away_trend VARCHAR(20),
+        computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (season, week, home_team, away_team)
+    )
+"""
+
+
+class MatchupMatrixBuilder:
+    """Build, store and look up the 32x32 head-to-head prediction matrix"""
+
+    def __init__(self, predictor=None):
+        self.predictor = predictor or MasterBettingPredictor()
+        self.db = self.predictor.db
+
+    def build_team_vectors(self, season, week):
+        """Collect the per-team inputs shared by every matchup"""
+        current = self.predictor.get_all_team_current_stats(season, week)
+        historical = self.predictor.get_all_historical_performance()
+
+        teams = sorted(current.keys())
+        rows = []
+        for team in teams:
+            stats = current[team]
+            history = historical.get(team, {'historical_win_pct': 0.5, 'trend': 'neutral'})
+            injury = self.predictor.injury_analyzer.get_team_injury_impact(team, season, week)
+            games = stats['wins'] + stats['losses']
+
+            rows.append({
+                'team': team,
+                'wins': stats['wins'],
+                'losses': stats['losses'],
+                'win_pct': stats['wins'] / max(games, 1),
+                'avg_points_scored': stats['avg_points_scored'],
+                'avg_points_allowed': stats['avg_points_allowed'],
+                'historical_win_pct': float(history['historical_win_pct']),
+                'trend': history['trend'],
+                'injury_impact': float(injury['total_impact']),
+                'critical_injuries': len(injury['critical_injuries'])
+            })
+
+        return pd.DataFrame(rows)
+
+    def calculate_matrix(self, season, week):
+        """
+        Compute all ordered home/away pairings in one vectorized pass
+
+        Returns a DataFrame with one row per (home_team, away_team)
+        """
+        self.predictor.train_ml_model()
+
+        vectors = self.build_team_vectors(season, week)
+        n_teams = len(vectors)
+
+        home_idx, away_idx = np.where(~np.eye(n_teams, dtype=bool))
+        home = vectors.iloc[home_idx].reset_index(drop=True)
+        away = vectors.iloc[away_idx].reset_index(drop=True)
+
+        features = pd.DataFrame({
+            'home_wins': home['wins'],
+            'home_losses': home['losses'],
+            'home_win_pct': home['win_pct'],
+            'home_avg_points_scored': home['avg_points_scored'],
+            'home_avg_points_allowed': home['avg_points_allowed'],
+            'away_wins': away['wins'],
+            'away_losses': away['losses'],
+            'away_win_pct': away['win_pct'],
+            'away_avg_points_scored': away['avg_points_scored'],
+            'away_avg_points_allowed': away['avg_points_allowed']
+        })
+
+        ml_home_win_prob = self.predictor.ml_predictor.model.predict_proba(features)[:, 1]
+
+        components, confidence_score = self.predictor.combine_prediction_components(
+            ml_home_win_prob,
+            home['win_pct'].to_numpy(), away['win_pct'].to_numpy(),
+            home['historical_win_pct'].to_numpy(), away['historical_win_pct'].to_numpy(),
+            home['avg_points_scored'].to_numpy(), away['avg_points_scored'].to_numpy(),
+            home['avg_points_allowed'].to_numpy(), away['avg_points_allowed'].to_numpy(),
+            home['injury_impact'].to_numpy(), away['injury_impact'].to_numpy()
+        )
+
+        predicted_margin = sum(components.values())
+
+        matrix = pd.DataFrame({
+            'season': season,
+            'week': week,
+            'home_team': home['team'],
+            'away_team': away['team'],
+            'home_record': home['wins'].astype(str) + '-' + home['losses'].astype(str),
+            'away_record': away['wins'].astype(str) + '-' + away['losses'].astype(str),
+            'predicted_margin': predicted_margin,
+            'model_betting_line': -predicted_margin,
+            'ml_home_win_probability': ml_home_win_prob,
+            'confidence': [self.predictor.confidence_label(s) for s in confidence_score],
+            'confidence_score': confidence_score
+        })
+
+        for column in COMPONENT_COLUMNS:
+            matrix[column] = np.broadcast_to(components[column], len(matrix))
+
+        matrix['home_injury_impact'] = home['injury_impact']
+        matrix['away_injury_impact'] = away['injury_impact']
+        matrix['critical_home'] = home['critical_injuries']
+        matrix['critical_away'] = away['critical_injuries']
+        matrix['home_trend'] = home['trend']
+        matrix['away_trend'] = away['trend']
+
+        return matrix
+
+    def save_matrix(self, matrix):
+        """Replace the stored matrix for the matrix's (season, week)"""
+        self.db.execute_update(MATCHUP_MATRIX_TABLE)
+
+        season = int(matrix['season'].iloc[0])
+        week = int(matrix['week'].iloc[0])
+
+        columns = list(matrix.columns)
+        query = f"""
+            INSERT INTO matchup_matrix ({', '.join(columns)})
+            VALUES ({', '.join(['%s'] * len(columns))})
+        """
+        rows = [
+            tuple(v.item() if isinstance(v, np.generic) else v for v in row)
+            for row in matrix[columns].itertuples(index=False, name=None)
+        ]
+
+        # One transaction, so readers never see the week with no matrix
+        with self.db.session() as session:
+            session.execute(
+                "DELETE FROM matchup_matrix WHERE season = %s AND week = %s",
+                (season, week)
+            )
+            return session.execute_many(query, rows)
+
+    def load_matrix(self, season, week):
+        """
+        Load a stored matrix as {(home_team, away_team): prediction}
+
+        Each prediction has the same shape as
+        MasterBettingPredictor.calculate_comprehensive_prediction()
+        """
+        try:
+            rows = self.db.execute_query("""
+                SELECT * FROM matchup_matrix
+                WHERE season = %s AND week = %s
+            """, (season, week))
+        except Exception:
+            return {}
+
+        return {(row['home_team'], row['away_team']): self.row_to_prediction(row) for row in rows}
+
+    def row_to_prediction(self, row):
+        """Convert a stored matrix row back into a prediction dict"""
+        return {
+            'home_team': row['home_team'],
+            'away_team': row['away_team'],
+            'home_record': row['home_record'],
+            'away_record': row['away_record'],
+            'predicted_margin': float(row['predicted_margin']),
+            'model_betting_line': float(row['model_betting_line']),
+            'ml_home_win_probability': float(row['ml_home_win_probability']),
+            'confidence': row['confidence'],
+            'confidence_score': int(row['confidence_score']),
+            'components': {c: float(row[c]) for c in COMPONENT_COLUMNS},
+            'injury_impact': {
+                'home': float(row['home_injury_impact']),
+                'away': float(row['away_injury_impact']),
+                'critical_home': int(row['critical_home']),
+                'critical_away': int(row['critical_away'])
+            },
+            'historical': {
+                'home_trend': row['home_trend'],
+                'away_trend': row['away_trend']
+            }
+        }
+
+    def run(self, season, week):
+        """Compute and store the matrix for one week"""
+        print("=" * 70)
+        print(f"BUILDING MATCHUP MATRIX - Season {season} Week {week}")
+        print("=" * 70)
+
+        started = datetime.now()
+        matrix = self.calculate_matrix(season, week)
+        saved = self.save_matrix(matrix)
+        elapsed = (datetime.now() - started).total_seconds()
+
+        print(f"✓ Stored {saved} pairings for Week {week} in {elapsed:.1f}s")
+        return matrix
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Precompute head-to-head matchup predictions')
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--week', type=int)
+    args = parser.parse_args(argv)
+
+    predictor, week = prepare_predictor(args.week, args.season)
+
+    MatchupMatrixBuilder(predictor).run(args.season, week)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Prediction Refresh Worker
+Keeps the published prediction snapshots current in the background. Every
+interval seconds it fingerprints each watched week's inputs (completed
+results, injuries, depth charts, rosters, the week's schedule and the
+DraftKings lines) and, when the fingerprint moved, rebuilds and publishes a
+new snapshot version. Readers only ever follow latest.json, so the app keeps
+rendering the previous version until the new one is complete
+
+The Streamlit app starts one worker per server; it can also run on its own:
+
+    python -m src.models.prediction_refresh [--interval 120] [--odds-interval 900]
+"""
+import threading
+import time
+from datetime import datetime
+
+from src.database.db_manager import DatabaseManager
+from src.database.ingest_state import content_hash
+from src.models.matchup_matrix import MatchupMatrixBuilder
+from src.models.prediction_snapshot import SNAPSHOT_DIR, PredictionSnapshotWriter, load_snapshot
+
+# Tables whose writes change a week's predictions besides the games table
+INPUT_TABLES = ('injuries', 'depth_charts', 'player_seasons')
+
+
+class PredictionRefreshWorker:
+    """Background thread that republishes a week's snapshot when its inputs change"""
+
+    def __init__(self, season=2025, interval=120, odds_interval=900, watch_ttl=1800,
+                 snapshot_dir=SNAPSHOT_DIR):
+        self.season = season
+        self.interval = interval
+        self.odds_interval = odds_interval
+        self.watch_ttl = watch_ttl
+        self.snapshot_dir = snapshot_dir
+        self.db = DatabaseManager()
+
+        self.published = {}      # week -> inputs fingerprint of the latest published snapshot
+        self.watched = {}        # week -> monotonic time a reader last asked for it
+        self.forced = set()      # weeks to rebuild on the next pass whatever the fingerprint
+
+        self._predictors = {}    # week -> (results trained on, predictor trained through week - 1)
+        self._odds_client = None
+        self._odds = None
+        self._odds_at = None
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._status = {'state': 'idle', 'week': None, 'last_check': None,
+                        'last_published': None, 'last_error': None}
+
+    # ---- control -----------------------------------------------------------
+
+    def start(self):
+        """Start the background thread (no-op if it is already running)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name='prediction-refresh', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def watch(self, week):
+        """Keep a week fresh while readers are looking at it"""
+        with self._lock:
+            self.watched[week] = time.monotonic()
+
+    def request_refresh(self, week):
+        """Rebuild a week (and refetch the lines) on the next pass, starting it now"""
+        with self._lock:
+            self.watched[week] = time.monotonic()
+            self.forced.add(week)
+        self._wake.set()
+
+    def status(self):
+        """Snapshot of the worker's state for display"""
+        with self._lock:
+            status = dict(self._status)
+        status['running'] = self._thread is not None and self._thread.is_alive()
+        return status
+
+    def _set_status(self, **changes):
+        with self._lock:
+            self._status.update(changes)
+
+    # ---- inputs ------------------------------------------------------------
+
+    def odds_client(self):
+        if self._odds_client is None:
+            from src.models.master_betting_predictor import MasterBettingPredictor
+            self._odds_client = MasterBettingPredictor()     # never trained, only fetches and parses lines
+        return self._odds_client
+
+    def fetch_odds(self, force=False):
+        """DraftKings lines, refetched at most every odds_interval seconds"""
+        now = time.monotonic()
+        if force or self._odds_at is None or now - self._odds_at >= self.odds_interval:
+            self._odds = self.odds_client().fetch_draftkings_lines()
+            self._odds_at = now
+        return self._odds
+
+    def week_lines(self, week, odds_data):
+        """
+        (home, away, spread, total) for each of the week's games
+
+        Only the lines the snapshot actually uses: the raw payload also
+        carries timestamps and other books that change on every fetch
+        """
+        games = self.db.execute_query("""
+            SELECT ht.abbreviation AS home_team, at.abbreviation AS away_team
+            FROM games g
+            JOIN teams ht ON g.home_team_id = ht.team_id
+            JOIN teams at ON g.away_team_id = at.team_id
+            WHERE g.season = %s AND g.week = %s
+        """, (self.season, week))
+
+        lines = []
+        for game in games:
+            parsed = self.odds_client().parse_odds_for_game(odds_data, game['home_team'], game['away_team']) or {}
+            lines.append((game['home_team'], game['away_team'], parsed.get('spread'), parsed.get('total')))
+        return sorted(lines)
+
+    def week_results(self, week):
+        """(Final games before week, their total points, games scheduled in week)"""
+        row = self.db.execute_query("""
+            SELECT
+                SUM(CASE WHEN week < %s AND game_status = 'Final' THEN 1 ELSE 0 END) AS finals,
+                SUM(CASE WHEN week < %s AND game_status = 'Final' THEN home_score + away_score ELSE 0 END) AS points,
+                SUM(CASE WHEN week = %s THEN 1 ELSE 0 END) AS scheduled
+            FROM games
+            WHERE season = %s
+        """, (week, week, week, self.season))[0]
+        return tuple(int(row[k] or 0) for k in ('finals', 'points', 'scheduled'))
+
+    def inputs_version(self, week, odds_data):
+        """
+        Fingerprint of everything a week's snapshot is built from
+
+        Live score updates to the week itself don't count, so game-day
+        polling doesn't trigger a rebuild every few seconds
+        """
+        results = self.week_results(week)
+        return content_hash({
+            'results': results,
+            'tables': self.db.get_data_version(INPUT_TABLES),
+            'odds': self.week_lines(week, odds_data)
+        }), results
+
+    def predictor_for(self, week, results):
+        """A predictor trained through week - 1, retrained only when those results change"""
+        trained_on, predictor = self._predictors.get(week, (None, None))
+        if trained_on != results[:2]:
+            from src.models.master_betting_predictor import prepare_predictor
+            predictor, _ = prepare_predictor(week, self.season)
+            self._predictors[week] = (results[:2], predictor)
+        return predictor
+
+    # ---- refreshing --------------------------------------------------------
+
+    def refresh_week(self, week, force=False):
+        """Publish a new snapshot for week if its inputs changed; returns it or None"""
+        odds_data = self.fetch_odds(force)
+        version, results = self.inputs_version(week, odds_data)
+
+        if week not in self.published:
+            latest = load_snapshot(self.season, week, snapshot_dir=self.snapshot_dir)
+            self.published[week] = latest.get('inputs') if latest else None
+        if not force and self.published[week] == version:
+            return None
+
+        self._set_status(state='refreshing', week=week)
+        predictor = self.predictor_for(week, results)
+
+        # The snapshot's matchups come from the stored matrix, so recompute it
+        # with the same inputs as the games or the MATCHUP tab would disagree
+        builder = MatchupMatrixBuilder(predictor)
+        builder.save_matrix(builder.calculate_matrix(self.season, week))
+
+        writer = PredictionSnapshotWriter(predictor, self.snapshot_dir)
+        snapshot = writer.build(self.season, week, odds_data)
+        snapshot['inputs'] = version
+        writer.publish(snapshot)
+        self.published[week] = version
+
+        print(f"[{datetime.now():%H:%M:%S}] ✓ Week {week} snapshot {snapshot['version']} published "
+              f"({len(snapshot['games'])} games, {len(snapshot['recommendations'])} recommendations)")
+        self._set_status(last_published=snapshot['version'])
+        return snapshot
+
+    def pending_weeks(self):
+        """The current week plus weeks a reader asked for within watch_ttl, and the forced ones"""
+        from src.data_collection.fetch_games import get_current_nfl_week
+        now = time.monotonic()
+        with self._lock:
+            self.watched = {w: seen for w, seen in self.watched.items() if now - seen < self.watch_ttl}
+            forced, self.forced = self.forced, set()
+            weeks = set(self.watched) | forced | {get_current_nfl_week()}
+            self._predictors = {w: p for w, p in self._predictors.items() if w in weeks}
+        return sorted(weeks), forced
+
+    def check(self):
+        """One pass over every watched week"""
+        weeks, forced = self.pending_weeks()
+        published, errors = [], []
+        for week in weeks:
+            try:
+                if self.refresh_week(week, force=week in forced):
+                    published.append(week)
+            except Exception as e:
+                print(f"[{datetime.now():%H:%M:%S}] ❌ Week {week} refresh failed: {e}")
+                errors.append(f"Week {week}: {e}")
+        self._set_status(state='idle', week=None, last_check=datetime.now(),
+                         last_error='; '.join(errors) or None)
+        return published
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.check()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def run(self, max_passes=None):
+        """Refresh in the foreground until interrupted (or for max_passes passes)"""
+        print("=" * 70)
+        print(f"PREDICTION REFRESH - {self.season} (inputs every {self.interval}s, "
+              f"lines every {self.odds_interval}s)")
+        print("=" * 70)
+
+        passes = 0
+        try:
+            while max_passes is None or passes < max_passes:
+                passes += 1
+                published = self.check()
+                if not published:
+                    print(f"[{datetime.now():%H:%M:%S}] No input changes")
+                if max_passes is None or passes < max_passes:
+                    time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("\n⏹️  Stopped prediction refresh")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Republish prediction snapshots when their inputs change')
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--week', type=int, action='append', help='Also keep this week fresh (repeatable)')
+    parser.add_argument('--interval', type=int, default=120, help='Seconds between input checks')
+    parser.add_argument('--odds-interval', type=int, default=900, help='Seconds between DraftKings fetches')
+    parser.add_argument('--max-passes', type=int, help='Stop after this many passes')
+    args = parser.parse_args(argv)
+
+    worker = PredictionRefreshWorker(args.season, args.interval, args.odds_interval,
+                                     watch_ttl=float('inf'))
+    for week in args.week or []:
+        worker.watch(week)
+    worker.run(args.max_passes)
+
+
+if __name__ == "__main__":
+    main()
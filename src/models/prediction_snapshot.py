@@ -0,0 +1,234 @@
+"""
+Weekly Prediction Snapshots
+Writes a versioned, read-only artifact per (season, week) holding everything
+the Streamlit app renders, so page loads never train or query per game
+"""
+import os
+
+import json
+import gzip
+from datetime import datetime, date
+from decimal import Decimal
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Anchored to the project root (or SNAPSHOT_DIR) so the Streamlit server and
+# the CLI jobs share one tree whatever directory they were started from
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(PROJECT_ROOT, 'snapshots'))
+
+
+def _json_default(value):
+    """Serialize DB / NumPy values that json can't handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _week_dir(season, week, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, str(season), f"week_{week:02d}")
+
+
+def _write_atomic(path, data):
+    """Write bytes to path so readers only ever see a complete file"""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def get_latest_version(season, week, snapshot_dir=SNAPSHOT_DIR):
+    """Return the latest published version id for a week, or None"""
+    pointer = os.path.join(_week_dir(season, week, snapshot_dir), 'latest.json')
+    try:
+        with open(pointer) as f:
+            return json.load(f)['version']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_snapshot(season, week, version=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Load a published snapshot (the latest one unless a version is given)
+
+    Returns None when nothing has been published for the week
+    """
+    version = version or get_latest_version(season, week, snapshot_dir)
+    if not version:
+        return None
+
+    path = os.path.join(_week_dir(season, week, snapshot_dir), f"{version}.json.gz")
+    try:
+        with gzip.open(path, 'rt') as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+
+class PredictionSnapshotWriter:
+    """Build and publish the weekly prediction snapshot"""
+
+    def __init__(self, predictor=None, snapshot_dir=SNAPSHOT_DIR):
+        from src.models.master_betting_predictor import MasterBettingPredictor
+        self.predictor = predictor or MasterBettingPredictor()
+        self.db = self.predictor.db
+        self.snapshot_dir = snapshot_dir
+
+    def build_games(self, season, week, odds_data):
+        """Predict every game of the week and attach the DraftKings edge"""
+        games = self.db.execute_query("""
+            SELECT g.game_id, ht.abbreviation as home_team, at.abbreviation as away_team
+            FROM games g
+            JOIN teams ht ON g.home_team_id = ht.team_id
+            JOIN teams at ON g.away_team_id = at.team_id
+            WHERE g.season = %s AND g.week = %s
+            ORDER BY g.game_date
+        """, (season, week))
+
+        game_entries = []
+        recommendations = []
+
+        for game in games:
+            home = game['home_team']
+            away = game['away_team']
+
+            prediction = self.predictor.calculate_comprehensive_prediction(home, away, season, week)
+            dk_lines = self.predictor.parse_odds_for_game(odds_data, home, away) if odds_data else None
+            edge, recommended_bet = self.predictor.evaluate_edge(home, away, prediction, dk_lines)
+
+            game_entries.append({
+                'game_id': game['game_id'],
+                'home_team': home,
+                'away_team': away,
+                'prediction': prediction,
+                'vegas_spread': dk_lines['spread'] if dk_lines else None,
+                'vegas_total': dk_lines['total'] if dk_lines else None,
+                'edge': edge,
+                'recommended_bet': recommended_bet
+            })
+
+            if recommended_bet:
+                recommendations.append({
+                    'game': f"{away} @ {home}",
+                    'bet': recommended_bet,
+                    'edge': edge,
+                    'confidence': prediction['confidence'],
+                    'ml_prob': prediction['ml_home_win_probability'],
+                    'model_betting_line': prediction['model_betting_line'],
+                    'vegas_spread': dk_lines['spread']
+                })
+
+        recommendations.sort(key=lambda x: abs(x['edge']), reverse=True)
+        return game_entries, recommendations
+
+    def build_injuries(self, season, week):
+        """Injury impact summary for every team"""
+        teams = self.db.get_all_teams()
+        return {
+            team['abbreviation']: self.predictor.injury_analyzer.get_team_injury_impact(
+                team['abbreviation'], season, week
+            )
+            for team in teams
+        }
+
+    def build_accuracy(self, season):
+        """Weekly accuracy rows for the season"""
+        try:
+            return self.db.execute_query("""
+                SELECT
+                    week,
+                    total_predictions,
+                    correct_predictions,
+                    accuracy_pct,
+                    spread_3pt_accuracy,
+                    spread_7pt_accuracy,
+                    avg_margin_error,
+                    high_conf_total,
+                    high_conf_correct,
+                    calculated_date
+                FROM weekly_accuracy
+                WHERE season = %s
+                ORDER BY week
+            """, (season,))
+        except Exception as e:
+            print(f"⚠️  Could not load weekly accuracy: {e}")
+            return []
+
+    def build_matchups(self, season, week):
+        """Precomputed head-to-head predictions, if the matrix has been built"""
+        from src.models.matchup_matrix import MatchupMatrixBuilder
+        matrix = MatchupMatrixBuilder(self.predictor).load_matrix(season, week)
+        return list(matrix.values())
+
+    def build(self, season, week, odds_data=None):
+        """Assemble the full snapshot for one week (fetching the lines unless given)"""
+        self.predictor.train_ml_model()
+
+        if odds_data is None:
+            odds_data = self.predictor.fetch_draftkings_lines()
+        games, recommendations = self.build_games(season, week, odds_data)
+
+        generated_at = datetime.now()
+
+        return {
+            'season': season,
+            'week': week,
+            # Microseconds keep two publishes in the same second (the refresh
+            # worker and a manual run) from overwriting each other
+            'version': generated_at.strftime('%Y%m%dT%H%M%S%f'),
+            'generated_at': generated_at,
+            'odds_available': bool(odds_data),
+            'games': games,
+            'recommendations': recommendations,
+            'injuries': self.build_injuries(season, week),
+            'accuracy': self.build_accuracy(season),
+            'matchups': self.build_matchups(season, week)
+        }
+
+    def publish(self, snapshot):
+        """Write the snapshot as a new version and point latest.json at it"""
+        week_dir = _week_dir(snapshot['season'], snapshot['week'], self.snapshot_dir)
+        os.makedirs(week_dir, exist_ok=True)
+
+        payload = json.dumps(snapshot, default=_json_default).encode('utf-8')
+        path = os.path.join(week_dir, f"{snapshot['version']}.json.gz")
+        _write_atomic(path, gzip.compress(payload))
+
+        pointer = json.dumps({'version': snapshot['version']}).encode('utf-8')
+        _write_atomic(os.path.join(week_dir, 'latest.json'), pointer)
+
+        return path
+
+    def run(self, season, week):
+        """Build and publish the snapshot for one week"""
+        print("=" * 70)
+        print(f"PUBLISHING PREDICTION SNAPSHOT - Season {season} Week {week}")
+        print("=" * 70)
+
+        snapshot = self.build(season, week)
+        path = self.publish(snapshot)
+
+        print(f"✓ {len(snapshot['games'])} games, {len(snapshot['recommendations'])} recommendations")
+        print(f"✓ Snapshot {snapshot['version']} written to {path}")
+        return snapshot
+
+
+def main(argv=None):
+    import argparse
+    from src.models.master_betting_predictor import prepare_predictor
+
+    parser = argparse.ArgumentParser(description='Publish the weekly prediction snapshot')
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--week', type=int)
+    args = parser.parse_args(argv)
+
+    predictor, week = prepare_predictor(args.week, args.season)
+
+    PredictionSnapshotWriter(predictor).run(args.season, week)
+
+
+if __name__ == "__main__":
+    main()
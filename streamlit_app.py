@@ -1,14 +1,14 @@
 import streamlit as st
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.models.master_betting_predictor import MasterBettingPredictor
+from src.models.matchup_matrix import MatchupMatrixBuilder
 from src.analysis.injury_impact import InjuryImpactAnalyzer
 from src.database.db_manager import DatabaseManager
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from src.models.prediction_snapshot import load_snapshot, get_latest_version
+from src.models.prediction_refresh import PredictionRefreshWorker
+from src.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
 
 st.set_page_config(page_title="Gridiron Prophet", page_icon="🏈", layout="wide", initial_sidebar_state="collapsed")
 
@@ -18,6 +18,100 @@ def load_predictor():
     predictor.train_ml_model()
     return predictor
 
+@st.cache_resource
+def get_db():
+    return DatabaseManager()
+
+@st.cache_resource
+def get_refresh_worker():
+    # One background refresher per server process, shared by every session
+    return PredictionRefreshWorker(season=2025).start()
+
+@st.cache_resource
+def get_injury_analyzer():
+    return InjuryImpactAnalyzer()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_data_version(*tables):
+    return get_db().get_data_version(tables)
+
+@st.cache_data(show_spinner=False)
+def load_team_abbreviations(data_version):
+    return sorted([t['abbreviation'] for t in get_db().get_all_teams()])
+
+@st.cache_data(show_spinner=False)
+def load_team_injury_impact(team, season, week, data_version):
+    return get_injury_analyzer().get_team_injury_impact(team, season, week)
+
+@st.cache_data(show_spinner=False)
+def load_team_roster(team, season, data_version):
+    query = """
+        SELECT DISTINCT
+            p.name as player_name,
+            ps.position,
+            ps.jersey_number,
+            ps.status,
+            p.height,
+            p.weight,
+            p.college,
+            ps.years_in_league,
+            ps.games_played,
+            ps.games_started
+        FROM player_seasons ps
+        JOIN players p ON ps.player_id = p.player_id
+        WHERE ps.team_id = (SELECT team_id FROM teams WHERE abbreviation = %s)
+        AND ps.season = %s
+        AND ps.roster_status = 'Active'
+        ORDER BY 
+            CASE ps.position
+                WHEN 'QB' THEN 1
+                WHEN 'RB' THEN 2
+                WHEN 'WR' THEN 3
+                WHEN 'TE' THEN 4
+                WHEN 'OL' THEN 5
+                WHEN 'DL' THEN 6
+                WHEN 'LB' THEN 7
+                WHEN 'DB' THEN 8
+                WHEN 'K' THEN 9
+                WHEN 'P' THEN 10
+                ELSE 11
+            END,
+            p.name
+    """
+    return get_db().execute_query(query, (team, season))
+
+@st.cache_data(show_spinner=False)
+def load_weekly_accuracy(season, data_version):
+    return get_db().query_frame("""
+        SELECT 
+            week,
+            total_predictions,
+            correct_predictions,
+            accuracy_pct,
+            spread_3pt_accuracy,
+            spread_7pt_accuracy,
+            avg_margin_error,
+            high_conf_total,
+            high_conf_correct,
+            calculated_date
+        FROM weekly_accuracy
+        WHERE season = %s
+        ORDER BY week
+    """, (season,))
+
+@st.cache_data(show_spinner=False)
+def load_week_snapshot(season, week, version):
+    if not version:
+        return None
+    return load_snapshot(season, week, version)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_matchup_matrix(season, week, version):
+    snapshot = load_week_snapshot(season, week, version)
+    if snapshot and snapshot.get('matchups'):
+        return {(m['home_team'], m['away_team']): m for m in snapshot['matchups']}
+    return MatchupMatrixBuilder(MasterBettingPredictor()).load_matrix(season, week)
+
 st.markdown("""
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;900&display=swap');
@@ -296,6 +390,15 @@ if 'current_season' not in st.session_state:
 if 'current_week' not in st.session_state:
     st.session_state.current_week = 6
 
+refresh_worker = get_refresh_worker()
+refresh_worker.watch(st.session_state.current_week)
+
+week_snapshot = load_week_snapshot(
+    st.session_state.current_season,
+    st.session_state.current_week,
+    get_latest_version(st.session_state.current_season, st.session_state.current_week)
+)
+
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📊 THIS WEEK", "🏥 INJURIES", "⚔️ MATCHUP", "👥 ROSTERS", "📈 STATS", "❓ FAQ"])
 
 with tab1:
@@ -309,7 +412,7 @@ with tab1:
     
     with col3:
         if st.button("🔄 REFRESH", use_container_width=True):
-            st.session_state.predictions_loaded = False
+            refresh_worker.request_refresh(st.session_state.current_week)
             st.rerun()
     
     with st.expander("💡 Quick Reference - Reading Edge Values", expanded=False):
@@ -327,73 +430,20 @@ with tab1:
             - Example: Edge +7.5 = Away team undervalued
             """)
     
-    if not st.session_state.predictions_loaded:
-        st.info(f"🔮 Auto-loading Week {st.session_state.current_week} predictions...")
-        with st.spinner("Training model and analyzing games..."):
-            try:
-                predictor = load_predictor()
-                
-                odds_data = predictor.fetch_draftkings_lines()
-                
-                query = """
-                    SELECT g.game_id, ht.abbreviation as home_team, at.abbreviation as away_team
-                    FROM games g
-                    JOIN teams ht ON g.home_team_id = ht.team_id
-                    JOIN teams at ON g.away_team_id = at.team_id
-                    WHERE g.season = %s AND g.week = %s
-                    ORDER BY g.game_date
-                """
-                
-                games = predictor.db.execute_query(query, (st.session_state.current_season, st.session_state.current_week))
-                
-                if games:
-                    recommendations = []
-                    
-                    for game in games:
-                        home = game['home_team']
-                        away = game['away_team']
-                        
-                        prediction = predictor.calculate_comprehensive_prediction(home, away, st.session_state.current_season, st.session_state.current_week)
-                        dk_lines = predictor.parse_odds_for_game(odds_data, home, away) if odds_data else None
-                        
-                        if dk_lines and dk_lines['spread'] is not None:
-                            dk_spread = dk_lines['spread']
-                            edge = prediction['model_betting_line'] - dk_spread
-                            
-                            if abs(edge) >= 3.0:
-                                if edge < 0:
-                                    if dk_spread > 0:
-                                        recommended_bet = f"{home} +{dk_spread}"
-                                    elif dk_spread < 0:
-                                        recommended_bet = f"{home} {dk_spread}"
-                                    else:
-                                        recommended_bet = f"{home} PK"
-                                else:
-                                    if dk_spread < 0:
-                                        recommended_bet = f"{away} +{abs(dk_spread)}"
-                                    elif dk_spread > 0:
-                                        recommended_bet = f"{away} {-dk_spread}"
-                                    else:
-                                        recommended_bet = f"{away} PK"
-                                
-                                recommendations.append({
-                                    'game': f"{away} @ {home}",
-                                    'bet': recommended_bet,
-                                    'edge': edge,
-                                    'confidence': prediction['confidence'],
-                                    'ml_prob': prediction['ml_home_win_probability'],
-                                    'model_betting_line': prediction['model_betting_line'],
-                                    'vegas_spread': dk_spread
-                                })
-                    
-                    st.session_state.recommendations = sorted(recommendations, key=lambda x: abs(x['edge']), reverse=True)
-                    st.session_state.predictions_loaded = True
-                    st.rerun()
-                else:
-                    st.warning(f"No games found for Week {st.session_state.current_week}")
-                    
-            except Exception as e:
-                st.error(f"Error loading predictions: {str(e)}")
+    if week_snapshot:
+        st.session_state.recommendations = week_snapshot['recommendations']
+        st.session_state.predictions_loaded = True
+        st.caption(f"Predictions snapshot {week_snapshot['version']} · generated {week_snapshot['generated_at'][:16].replace('T', ' ')}")
+    else:
+        st.session_state.recommendations = []
+        st.session_state.predictions_loaded = False
+        st.info(f"🔮 Week {st.session_state.current_week} predictions haven't been published yet. They are being computed in the background and appear here when ready.")
+
+    refresh_status = refresh_worker.status()
+    if refresh_status['state'] == 'refreshing':
+        st.caption(f"🔄 Updating Week {refresh_status['week']} predictions in the background — showing the last published snapshot until then")
+    elif refresh_status['last_error']:
+        st.caption(f"⚠️ Background refresh failed: {refresh_status['last_error']}")
     
     if st.session_state.predictions_loaded and st.session_state.recommendations:
         
@@ -564,9 +614,7 @@ with tab1:
 with tab2:
     st.markdown("<div class='section-header'>INJURY ANALYSIS</div>", unsafe_allow_html=True)
     
-    analyzer = InjuryImpactAnalyzer()
-    teams = analyzer.db.get_all_teams()
-    team_abbrs = sorted([t['abbreviation'] for t in teams])
+    team_abbrs = load_team_abbreviations(get_data_version('teams'))
     
     col1, col2 = st.columns([1, 2])
     
@@ -577,7 +625,13 @@ with tab2:
         if st.button("📋 GET INJURY REPORT", use_container_width=True):
             with st.spinner(f"Analyzing {selected_team} injuries..."):
                 try:
-                    impact = analyzer.get_team_injury_impact(selected_team, st.session_state.current_season, st.session_state.current_week)
+                    if week_snapshot and selected_team in week_snapshot['injuries']:
+                        impact = week_snapshot['injuries'][selected_team]
+                    else:
+                        impact = load_team_injury_impact(
+                            selected_team, st.session_state.current_season, st.session_state.current_week,
+                            get_data_version('injuries', 'players', 'player_seasons', 'depth_charts', 'teams')
+                        )
                     
                     if not impact:
                         st.error("Unable to load injury data")
@@ -653,9 +707,7 @@ with tab2:
 with tab3:
     st.markdown("<div class='section-header'>HEAD-TO-HEAD MATCHUP</div>", unsafe_allow_html=True)
     
-    analyzer = InjuryImpactAnalyzer()
-    teams = analyzer.db.get_all_teams()
-    team_abbrs = sorted([t['abbreviation'] for t in teams])
+    team_abbrs = load_team_abbreviations(get_data_version('teams'))
     
     col1, col2, col3 = st.columns([2, 1, 2])
     
@@ -670,9 +722,16 @@ with tab3:
     
     if st.button("⚔️ ANALYZE MATCHUP", use_container_width=True):
         with st.spinner("Comparing teams..."):
-            predictor = load_predictor()
+            matchup_matrix = load_matchup_matrix(
+                st.session_state.current_season,
+                st.session_state.current_week,
+                week_snapshot['version'] if week_snapshot else None
+            )
+            prediction = matchup_matrix.get((home_team, away_team))
             
-            prediction = predictor.calculate_comprehensive_prediction(home_team, away_team, st.session_state.current_season, st.session_state.current_week)
+            if prediction is None:
+                predictor = load_predictor()
+                prediction = predictor.calculate_comprehensive_prediction(home_team, away_team, st.session_state.current_season, st.session_state.current_week)
             
             st.markdown(f"<div class='game-title' style='text-align: center; margin: 2rem 0;'>{away_team} @ {home_team}</div>", unsafe_allow_html=True)
             
@@ -738,9 +797,7 @@ with tab3:
 with tab4:
     st.markdown("<div class='section-header'>TEAM ROSTERS</div>", unsafe_allow_html=True)
     
-    analyzer = InjuryImpactAnalyzer()
-    teams = analyzer.db.get_all_teams()
-    team_abbrs = sorted([t['abbreviation'] for t in teams])
+    team_abbrs = load_team_abbreviations(get_data_version('teams'))
     
     col1, col2 = st.columns([1, 2])
     
@@ -750,41 +807,10 @@ with tab4:
     with col2:
         if st.button("📋 LOAD ROSTER", use_container_width=True):
             with st.spinner(f"Loading {selected_team} roster..."):
-                query = """
-                    SELECT DISTINCT
-                        p.name as player_name,
-                        ps.position,
-                        ps.jersey_number,
-                        ps.status,
-                        p.height,
-                        p.weight,
-                        p.college,
-                        ps.years_in_league,
-                        ps.games_played,
-                        ps.games_started
-                    FROM player_seasons ps
-                    JOIN players p ON ps.player_id = p.player_id
-                    WHERE ps.team_id = (SELECT team_id FROM teams WHERE abbreviation = %s)
-                    AND ps.season = %s
-                    AND ps.roster_status = 'Active'
-                    ORDER BY 
-                        CASE ps.position
-                            WHEN 'QB' THEN 1
-                            WHEN 'RB' THEN 2
-                            WHEN 'WR' THEN 3
-                            WHEN 'TE' THEN 4
-                            WHEN 'OL' THEN 5
-                            WHEN 'DL' THEN 6
-                            WHEN 'LB' THEN 7
-                            WHEN 'DB' THEN 8
-                            WHEN 'K' THEN 9
-                            WHEN 'P' THEN 10
-                            ELSE 11
-                        END,
-                        p.name
-                """
-                
-                roster = analyzer.db.execute_query(query, (selected_team, st.session_state.current_season))
+                roster = load_team_roster(
+                    selected_team, st.session_state.current_season,
+                    get_data_version('teams', 'players', 'player_seasons')
+                )
                 
                 if roster:
                     st.success(f"✅ {len(roster)} active players")
@@ -810,28 +836,9 @@ with tab4:
 with tab5:
     st.markdown("<div class='section-header'>WEEKLY ACCURACY</div>", unsafe_allow_html=True)
     
-    db = DatabaseManager()
-    
-    accuracy_data = db.execute_query("""
-        SELECT 
-            week,
-            total_predictions,
-            correct_predictions,
-            accuracy_pct,
-            spread_3pt_accuracy,
-            spread_7pt_accuracy,
-            avg_margin_error,
-            high_conf_total,
-            high_conf_correct,
-            calculated_date
-        FROM weekly_accuracy
-        WHERE season = %s
-        ORDER BY week
-    """, (st.session_state.current_season,))
+    df = load_weekly_accuracy(st.session_state.current_season, get_data_version('weekly_accuracy'))
     
-    if accuracy_data:
-        df = pd.DataFrame(accuracy_data)
-        
+    if not df.empty:
         df['high_conf_accuracy'] = df.apply(
             lambda row: (row['high_conf_correct'] / row['high_conf_total'] * 100) 
             if row['high_conf_total'] and row['high_conf_total'] > 0 else None,
@@ -889,6 +896,9 @@ with tab5:
         
         st.markdown("<br>", unsafe_allow_html=True)
         
+        # plotly is only needed for this chart; keep it off the startup path
+        import plotly.graph_objects as go
+        
         fig = go.Figure()
         
         fig.add_trace(go.Scatter(
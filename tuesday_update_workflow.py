@@ -1,13 +1,15 @@
-import sys
+import os
 from pathlib import Path
 from datetime import datetime
-import subprocess
 import time
+import traceback
 
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
-
+from src import cli
 from src.database.db_manager import DatabaseManager
+from src.models.matchup_matrix import MatchupMatrixBuilder
+from src.models.prediction_snapshot import PredictionSnapshotWriter
+
+project_root = Path(__file__).parent
 
 
 def print_header(title: str):
@@ -21,26 +23,22 @@ def print_step(step_num: int, total_steps: int, description: str):
     print("-" * 70)
 
 
-def run_script(script_path: Path, description: str) -> bool:
+def run_step(step, description: str, *args) -> bool:
+    # Steps run in this process, so imports and the trained model are shared
     try:
-        print(f"▶️  Running {script_path.name}...")
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            capture_output=False,
-            text=True,
-            cwd=project_root
-        )
-        
-        if result.returncode != 0:
+        print(f"▶️  Running {description}...")
+        step(*args)
+    except SystemExit as e:
+        if e.code not in (None, 0):
             print(f"❌ Error in {description}")
             return False
-        
-        print(f"✅ {description} completed successfully")
-        return True
-        
     except Exception as e:
         print(f"❌ Failed to run {description}: {e}")
+        traceback.print_exc()
         return False
+    
+    print(f"✅ {description} completed successfully")
+    return True
 
 
 def get_current_nfl_week() -> int:
@@ -149,16 +147,12 @@ def main():
     current_week = get_current_nfl_week()
     print(f"📊 Current NFL Week: {current_week}")
     
-    total_steps = 7
+    total_steps = 10
     completed_steps = 0
     failed_steps = []
     
-    src_dir = project_root / 'src'
-    data_collection_dir = src_dir / 'data_collection'
-    models_dir = src_dir / 'models'
-    
     print_step(1, total_steps, "Update Game Results")
-    if run_script(data_collection_dir / 'fetch_games.py', "Game Results"):
+    if run_step(cli.ingest_games, "Game Results"):
         completed_steps += 1
     else:
         failed_steps.append("Game Results")
@@ -166,7 +160,7 @@ def main():
     time.sleep(2)
     
     print_step(2, total_steps, "Update Rosters (Trades & New Signings)")
-    if run_script(data_collection_dir / 'smart_roster_updater.py', "Roster Updates"):
+    if run_step(cli.ingest_rosters, "Roster Updates"):
         completed_steps += 1
     else:
         print("⚠️  Roster update failed - continuing with existing rosters")
@@ -177,24 +171,12 @@ def main():
     print_step(3, total_steps, "Calculate Previous Week Accuracy")
     previous_week = current_week - 1
     if previous_week > 0:
-        print(f"\n📊 Calculating accuracy for completed Week {previous_week}...")
-        try:
-            result = subprocess.run(
-                [sys.executable, str(src_dir / 'analysis' / 'calculate_weekly_accuracy.py'),
-                 '--season', '2025', '--week', str(previous_week)],
-                capture_output=False,
-                text=True,
-                cwd=project_root
-            )
-            
-            if result.returncode == 0:
-                print(f"✅ Week {previous_week} accuracy calculated and stored")
-                completed_steps += 1
-            else:
-                print(f"⚠️  Could not calculate Week {previous_week} accuracy (games may not be complete)")
-                failed_steps.append("Accuracy Calculation (non-critical)")
-        except Exception as e:
-            print(f"⚠️  Accuracy calculation skipped: {e}")
+        print(f"\n📊 Grading newly completed games through Week {previous_week}...")
+        if run_step(cli.main, f"Week {previous_week} Accuracy",
+                    ['grade', '--season', '2025', '--all', '--incremental']):
+            completed_steps += 1
+        else:
+            print(f"⚠️  Could not calculate Week {previous_week} accuracy (games may not be complete)")
             failed_steps.append("Accuracy Calculation (non-critical)")
     else:
         print("\n⏭️  Skipping accuracy calculation (no previous week)")
@@ -203,7 +185,7 @@ def main():
     time.sleep(2)
     
     print_step(4, total_steps, "Update Injuries (ESPN Scraper)")
-    if run_script(data_collection_dir / 'smart_injury_updater.py', "Injury Data"):
+    if run_step(cli.ingest_injuries, "Injury Data"):
         completed_steps += 1
     else:
         failed_steps.append("Injury Data")
@@ -211,7 +193,7 @@ def main():
     time.sleep(2)
     
     print_step(5, total_steps, "Fetch Betting Lines (DraftKings)")
-    if run_script(data_collection_dir / 'fetch_betting_lines.py', "Betting Lines"):
+    if run_step(cli.ingest_lines, "Betting Lines"):
         completed_steps += 1
     else:
         print("⚠️  Betting lines failed - continuing without them")
@@ -240,12 +222,52 @@ def main():
     
     time.sleep(2)
     
-    print_step(7, total_steps, "Generate Predictions (Master Betting Predictor)")
-    if run_script(models_dir / 'master_betting_predictor.py', "Predictions"):
-        completed_steps += 1
+    print_step(7, total_steps, "Sync Analytics Mirror")
+    mirror_root = os.getenv('ANALYTICS_MIRROR')
+    if mirror_root:
+        # First sync copies every season; after that only the current one changes
+        seasons = [2025] if (project_root / mirror_root).is_dir() else None
+        if run_step(cli.sync_mirror, "Analytics Mirror", seasons):
+            completed_steps += 1
+        else:
+            print("⚠️  Mirror sync failed - analytics will fall back to MySQL")
+            failed_steps.append("Analytics Mirror (non-critical)")
     else:
+        print("\n⏭️  Skipping mirror sync (ANALYTICS_MIRROR not set)")
+        completed_steps += 1
+    
+    time.sleep(2)
+    
+    print_step(8, total_steps, "Generate Predictions (Master Betting Predictor)")
+    # One trained predictor feeds the predictions, matrix and snapshot steps
+    predictor = None
+    try:
+        predictor, _ = cli.predict(season=2025, week=current_week)
+        print("✅ Predictions completed successfully")
+        completed_steps += 1
+    except Exception as e:
+        print(f"❌ Failed to run Predictions: {e}")
+        traceback.print_exc()
         failed_steps.append("Predictions")
     
+    time.sleep(2)
+    
+    print_step(9, total_steps, "Build Head-to-Head Matchup Matrix")
+    if predictor and run_step(MatchupMatrixBuilder(predictor).run, "Matchup Matrix", 2025, current_week):
+        completed_steps += 1
+    else:
+        print("⚠️  Matchup matrix failed - MATCHUP tab will compute live")
+        failed_steps.append("Matchup Matrix (non-critical)")
+    
+    time.sleep(2)
+    
+    print_step(10, total_steps, "Publish Prediction Snapshot")
+    if predictor and run_step(PredictionSnapshotWriter(predictor).run, "Prediction Snapshot", 2025, current_week):
+        completed_steps += 1
+    else:
+        print("⚠️  Snapshot failed - the app will keep serving the previous snapshot")
+        failed_steps.append("Prediction Snapshot")
+    
     end_time = datetime.now()
     duration = end_time - start_time
     
@@ -265,16 +287,16 @@ def main():
     
     print("\n📋 NEXT STEPS:")
     print("  1. Launch Streamlit dashboard:")
-    print("     streamlit run streamlit_app.py")
+    print("     gridiron serve")
     print("  2. Review predictions in the dashboard")
     print("  3. Check injury impacts for key matchups")
     print(f"  4. Look for betting opportunities with ≥5pt edge")
     
     print("\n💡 OPTIONAL:")
     print("  - Track ROI after games complete:")
-    print("    python src/betting/roi_tracker.py")
+    print("    gridiron settle")
     print("  - View season accuracy trend:")
-    print("    python src/analysis/calculate_weekly_accuracy.py --season 2025 --view --detailed")
+    print("    gridiron grade --season 2025 --view --detailed")
     
     print("\n" + "="*70)
     print("✨ Weekly Update Complete! Good luck this week! ✨")